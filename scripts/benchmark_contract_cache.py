@@ -0,0 +1,42 @@
+# Measures the cost of getting a contract object per call with and without the contract cache
+import os
+import sys
+import time
+
+
+def measure(fn, count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        fn()
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main(count: int = 2000):
+    current_directory = os.path.dirname(os.path.abspath(__file__))
+    parent_directory = os.path.join(current_directory, "..")
+    sys.path.append(parent_directory)
+
+    from web3 import Web3
+    from zksync2.manage_contracts.utils import (
+        cached_contract,
+        get_erc20_abi,
+        l1_bridge_abi_default,
+        zksync_abi_default,
+    )
+
+    web3 = Web3()
+    address = "0x0faF6df7054946141266420b43783387A78d82A9"
+
+    print(f"{'abi':<12}{'eth.contract us':>18}{'cached us':>12}")
+    for name, abi in (
+        ("IERC20", get_erc20_abi()),
+        ("IL1Bridge", l1_bridge_abi_default()),
+        ("IZkSync", zksync_abi_default()),
+    ):
+        plain = measure(lambda: web3.eth.contract(address, abi=abi), count)
+        cached = measure(lambda: cached_contract(web3.eth, address, abi=abi), count)
+        print(f"{name:<12}{plain:>18.1f}{cached:>12.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,70 @@
+# Measures the cost per call of Contract.encodeABI and of the direct function encoders
+import os
+import sys
+import time
+
+
+def measure(fn, count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        fn()
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main(count: int = 2000):
+    current_directory = os.path.dirname(os.path.abspath(__file__))
+    parent_directory = os.path.join(current_directory, "..")
+    sys.path.append(parent_directory)
+
+    from web3 import Web3
+    from zksync2.manage_contracts.function_encoder import function_encoder
+    from zksync2.manage_contracts.utils import (
+        get_erc20_abi,
+        icontract_deployer_abi_default,
+        l2_bridge_abi_default,
+        paymaster_flow_abi_default,
+        zksync_abi_default,
+    )
+
+    web3 = Web3()
+    address = "0x0faF6df7054946141266420b43783387A78d82A9"
+    cases = (
+        ("IERC20", get_erc20_abi(), "transfer", (address, 10**18)),
+        (
+            "IPaymasterFlow",
+            paymaster_flow_abi_default(),
+            "approvalBased",
+            (address, 1, b""),
+        ),
+        (
+            "ContractDeployer",
+            icontract_deployer_abi_default(),
+            "create",
+            (b"\0" * 32, b"\1" * 32, b"\2" * 100),
+        ),
+        (
+            "IL2Bridge",
+            l2_bridge_abi_default(),
+            "finalizeDeposit",
+            (address, address, address, 1, b""),
+        ),
+        (
+            "IZkSync",
+            zksync_abi_default(),
+            "requestL2Transaction",
+            (address, 1, b"", 900_000, 800, [], address),
+        ),
+    )
+
+    print(f"{'function':<40}{'encodeABI us':>14}{'direct us':>12}")
+    for name, abi, fn_name, args in cases:
+        contract = web3.eth.contract(abi=abi)
+        encoder = function_encoder(name, fn_name)
+        assert contract.encodeABI(fn_name, args) == encoder.encode(*args)
+        generic = measure(lambda: contract.encodeABI(fn_name, args), count)
+        direct = measure(lambda: encoder.encode(*args), count)
+        print(f"{name + '.' + fn_name:<40}{generic:>14.1f}{direct:>12.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,49 @@
+# Measures import time of the package entry points with python -X importtime,
+# the total of each import and the part spent in zksync2 modules themselves
+import os
+import subprocess
+import sys
+
+MODULES = (
+    "zksync2",
+    "zksync2.module.module_builder",
+    "zksync2.module.zksync_module",
+    "zksync2.account.wallet",
+    "zksync2.signer.eth_signer",
+)
+
+
+def import_time(module: str, cwd: str):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0
+    own = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        name = name.strip()
+        if name == module:
+            total = int(cumulative_us)
+        if name.split(".")[0] == "zksync2":
+            own += int(self_us)
+    return total, own
+
+
+def main(repeat: int = 5):
+    parent_directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+    print(f"{'module':<36}{'total ms':>10}{'zksync2 ms':>12}")
+    for module in MODULES:
+        runs = [import_time(module, parent_directory) for _ in range(repeat)]
+        total, own = min(runs)
+        print(f"{module:<36}{total / 1000:>10.1f}{own / 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
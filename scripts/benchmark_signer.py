@@ -0,0 +1,63 @@
+# Measures signatures and recoveries per second for each available secp256k1 backend
+# and the cost of building the EIP-712 digest of a transaction
+import os
+import sys
+import time
+
+
+def measure(fn, count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        fn()
+    return count / (time.perf_counter() - start)
+
+
+def main(count: int = 2000):
+    current_directory = os.path.dirname(os.path.abspath(__file__))
+    parent_directory = os.path.join(current_directory, "..")
+    sys.path.append(parent_directory)
+
+    from eth_account import Account
+    from eth_utils import keccak
+    from zksync2.module.request_types import EIP712Meta
+    from zksync2.signer.eth_signer import PrivateKeyEthSigner
+    from zksync2.signer.secp256k1 import available_backends, sign_hash, recover_hash
+    from zksync2.transaction.transaction712 import Transaction712
+
+    private_key = keccak(text="benchmark")
+    msg_hash = keccak(text="message")
+
+    print(f"{'backend':<12}{'sign/s':>12}{'recover/s':>12}")
+    for backend in available_backends():
+        signature = sign_hash(private_key, msg_hash, backend).signature
+        signs = measure(lambda: sign_hash(private_key, msg_hash, backend), count)
+        recovers = measure(lambda: recover_hash(msg_hash, signature, backend), count)
+        print(f"{backend.value:<12}{signs:>12.0f}{recovers:>12.0f}")
+
+    account = Account.from_key(private_key)
+    signer = PrivateKeyEthSigner(account, 270)
+    typed_data = Transaction712(
+        chain_id=270,
+        nonce=0,
+        gas_limit=54321,
+        to="0xCcCCccccCCCCcCCCCCCcCcCccCcCCCcCcccccccC",
+        value=1,
+        data="0x",
+        maxPriorityFeePerGas=0,
+        maxFeePerGas=250_000_000,
+        from_=account.address,
+        meta=EIP712Meta(),
+    ).to_eip712_struct()
+
+    signable = measure(
+        lambda: keccak(signer.typed_data_to_signed_bytes(typed_data).body), count
+    )
+    digest = measure(lambda: signer.typed_data_to_digest(typed_data), count)
+    print()
+    print(f"{'digest path':<28}{'digests/s':>12}")
+    print(f"{'encode_defunct + keccak':<28}{signable:>12.0f}")
+    print(f"{'typed_data_to_digest':<28}{digest:>12.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,206 @@
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Union
+
+import rlp
+from eth_account import Account
+from eth_account.signers.base import BaseAccount
+from eth_utils import keccak
+from hexbytes import HexBytes
+from web3 import Web3
+from web3._utils.module import attach_modules
+from web3.providers import BaseProvider
+
+from zksync2.core.chain_metadata import ChainMetadata
+from zksync2.core.types import BridgeAddresses
+from zksync2.module.zksync_module import ZkSync
+
+MAIN_CONTRACT = "0x9A6DE0f62Aa270A8bCB1e2610078650D539B1Ef9"
+
+Handler = Union[Callable[[list], Any], Any]
+
+
+class RpcError(Exception):
+    """
+    Raised by a handler to answer with a JSON-RPC error.
+    """
+
+    def __init__(self, message: str, code: int = -32000):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+
+class FakeProvider(BaseProvider):
+    """
+    Answers JSON-RPC requests from one handler per method.
+
+    A handler is called with the params and returns the result, or raises RpcError
+    for an error response; a value that is not callable is the result itself.
+    Handlers run under lock, unless added with locked=False so that slow requests overlap.
+    Requests are counted by method in calls.
+    """
+
+    def __init__(self, handlers: Dict[str, Handler] = None):
+        super().__init__()
+        self.calls = Counter()
+        self.lock = threading.RLock()
+        self._handlers: Dict[str, Handler] = {}
+        self._unlocked = set()
+        for method, handler in (handlers or {}).items():
+            self.on(method, handler)
+
+    def on(self, method: str, handler: Handler, locked: bool = True) -> "FakeProvider":
+        self._handlers[method] = handler
+        if locked:
+            self._unlocked.discard(method)
+        else:
+            self._unlocked.add(method)
+        return self
+
+    def make_request(self, method, params):
+        with self.lock:
+            self.calls[method] += 1
+        if method not in self._handlers:
+            raise NotImplementedError(method)
+        handler = self._handlers[method]
+        try:
+            if not callable(handler):
+                result = handler
+            elif method in self._unlocked:
+                result = handler(params)
+            else:
+                with self.lock:
+                    result = handler(params)
+        except RpcError as error:
+            return {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "error": {"code": error.code, "message": error.message},
+            }
+        return {"jsonrpc": "2.0", "id": 1, "result": result}
+
+
+def receipt(tx_hash: str, block: int = 1, status: int = 1, logs=()) -> dict:
+    """
+    Returns a receipt in its JSON-RPC form.
+    """
+    return {
+        "transactionHash": tx_hash,
+        "blockHash": "0x" + f"{block:064x}",
+        "blockNumber": hex(block),
+        "status": hex(status),
+        "logs": list(logs),
+    }
+
+
+class TransferNode(FakeProvider):
+    """
+    An L2 node accepting EIP-712 transfers, decoded from the raw transactions.
+
+    Transfers of reject_value are rejected with "insufficient funds", the others are
+    recorded in sent as (nonce, value) and mined at once. Sending takes a few
+    milliseconds outside the lock, so concurrent sends overlap and are counted in max_in_flight.
+    """
+
+    def __init__(self, nonce: int = 7, reject_value: int = 13):
+        super().__init__(
+            {
+                "eth_getTransactionCount": hex(nonce),
+                "eth_gasPrice": hex(10**8),
+                "eth_chainId": hex(270),
+                "eth_blockNumber": lambda params: hex(self.head),
+                "eth_estimateGas": self._estimate_gas,
+                "eth_getTransactionReceipt": self._receipt,
+                "eth_getTransactionByHash": self._transaction,
+            }
+        )
+        self.on("eth_sendRawTransaction", self._send, locked=False)
+        self.reject_value = reject_value
+        self.head = 1
+        self.sent = []
+        self.estimated = []
+        # Status of each mined transaction by hash
+        self.mined: Dict[str, int] = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def _estimate_gas(self, params):
+        self.estimated.append(params[0])
+        return hex(300000)
+
+    def _receipt(self, params):
+        status = self.mined.get(params[0])
+        return None if status is None else receipt(params[0], self.head, status)
+
+    def _transaction(self, params):
+        return {"hash": params[0]} if params[0] in self.mined else None
+
+    def _send(self, params):
+        raw = HexBytes(params[0])
+        fields = rlp.decode(raw[1:])
+        nonce = int.from_bytes(fields[0], "big")
+        value = int.from_bytes(fields[5], "big")
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.005)
+        with self.lock:
+            self.in_flight -= 1
+            if value == self.reject_value:
+                raise RpcError("insufficient funds")
+            self.sent.append((nonce, value))
+            tx_hash = "0x" + keccak(raw).hex()
+            self.mined[tx_hash] = 1
+            self.head += 1
+        return tx_hash
+
+
+def chain_metadata(**fields) -> ChainMetadata:
+    """
+    Returns the metadata of a local L1/L2 pair, without any RPC.
+    """
+    defaults = dict(
+        l1_chain_id=9,
+        l2_chain_id=270,
+        main_contract_address=MAIN_CONTRACT,
+        bridge_addresses=BridgeAddresses(
+            erc20_l1_default_bridge="0x" + "00" * 19 + "01",
+            erc20_l2_default_bridge="0x" + "00" * 19 + "02",
+            weth_bridge_l1="0x" + "00" * 19 + "03",
+            weth_bridge_l2="0x" + "00" * 19 + "04",
+        ),
+        l1_london_ready=False,
+    )
+    return ChainMetadata(**{**defaults, **fields})
+
+
+def zksync_client(provider: BaseProvider) -> Web3:
+    """
+    Returns an L2 client of the provider whose nonces are not resynced during a test.
+    """
+    web3 = Web3(provider)
+    attach_modules(web3, {"zksync": (ZkSync,)})
+    web3.zksync.nonce_manager.max_idle = 60
+    return web3
+
+
+def make_wallet(
+    wallet_class,
+    zksync_web3: Web3 = None,
+    eth_web3: Web3 = None,
+    account: BaseAccount = None,
+    metadata: ChainMetadata = None,
+):
+    """
+    Builds a wallet through its constructor, on fake clients unless given.
+
+    :param wallet_class: WalletL1, WalletL2 or Wallet.
+    """
+    return wallet_class(
+        zksync_client(FakeProvider()) if zksync_web3 is None else zksync_web3,
+        Web3(FakeProvider()) if eth_web3 is None else eth_web3,
+        Account.create() if account is None else account,
+        chain_metadata() if metadata is None else metadata,
+    )
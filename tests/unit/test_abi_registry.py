@@ -0,0 +1,52 @@
+import pickle
+from unittest import TestCase
+
+from eth_utils import keccak
+
+from zksync2.manage_contracts.abi_registry import AbiRegistry, BUNDLED_ABIS
+from zksync2.manage_contracts.utils import (
+    eth_token_abi_default,
+    get_erc20_abi,
+    nonce_holder_abi_default,
+)
+
+
+class AbiRegistryTests(TestCase):
+    def test_lazy_loading(self):
+        registry = AbiRegistry()
+        transfer = registry.function("IERC20", "transfer")
+        self.assertEqual(["IERC20"], list(registry._abis))
+        self.assertEqual("transfer(address,uint256)", transfer.signature)
+        self.assertEqual(keccak(text=transfer.signature)[:4], transfer.selector)
+        self.assertEqual(("bool",), transfer.output_types)
+
+    def test_selector_and_topic_index(self):
+        registry = AbiRegistry()
+        self.assertEqual("approve", registry.by_selector("0x095ea7b3" + "00" * 64).name)
+        topic = keccak(text="Transfer(address,address,uint256)")
+        event = registry.by_topic(topic)
+        self.assertEqual("Transfer", event.name)
+        self.assertEqual((True, True, False), event.indexed)
+        self.assertIsNone(registry.by_selector("0xffffffff"))
+        self.assertEqual(len(BUNDLED_ABIS), len(registry._abis))
+
+    def test_tuple_types_are_collapsed(self):
+        registry = AbiRegistry()
+        fn = registry.function("IZkSync", "requestL2Transaction")
+        self.assertTrue(fn.signature.startswith("requestL2Transaction(address,"))
+        self.assertNotIn("tuple", fn.signature)
+
+    def test_pickle(self):
+        registry = AbiRegistry().load_all()
+        restored = pickle.loads(pickle.dumps(registry))
+        self.assertEqual(
+            registry.function("IL1Bridge", "deposit"),
+            restored.function("IL1Bridge", "deposit"),
+        )
+        self.assertEqual(registry._abis.keys(), restored._abis.keys())
+
+    def test_default_loaders(self):
+        self.assertIs(get_erc20_abi(), get_erc20_abi())
+        self.assertIs(eth_token_abi_default(), eth_token_abi_default())
+        self.assertIsNot(get_erc20_abi(), eth_token_abi_default())
+        self.assertIsInstance(nonce_holder_abi_default(), list)
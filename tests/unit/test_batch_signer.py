@@ -0,0 +1,61 @@
+from unittest import TestCase
+
+from eth_account import Account
+from eth_account.signers.local import LocalAccount
+from eth_typing import HexStr
+from web3.types import Nonce
+
+from zksync2.module.request_types import EIP712Meta
+from zksync2.signer.batch_signer import BatchSigner
+from zksync2.signer.eth_signer import PrivateKeyEthSigner
+from zksync2.transaction.transaction712 import Transaction712
+
+PRIVATE_KEY = bytes.fromhex(
+    "fd1f96220fa3a40c46d65f81d61dd90af600746fd47e5c82673da937a48b38ef"
+)
+
+
+class BatchSignerTests(TestCase):
+    CHAIN_ID = 270
+    RECEIVER = HexStr("0xCcCCccccCCCCcCCCCCCcCcCccCcCCCcCcccccccC")
+
+    def setUp(self) -> None:
+        self.account: LocalAccount = Account.from_key(PRIVATE_KEY)
+        self.signer = PrivateKeyEthSigner(self.account, self.CHAIN_ID)
+        self.txs = [
+            Transaction712(
+                chain_id=self.CHAIN_ID,
+                nonce=Nonce(nonce),
+                gas_limit=54321,
+                to=self.RECEIVER,
+                value=nonce * 1000,
+                data=HexStr("0x"),
+                maxPriorityFeePerGas=0,
+                maxFeePerGas=250_000_000,
+                from_=self.account.address,
+                meta=EIP712Meta(),
+            )
+            for nonce in range(7)
+        ]
+
+    def test_sign_many_keeps_order(self):
+        expected = [
+            self.signer.sign_typed_data(tx.to_eip712_struct()).signature
+            for tx in self.txs
+        ]
+        with BatchSigner(
+            self.account, self.CHAIN_ID, max_workers=2, chunk_size=3
+        ) as batch_signer:
+            result = batch_signer.sign_many(self.txs)
+        self.assertEqual(expected, [sm.signature for sm in result])
+
+    def test_encode_many(self):
+        expected = [
+            tx.encode(self.signer.sign_typed_data(tx.to_eip712_struct()))
+            for tx in self.txs
+        ]
+        with BatchSigner(
+            self.account, self.CHAIN_ID, max_workers=2, chunk_size=2
+        ) as batch_signer:
+            result = batch_signer.encode_many(self.txs)
+        self.assertEqual(expected, result)
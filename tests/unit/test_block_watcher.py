@@ -0,0 +1,71 @@
+import threading
+from unittest import TestCase
+
+from web3 import Web3
+from web3._utils.module import attach_modules
+from web3.exceptions import TimeExhausted
+
+from tests.unit.fakes import FakeProvider, receipt
+from zksync2.core.block_watcher import BlockWatcher
+from zksync2.module.zksync_module import ZkSync
+
+TX_HASH = "0x" + "11" * 32
+
+
+class ChainProvider(FakeProvider):
+    def __init__(self):
+        super().__init__(
+            {
+                "eth_getBlockByNumber": self.block,
+                "eth_blockNumber": lambda params: hex(self.latest),
+                "eth_getTransactionReceipt": lambda params: receipt(params[0], 12),
+            }
+        )
+        self.latest = 10
+
+    def block(self, params):
+        # Every poll of the heights mines a block, finality lags by 5 blocks
+        if params[0] == "latest":
+            self.latest += 1
+        height = {
+            "latest": self.latest,
+            "committed": self.latest - 2,
+            "finalized": self.latest - 5,
+        }[params[0]]
+        return {"number": hex(height)}
+
+
+class BlockWatcherTests(TestCase):
+    def setUp(self) -> None:
+        self.provider = ChainProvider()
+        self.web3 = Web3(self.provider)
+
+    def test_shared_polling(self):
+        watcher = BlockWatcher(self.web3.eth, poll_latency=0.001)
+        waiters = [
+            threading.Thread(target=watcher.wait_for, args=("finalized", 15, 5))
+            for _ in range(50)
+        ]
+        for waiter in waiters:
+            waiter.start()
+        for waiter in waiters:
+            waiter.join()
+        self.assertGreaterEqual(watcher.height("finalized"), 15)
+        self.assertGreaterEqual(watcher.height("committed"), 18)
+        # One request per tag and tick, not per waiter
+        polls = self.provider.calls["eth_getBlockByNumber"]
+        self.assertEqual(0, polls % 3)
+        self.assertLess(polls, 3 * 50)
+
+    def test_timeout(self):
+        watcher = BlockWatcher(self.web3.eth, poll_latency=0.001)
+        with self.assertRaises(TimeExhausted):
+            watcher.wait_for("finalized", 10**9, timeout=0.05)
+
+    def test_wait_finalized(self):
+        attach_modules(self.web3, {"zksync": (ZkSync,)})
+        self.web3.zksync.block_watcher.poll_latency = 0.001
+        receipt = self.web3.zksync.wait_finalized(TX_HASH, timeout=5)
+        self.assertEqual(12, receipt.blockNumber)
+        self.assertGreaterEqual(self.web3.zksync.block_watcher.height("finalized"), 12)
+        self.assertEqual(1, self.provider.calls["eth_getTransactionReceipt"])
@@ -0,0 +1,96 @@
+import gc
+import os
+import tempfile
+import weakref
+from unittest import TestCase
+
+from web3 import Web3
+
+from zksync2.core.chain_metadata import ChainMetadata
+from zksync2.core.types import BridgeAddresses
+
+MAIN_CONTRACT = "0x9A6DE0f62Aa270A8bCB1e2610078650D539B1Ef9"
+
+
+class FakeZkSync:
+    main_contract_address = None
+    bridge_addresses = None
+    chain_id = 270
+
+    def __init__(self):
+        self.calls = 0
+
+    def zks_main_contract(self):
+        self.calls += 1
+        return MAIN_CONTRACT.lower()
+
+    def zks_get_bridge_contracts(self):
+        self.calls += 1
+        return BridgeAddresses(
+            erc20_l1_default_bridge="0x1",
+            erc20_l2_default_bridge="0x2",
+            weth_bridge_l1="0x3",
+            weth_bridge_l2="0x4",
+        )
+
+
+class FakeEth:
+    chain_id = 9
+
+    def get_block(self, block_identifier):
+        return {"number": 1, "baseFeePerGas": 7}
+
+
+class FakeClient:
+    def __init__(self):
+        self.zksync = FakeZkSync()
+        self.eth = FakeEth()
+
+
+class ChainMetadataTests(TestCase):
+    def setUp(self) -> None:
+        self.zksync_web3 = FakeClient()
+        self.eth_web3 = Web3()
+        self.eth_web3.eth = FakeEth()
+
+    def test_fetch(self):
+        metadata = ChainMetadata.fetch(self.zksync_web3, self.eth_web3)
+        self.assertEqual(9, metadata.l1_chain_id)
+        self.assertEqual(270, metadata.l2_chain_id)
+        self.assertEqual(MAIN_CONTRACT, metadata.main_contract_address)
+        self.assertTrue(metadata.l1_london_ready)
+
+    def test_for_clients_is_shared(self):
+        first = ChainMetadata.for_clients(self.zksync_web3, self.eth_web3)
+        second = ChainMetadata.for_clients(self.zksync_web3, self.eth_web3)
+        self.assertIs(first, second)
+        self.assertEqual(2, self.zksync_web3.zksync.calls)
+
+    def test_save_load(self):
+        metadata = ChainMetadata.fetch(self.zksync_web3, self.eth_web3)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "metadata.json")
+            metadata.save(path)
+            loaded = ChainMetadata.load(path)
+        self.assertEqual(metadata, loaded)
+
+        zksync_web3 = FakeClient()
+        loaded.register(zksync_web3, self.eth_web3)
+        self.assertIs(loaded, ChainMetadata.for_clients(zksync_web3, self.eth_web3))
+        self.assertEqual(MAIN_CONTRACT, zksync_web3.zksync.main_contract_address)
+        self.assertEqual(0, zksync_web3.zksync.calls)
+
+    def test_main_contract_is_built_once(self):
+        metadata = ChainMetadata.fetch(self.zksync_web3, self.eth_web3)
+        web3 = Web3()
+        self.assertIs(metadata.main_contract(web3), metadata.main_contract(web3))
+        self.assertEqual(MAIN_CONTRACT, metadata.main_contract(web3).address)
+
+    def test_main_contract_does_not_keep_client_alive(self):
+        metadata = ChainMetadata.fetch(self.zksync_web3, self.eth_web3)
+        web3 = Web3()
+        metadata.main_contract(web3)
+        client = weakref.ref(web3)
+        del web3
+        gc.collect()
+        self.assertIsNone(client())
@@ -0,0 +1,37 @@
+import threading
+import time
+from unittest import TestCase
+
+from zksync2.core.concurrency import run_concurrently
+
+
+class RunConcurrentlyTests(TestCase):
+    def test_results_in_order(self):
+        self.assertEqual((1, 2, 3), run_concurrently(lambda: 1, lambda: 2, lambda: 3))
+        self.assertEqual((), run_concurrently())
+
+    def test_calls_overlap(self):
+        barrier = threading.Barrier(3, timeout=5)
+        started = time.monotonic()
+        run_concurrently(barrier.wait, barrier.wait, barrier.wait)
+        self.assertLess(time.monotonic() - started, 5)
+
+    def test_error_is_raised_after_all_calls(self):
+        done = []
+
+        def fail():
+            raise ValueError("rejected")
+
+        def slow():
+            time.sleep(0.05)
+            done.append(True)
+
+        with self.assertRaises(ValueError):
+            run_concurrently(fail, slow)
+        self.assertEqual([True], done)
+
+    def test_nested_calls_run_inline(self):
+        def nested():
+            return run_concurrently(lambda: 1, lambda: 2)
+
+        self.assertEqual(((1, 2), (1, 2)), run_concurrently(nested, nested))
@@ -0,0 +1,41 @@
+from unittest import TestCase
+
+from web3 import Web3
+
+from zksync2.manage_contracts import utils
+from zksync2.manage_contracts.utils import (
+    cached_contract,
+    get_erc20_abi,
+    l2_bridge_abi_default,
+)
+
+TOKEN = "0x0faf6df7054946141266420b43783387a78d82a9"
+
+
+class ContractCacheTests(TestCase):
+    def test_same_contract_is_returned(self):
+        web3 = Web3()
+        contract = cached_contract(web3.eth, TOKEN, abi=get_erc20_abi())
+        self.assertIs(contract, cached_contract(web3.eth, TOKEN, abi=get_erc20_abi()))
+        self.assertEqual(Web3.to_checksum_address(TOKEN), contract.address)
+
+    def test_key_includes_client_and_abi(self):
+        web3 = Web3()
+        contract = cached_contract(web3.eth, TOKEN, abi=get_erc20_abi())
+        self.assertIsNot(
+            contract, cached_contract(Web3().eth, TOKEN, abi=get_erc20_abi())
+        )
+        self.assertIsNot(
+            contract, cached_contract(web3.eth, TOKEN, abi=l2_bridge_abi_default())
+        )
+
+    def test_size_is_bounded(self):
+        web3 = Web3()
+        size = utils.CONTRACT_CACHE_SIZE
+        utils.CONTRACT_CACHE_SIZE = 4
+        try:
+            for i in range(10):
+                cached_contract(web3.eth, "0x" + f"{i:040x}", abi=get_erc20_abi())
+            self.assertEqual(4, len(utils._contract_cache))
+        finally:
+            utils.CONTRACT_CACHE_SIZE = size
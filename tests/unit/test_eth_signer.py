@@ -1,10 +1,15 @@
-from unittest import TestCase
+from unittest import TestCase, skipUnless
 from eth_typing import HexStr
 from zksync2.signer.eth_signer import PrivateKeyEthSigner
+from zksync2.signer.secp256k1 import (
+    Secp256k1Backend,
+    available_backends,
+    recover_hash_cached,
+)
 from eth_account.signers.local import LocalAccount
 from eth_account import Account
 from zksync2.eip712 import make_domain, EIP712Struct, String, Address
-from eth_utils.crypto import keccak_256
+from eth_utils.crypto import keccak, keccak_256
 
 
 class Person(EIP712Struct):
@@ -61,3 +66,58 @@ class EthSignerTests(TestCase):
             self._TEST_TYPED_EXPECTED_SIGNATURE, self.mail, self.domain
         )
         self.assertTrue(ret)
+
+    def test_native_backend(self):
+        signer = PrivateKeyEthSigner(self.account, 1, Secp256k1Backend.NATIVE)
+        sm = signer.sign_typed_data(self.mail, self.domain)
+        self.assertEqual(self._TEST_TYPED_EXPECTED_SIGNATURE, sm.signature.hex())
+        self.assertTrue(signer.verify_typed_data(sm.signature, self.mail, self.domain))
+
+    @skipUnless(
+        Secp256k1Backend.COINCURVE in available_backends(), "coincurve not installed"
+    )
+    def test_coincurve_backend(self):
+        signer = PrivateKeyEthSigner(self.account, 1, Secp256k1Backend.COINCURVE)
+        sm = signer.sign_typed_data(self.mail, self.domain)
+        self.assertEqual(self._TEST_TYPED_EXPECTED_SIGNATURE, sm.signature.hex())
+        self.assertTrue(signer.verify_typed_data(sm.signature, self.mail, self.domain))
+
+    def test_sign_hash_matches_account(self):
+        msg_hash = keccak_256(b"message")
+        expected = self.account.signHash(msg_hash)
+        for backend in available_backends():
+            signer = PrivateKeyEthSigner(self.account, 1, backend)
+            self.assertEqual(expected, signer.sign_hash(msg_hash))
+
+    def test_verify_many(self):
+        other = PrivateKeyEthSigner(Account.create(), 1)
+        foreign = other.sign_typed_data(self.mail, self.domain).signature
+        pairs = [
+            (self._TEST_TYPED_EXPECTED_SIGNATURE, self.mail),
+            (foreign, self.mail),
+            (HexStr("0x" + "00" * 65), self.mail),
+            (self._TEST_TYPED_EXPECTED_SIGNATURE, self.mail),
+        ]
+        result = self.signer.verify_many(pairs, self.domain, max_workers=2)
+        self.assertEqual([True, False, False, True], result)
+
+        hits = recover_hash_cached.cache_info().hits
+        self.assertEqual(
+            [True], self.signer.verify_many([pairs[0]], self.domain, max_workers=1)
+        )
+        self.assertGreater(recover_hash_cached.cache_info().hits, hits)
+
+    def test_verify_many_after_domain_change(self):
+        pairs = [(self._TEST_TYPED_EXPECTED_SIGNATURE, self.mail)]
+        # Signed in the Ether Mail domain, not in the default one
+        self.assertEqual([False], self.signer.verify_many(pairs))
+        self.signer.default_domain = self.domain
+        self.assertEqual([True], self.signer.verify_many(pairs))
+
+    def test_typed_data_to_digest(self):
+        for domain in (self.domain, None):
+            signable = self.signer.typed_data_to_signed_bytes(self.mail, domain)
+            self.assertEqual(
+                keccak(signable.body),
+                self.signer.typed_data_to_digest(self.mail, domain),
+            )
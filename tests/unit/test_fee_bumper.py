@@ -0,0 +1,201 @@
+import threading
+from types import SimpleNamespace
+from unittest import TestCase
+
+import rlp
+from eth_account import Account
+from eth_utils import keccak
+from hexbytes import HexBytes
+from web3 import Web3
+
+from tests.unit.fakes import (
+    FakeProvider,
+    TransferNode,
+    make_wallet,
+    receipt,
+    zksync_client,
+)
+from zksync2.account.fee_bumper import FeeBumper, FeeBumpPolicy
+from zksync2.account.wallet import Wallet
+from zksync2.core.fee_oracle import FeeSuggestion
+from zksync2.core.types import TransferTransaction
+from zksync2.core.utils import ADDRESS_DEFAULT
+from zksync2.module.request_types import EIP712Meta
+from zksync2.signer.eth_signer import PrivateKeyEthSigner
+from zksync2.transaction.transaction712 import Transaction712
+
+RECIPIENT = "0xa61464658AfeAf65CccaaFD3a512b69A83B77618"
+
+
+class NodeProvider(FakeProvider):
+    def __init__(self):
+        super().__init__(
+            {
+                "eth_sendRawTransaction": self.send,
+                "eth_getTransactionReceipt": self.receipt,
+                "eth_getTransactionCount": self.transaction_count,
+                "eth_blockNumber": "0x1",
+            }
+        )
+        self.sent = []
+        self.mined = set()
+        self.account_nonce = 5
+        # Called while a poll fetches the nonces
+        self.during_poll = None
+
+    def transaction_count(self, params):
+        if self.during_poll is not None:
+            self.during_poll()
+        return hex(self.account_nonce)
+
+    def send(self, params):
+        raw = HexBytes(params[0])
+        self.sent.append(raw)
+        return "0x" + keccak(raw).hex()
+
+    def receipt(self, params):
+        return receipt(params[0]) if params[0] in self.mined else None
+
+
+class FeeBumpPolicyTests(TestCase):
+    def test_bump(self):
+        policy = FeeBumpPolicy(bump_percent=20)
+        self.assertEqual((120, 12), policy.bump(100, 10))
+        suggestion = FeeSuggestion(
+            base_fee=100, max_priority_fee_per_gas=30, max_fee_per_gas=230
+        )
+        self.assertEqual((230, 30), policy.bump(100, 10, suggestion))
+
+    def test_caps(self):
+        self.assertEqual(
+            (115, 12), FeeBumpPolicy(max_fee_per_gas_cap=115).bump(100, 10)
+        )
+        # A replacement paying less than 10% more would be rejected
+        self.assertIsNone(FeeBumpPolicy(max_fee_per_gas_cap=105).bump(100, 10))
+
+
+class FeeBumperTests(TestCase):
+    def setUp(self) -> None:
+        self.provider = NodeProvider()
+        self.web3 = Web3(self.provider)
+        self.account = Account.create()
+        self.confirmed = []
+        self.bumper = FeeBumper(
+            self.web3.eth,
+            FeeBumpPolicy(stuck_after=0, max_bumps=2),
+            fee_oracle=SimpleNamespace(suggest_fees=lambda: None),
+            on_confirmed=self.confirmed.append,
+        )
+
+    def test_replaces_transaction712(self):
+        tx = Transaction712(
+            chain_id=270,
+            nonce=5,
+            gas_limit=300000,
+            to=RECIPIENT,
+            value=1,
+            data=b"",
+            maxPriorityFeePerGas=0,
+            maxFeePerGas=1000,
+            from_=self.account.address,
+            meta=EIP712Meta(),
+        )
+        watched = self.bumper.watch_transaction712(
+            b"\x01" * 32, tx, PrivateKeyEthSigner(self.account, 270)
+        )
+        for _ in range(3):
+            self.bumper.poll()
+        # Replaced up to max_bumps at the same nonce
+        self.assertEqual(
+            [1000, 1150, 1323], [v.max_fee_per_gas for v in watched.variants]
+        )
+        fields = rlp.decode(self.provider.sent[-1][1:])
+        self.assertEqual(5, int.from_bytes(fields[0], "big"))
+        self.assertEqual(1323, int.from_bytes(fields[2], "big"))
+
+        self.provider.mined.add(Web3.to_hex(watched.variants[1].tx_hash))
+        self.assertEqual([watched], self.bumper.poll())
+        self.assertEqual(watched.variants[1], watched.confirmed)
+        self.assertEqual(1, watched.receipt.status)
+        self.assertEqual([watched], self.confirmed)
+        self.assertEqual(0, len(self.bumper))
+        # Waiting for the hash as first sent returns the receipt of the replacement
+        receipt = self.bumper.receipt_waiter.wait([b"\x01" * 32], timeout=5)[0]
+        self.assertEqual(watched.variants[1].tx_hash, receipt.transactionHash)
+
+    def test_replaces_legacy_transaction(self):
+        tx = {
+            "to": RECIPIENT,
+            "value": 1,
+            "gas": 21000,
+            "gasPrice": 100,
+            "nonce": 5,
+            "chainId": 9,
+        }
+        watched = self.bumper.watch_l1_transaction(b"\x01" * 32, tx, self.account)
+        self.bumper.poll()
+        self.assertEqual(115, watched.latest.max_fee_per_gas)
+        fields = rlp.decode(self.provider.sent[-1])
+        self.assertEqual(115, int.from_bytes(fields[1], "big"))
+        self.assertEqual(
+            Account.recover_transaction(self.provider.sent[-1]), self.account.address
+        )
+
+    def test_superseded(self):
+        bumper = FeeBumper(
+            self.web3.eth,
+            FeeBumpPolicy(stuck_after=60),
+            fee_oracle=SimpleNamespace(suggest_fees=lambda: None),
+        )
+        watched = bumper.watch(b"\x01" * 32, self.account.address, 5, 100, 10, None)
+        self.provider.account_nonce = 6
+        self.assertEqual([], bumper.poll())
+        self.assertEqual([watched], bumper.poll())
+        self.assertTrue(watched.superseded)
+        self.assertIsNone(watched.confirmed)
+
+    def test_watch_during_poll(self):
+        self.bumper.watch(b"\x01" * 32, self.account.address, 5, 100, 10, None)
+        watchers = []
+
+        def watch():
+            # From another thread, blocked if the poll held the lock over its requests
+            watcher = threading.Thread(
+                target=self.bumper.watch,
+                args=(b"\x02" * 32, RECIPIENT, 1, 100, 10, None),
+            )
+            watcher.start()
+            watcher.join(timeout=5)
+            watchers.append(watcher)
+
+        self.provider.during_poll = watch
+        self.bumper.policy.stuck_after = 60
+        self.bumper.poll()
+        self.assertFalse(watchers[0].is_alive())
+        self.assertEqual(2, len(self.bumper))
+
+    def test_wallet_bumpers(self):
+        l2 = TransferNode()
+        wallet = make_wallet(Wallet, zksync_client(l2), self.web3, self.account)
+        policy = FeeBumpPolicy(stuck_after=60)
+        wallet.l1_fee_bumper = self.bumper
+        wallet.l2_fee_bumper = FeeBumper(wallet._zksync_web3.eth, policy)
+
+        wallet.transfer(
+            TransferTransaction(to=RECIPIENT, amount=1, token_address=ADDRESS_DEFAULT)
+        )
+        wallet._send_l1_transaction(
+            {
+                "to": RECIPIENT,
+                "value": 1,
+                "gas": 21000,
+                "gasPrice": 100,
+                "nonce": 5,
+                "chainId": 9,
+            }
+        )
+        # Each transaction is watched, and later replaced, on its own chain
+        self.assertEqual(1, len(wallet.l1_fee_bumper))
+        self.assertEqual(1, len(wallet.l2_fee_bumper))
+        self.assertEqual(1, len(self.provider.sent))
+        self.assertEqual(1, len(l2.sent))
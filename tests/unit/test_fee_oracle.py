@@ -0,0 +1,54 @@
+from unittest import TestCase
+
+from zksync2.core.fee_oracle import FeeOracle
+
+
+class FakeEth:
+    def __init__(self, base_fees=None, rewards=None):
+        self.base_fees = [100, 200] if base_fees is None else base_fees
+        self.rewards = [[10], [30], [20]] if rewards is None else rewards
+        self.calls = 0
+
+    @property
+    def gas_price(self):
+        self.calls += 1
+        return 250
+
+    @property
+    def max_priority_fee(self):
+        return 7
+
+    def fee_history(self, block_count, newest_block, reward_percentiles):
+        self.calls += 1
+        return {"baseFeePerGas": self.base_fees, "reward": self.rewards}
+
+
+class FeeOracleTests(TestCase):
+    def test_gas_price_is_cached(self):
+        eth = FakeEth()
+        oracle = FeeOracle(eth, ttl=60)
+        self.assertEqual([250] * 100, [oracle.gas_price() for _ in range(100)])
+        self.assertEqual(1, eth.calls)
+        oracle.invalidate()
+        oracle.gas_price()
+        self.assertEqual(2, eth.calls)
+
+    def test_suggest_fees(self):
+        oracle = FeeOracle(FakeEth(), ttl=60)
+        fees = oracle.suggest_fees()
+        self.assertEqual(200, fees.base_fee)
+        self.assertEqual(20, fees.max_priority_fee_per_gas)
+        self.assertEqual(320, fees.max_fee_per_gas)
+
+    def test_zero_rewards_are_samples(self):
+        oracle = FeeOracle(FakeEth(rewards=[[0], [0], [30]]), ttl=60)
+        self.assertEqual(0, oracle.max_priority_fee())
+
+    def test_missing_rewards_fall_back_to_max_priority_fee(self):
+        oracle = FeeOracle(FakeEth(rewards=[[], [None]]), ttl=60)
+        self.assertEqual(7, oracle.max_priority_fee())
+
+    def test_pre_london(self):
+        oracle = FeeOracle(FakeEth(base_fees=[0, 0]), ttl=60)
+        self.assertIsNone(oracle.suggest_fees())
+        self.assertIsNone(oracle.base_fee())
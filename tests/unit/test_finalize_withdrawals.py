@@ -0,0 +1,64 @@
+from unittest import TestCase
+
+import rlp
+from eth_utils import keccak
+from hexbytes import HexBytes
+from web3 import Web3
+
+from tests.unit.fakes import FakeProvider, RpcError, make_wallet
+from zksync2.account.wallet_l1 import WalletL1
+from zksync2.core.types import TransactionOptions
+
+
+class FinalizeWithdrawalsTests(TestCase):
+    def setUp(self) -> None:
+        self.sent = []
+        self.accepted = []
+        self.provider = FakeProvider(
+            {
+                "eth_getTransactionCount": "0x3",
+                "eth_gasPrice": "0xa",
+                "eth_sendRawTransaction": self.send,
+            }
+        )
+        self.wallet = make_wallet(WalletL1, eth_web3=Web3(self.provider))
+        self.wallet._finalize_withdrawal_params = self.params
+        self.wallet._finalize_withdrawal_transaction = self.transaction
+
+    def send(self, params):
+        raw = HexBytes(params[0])
+        self.sent.append(raw)
+        if len(self.sent) == 2:
+            raise RpcError("insufficient funds")
+        self.accepted.append(rlp.decode(raw)[0])
+        return "0x" + keccak(raw).hex()
+
+    def params(self, withdraw_hash, index):
+        if withdraw_hash == "0xbad":
+            raise ValueError("Transaction not found")
+        return {"hash": withdraw_hash}
+
+    def transaction(self, params, options: TransactionOptions):
+        return {
+            "to": "0x36615Cf349d7F6344891B1e7CA7C72883F5dc049",
+            "value": 0,
+            "gas": 21000,
+            "gasPrice": options.gas_price,
+            "chainId": options.chain_id,
+        }
+
+    def test_per_item_results(self):
+        results = self.wallet.finalize_withdrawals(
+            ["0x01", "0xbad", "0x02", "0x03"], max_concurrency=2
+        )
+        self.assertEqual(
+            ["0x01", "0xbad", "0x02", "0x03"], [r.withdraw_hash for r in results]
+        )
+        self.assertEqual([True, False, False, True], [r.ok for r in results])
+        self.assertEqual(3, len(self.sent))
+        # The nonce of the rejected transaction went to the next one, leaving no gap
+        accepted = [int.from_bytes(n, "big") for n in self.accepted]
+        self.assertEqual([3, 4], accepted)
+        self.assertEqual(
+            5, self.wallet._l1_nonce_manager.next_nonce(self.wallet.address)
+        )
@@ -0,0 +1,67 @@
+from unittest import TestCase
+
+from web3 import Web3
+
+from zksync2.manage_contracts.function_encoder import function_encoder
+from zksync2.manage_contracts.paymaster_utils import PaymasterFlowEncoder
+from zksync2.manage_contracts.precompute_contract_deployer import (
+    PrecomputeContractDeployer,
+)
+from zksync2.manage_contracts.utils import (
+    get_erc20_abi,
+    icontract_deployer_abi_default,
+    paymaster_flow_abi_default,
+    zksync_abi_default,
+)
+
+ADDRESS = "0x0faF6df7054946141266420b43783387A78d82A9"
+
+
+class FunctionEncoderTests(TestCase):
+    def setUp(self) -> None:
+        self.web3 = Web3()
+
+    def test_erc20_transfer(self):
+        contract = self.web3.eth.contract(abi=get_erc20_abi())
+        self.assertEqual(
+            contract.encodeABI("transfer", (ADDRESS, 10**18)),
+            function_encoder("IERC20", "transfer").encode(ADDRESS, 10**18),
+        )
+
+    def test_request_l2_transaction_with_hex_bytes(self):
+        args = (ADDRESS, 5, "0x1234", 900_000, 800, ["0xabcd", b"\x01"], ADDRESS)
+        contract = self.web3.eth.contract(abi=zksync_abi_default())
+        self.assertEqual(
+            contract.encodeABI("requestL2Transaction", args),
+            function_encoder("IZkSync", "requestL2Transaction").encode(*args),
+        )
+
+    def test_paymaster_flow(self):
+        contract = self.web3.eth.contract(abi=paymaster_flow_abi_default())
+        encoder = PaymasterFlowEncoder(self.web3)
+        self.assertEqual(
+            contract.encodeABI("approvalBased", (ADDRESS, 1, b"")),
+            encoder.encode_approval_based(ADDRESS, 1, b""),
+        )
+        self.assertEqual(
+            contract.encodeABI("general", (b"\x01",)), encoder.encode_general(b"\x01")
+        )
+
+    def test_contract_deployer(self):
+        deployer = PrecomputeContractDeployer(self.web3)
+        custom = PrecomputeContractDeployer(
+            self.web3, abi=icontract_deployer_abi_default()
+        )
+        bytecode = b"\x00" * 32
+        self.assertEqual(
+            custom.encode_create(bytecode, b"\x01"),
+            deployer.encode_create(bytecode, b"\x01"),
+        )
+        self.assertEqual(
+            custom.encode_create2_account(bytecode),
+            deployer.encode_create2_account(bytecode),
+        )
+
+    def test_wrong_argument_count(self):
+        with self.assertRaises(TypeError):
+            function_encoder("IERC20", "transfer").encode(ADDRESS)
@@ -0,0 +1,68 @@
+from unittest import TestCase
+
+from eth_abi import encode
+
+from zksync2.core.gas_estimate_cache import GasEstimateCache
+from zksync2.module.request_types import EIP712Meta
+
+TOKEN = "0x0faF6df7054946141266420b43783387A78d82A9"
+TRANSFER_SELECTOR = "0xa9059cbb"
+
+
+def transfer_tx(receiver: str, amount: int):
+    data = encode(["address", "uint256"], [receiver, amount])
+    return {
+        "from": "0x36615Cf349d7F6344891B1e7CA7C72883F5dc049",
+        "to": TOKEN,
+        "data": TRANSFER_SELECTOR + data.hex(),
+        "eip712Meta": EIP712Meta(),
+    }
+
+
+class GasEstimateCacheTests(TestCase):
+    def setUp(self) -> None:
+        self.estimates = 0
+        self.cache = GasEstimateCache(safety_margin=0.1)
+
+    def estimate(self, tx) -> int:
+        self.estimates += 1
+        return 1000
+
+    def test_same_shape_is_estimated_once(self):
+        first = self.cache.get_or_estimate(
+            transfer_tx("0xa61464658AfeAf65CccaaFD3a512b69A83B77618", 1), self.estimate
+        )
+        second = self.cache.get_or_estimate(
+            transfer_tx("0x0D43eB5B8a47bA8900d84AA36656c92024e9772e", 5), self.estimate
+        )
+        # The live and the cached estimate get the same margin
+        self.assertEqual(1100, first)
+        self.assertEqual(1100, second)
+        self.assertEqual(1, self.estimates)
+        self.assertEqual(1, self.cache.stats.estimates_saved)
+        self.assertEqual(0.5, self.cache.stats.hit_rate)
+
+    def test_different_shapes(self):
+        tx = transfer_tx("0xa61464658AfeAf65CccaaFD3a512b69A83B77618", 1)
+        self.cache.get_or_estimate(tx, self.estimate)
+        tx["eip712Meta"] = EIP712Meta(gas_per_pub_data=800)
+        self.cache.get_or_estimate(tx, self.estimate)
+        tx["data"] = tx["data"] + "00" * 32
+        self.cache.get_or_estimate(tx, self.estimate)
+        self.assertEqual(3, self.estimates)
+
+    def test_failure_falls_back_to_live_estimate(self):
+        tx = transfer_tx("0xa61464658AfeAf65CccaaFD3a512b69A83B77618", 1)
+        self.cache.get_or_estimate(tx, self.estimate)
+        self.cache.report_failure(tx)
+        self.assertEqual(1100, self.cache.get_or_estimate(tx, self.estimate))
+        self.assertEqual(2, self.estimates)
+
+    def test_ttl_and_lru(self):
+        cache = GasEstimateCache(max_size=1, ttl=0)
+        tx = transfer_tx("0xa61464658AfeAf65CccaaFD3a512b69A83B77618", 1)
+        cache.get_or_estimate(tx, self.estimate)
+        cache.get_or_estimate(tx, self.estimate)
+        self.assertEqual(2, self.estimates)
+        cache.get_or_estimate({"to": TOKEN, "data": "0x"}, self.estimate)
+        self.assertEqual(1, len(cache))
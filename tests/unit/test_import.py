@@ -0,0 +1,32 @@
+import subprocess
+import sys
+from unittest import TestCase
+
+from zksync2.module.module_builder import ZkSyncBuilder
+
+
+def imported_after(statement: str) -> set:
+    # A fresh interpreter, the modules of this one are already imported
+    result = subprocess.run(
+        [sys.executable, "-c", f"import sys; {statement}; print(*sys.modules)"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(result.stdout.split())
+
+
+class ImportTests(TestCase):
+    def test_entry_points_do_not_import_web3(self):
+        for statement in ("import zksync2", "import zksync2.module.module_builder"):
+            modules = imported_after(statement)
+            self.assertNotIn("web3", modules, statement)
+            self.assertNotIn("zksync2.module.zksync_module", modules, statement)
+
+    def test_build(self):
+        web3 = ZkSyncBuilder.build("http://127.0.0.1:3050")
+        self.assertIs(web3.zksync.nonce_manager, web3.zksync.nonce_manager)
+        # Subsystems are created on first use
+        self.assertNotIn("_zksync2_block_watcher", vars(web3.zksync))
+        self.assertIs(web3.zksync.block_watcher, web3.zksync.block_watcher)
+        self.assertIn("_zksync2_block_watcher", vars(web3.zksync))
@@ -0,0 +1,85 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from eth_account import Account
+
+from tests.unit.fakes import TransferNode, make_wallet, zksync_client
+from zksync2.account.mass_payout import MassPayout
+from zksync2.account.wallet_l2 import WalletL2
+from zksync2.core.utils import ADDRESS_DEFAULT
+
+RECIPIENTS = [Account.create().address for _ in range(5)]
+
+
+class MassPayoutTests(TestCase):
+    def setUp(self) -> None:
+        self.provider = TransferNode()
+        web3 = zksync_client(self.provider)
+        web3.zksync.receipt_waiter.min_poll_latency = 0.001
+        web3.zksync.receipt_waiter.block_time = 0.001
+        self.wallets = [make_wallet(WalletL2, web3) for _ in range(2)]
+        # The third payout to the same recipient is a distinct payout
+        self.payouts = [
+            (to, amount, ADDRESS_DEFAULT)
+            for to in RECIPIENTS
+            for amount in (11, 12, 13)
+        ]
+        self.payouts.append((RECIPIENTS[0], 11, ADDRESS_DEFAULT))
+
+    def test_payout_and_resume(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "payout.jsonl")
+            stats = MassPayout(self.wallets, path, max_in_flight=2).run(self.payouts)
+            self.assertEqual(11, stats.sent)
+            self.assertEqual(11, stats.confirmed)
+            self.assertEqual(0, stats.unconfirmed)
+            # Amount 13 is rejected by the node
+            self.assertEqual(5, stats.failed)
+            self.assertIn("insufficient funds", stats.report())
+            # The gas limit is estimated once for the token, gap fillers send nothing
+            payout_estimates = [
+                tx for tx in self.provider.estimated if int(tx["value"], 16) > 0
+            ]
+            self.assertEqual(1, len(payout_estimates))
+            # Estimated for a fresh address, not for one of the recipients
+            self.assertNotIn(payout_estimates[0]["to"], [r.lower() for r in RECIPIENTS])
+
+            stats = MassPayout(self.wallets, path).run(self.payouts)
+            self.assertEqual(11, stats.skipped)
+            self.assertEqual(0, stats.sent)
+            self.assertEqual(5, stats.failed)
+        self.assertEqual(
+            [6, 5, 0],
+            [
+                sum(v == 11 for _, v in self.provider.sent),
+                sum(v == 12 for _, v in self.provider.sent),
+                sum(v == 13 for _, v in self.provider.sent),
+            ],
+        )
+
+    def test_resume_unconfirmed(self):
+        known, dropped = "0x" + "aa" * 32, "0x" + "bb" * 32
+        self.provider.mined[known] = 1
+        payouts = [(RECIPIENTS[0], 11, ADDRESS_DEFAULT), (RECIPIENTS[1], 12, None)]
+        keys = [
+            MassPayout.payout_key(to, amount, ADDRESS_DEFAULT, 0)
+            for to, amount, _ in payouts
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "payout.jsonl")
+            # A crash after both sends, before their receipts
+            with open(path, "w") as f:
+                for key, tx_hash in zip(keys, (known, dropped)):
+                    f.write(json.dumps({"key": key, "hash": tx_hash}) + "\n")
+
+            payout = MassPayout(self.wallets, path)
+            stats = payout.run(payouts)
+            self.assertTrue(payout.is_confirmed(keys[0]))
+            self.assertTrue(payout.is_confirmed(keys[1]))
+            self.assertTrue(MassPayout(self.wallets, path).is_confirmed(keys[1]))
+        # The known payout is confirmed without sending it again, the dropped one is re-sent
+        self.assertEqual(1, stats.skipped)
+        self.assertEqual(1, stats.sent)
+        self.assertEqual([12], [v for _, v in self.provider.sent])
@@ -0,0 +1,111 @@
+import gc
+import weakref
+from unittest import TestCase
+
+from eth_abi import decode, encode
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.exceptions import ContractLogicError
+
+from tests.unit.fakes import FakeProvider, RpcError
+from zksync2.manage_contracts.multicall import MULTICALL3_ADDRESS, Multicall
+from zksync2.manage_contracts.utils import get_erc20_abi
+
+OWNER = "0x36615Cf349d7F6344891B1e7CA7C72883F5dc049"
+TOKENS = [
+    "0x0faF6df7054946141266420b43783387A78d82A9",
+    "0xa61464658AfeAf65CccaaFD3a512b69A83B77618",
+]
+BALANCE_OF = bytes.fromhex("70a08231")
+
+
+class TokenProvider(FakeProvider):
+    def __init__(self, aggregator: bool):
+        super().__init__(
+            {
+                "eth_chainId": "0x1",
+                "eth_getCode": "0x60" if aggregator else "0x",
+                "eth_getBalance": "0x2a",
+                "eth_call": self.call,
+            }
+        )
+
+    def balance_of(self, target: str, data: bytes):
+        # The second token reverts
+        if target.lower() == TOKENS[1].lower() or data[:4] != BALANCE_OF:
+            return None
+        return encode(["uint256"], [int(target, 16) % 1000])
+
+    def call(self, params):
+        tx = params[0]
+        data = bytes(HexBytes(tx["data"]))
+        if tx["to"].lower() == MULTICALL3_ADDRESS.lower():
+            calls = decode(["(address,bool,bytes)[]"], data[4:])[0]
+            results = []
+            for target, _, call_data in calls:
+                output = self.balance_of(target, call_data)
+                results.append((output is not None, output or b""))
+            output = encode(["(bool,bytes)[]"], [results])
+        else:
+            output = self.balance_of(tx["to"], data)
+            if output is None:
+                raise RpcError("revert", code=3)
+        return "0x" + output.hex()
+
+
+class MulticallTests(TestCase):
+    def calls(self, web3):
+        return [
+            web3.eth.contract(token, abi=get_erc20_abi()).functions.balanceOf(OWNER)
+            for token in TOKENS
+        ]
+
+    def test_aggregate(self):
+        provider = TokenProvider(aggregator=True)
+        web3 = Web3(provider)
+        multicall = Multicall(web3.eth)
+        result = multicall.call(self.calls(web3), allow_failure=True)
+        self.assertEqual([int(TOKENS[0], 16) % 1000, None], result)
+        self.assertEqual(1, provider.calls["eth_call"])
+
+    def test_batch_fallback(self):
+        provider = TokenProvider(aggregator=False)
+        web3 = Web3(provider)
+        multicall = Multicall(web3.eth)
+        calls = self.calls(web3) + [multicall.get_eth_balance(OWNER)]
+        result = multicall.call(calls, allow_failure=True)
+        self.assertEqual([int(TOKENS[0], 16) % 1000, None, 42], result)
+
+    def test_call_raw(self):
+        provider = TokenProvider(aggregator=True)
+        multicall = Multicall(Web3(provider).eth)
+        data = BALANCE_OF + encode(["address"], [OWNER])
+        result = multicall.call_raw([(token, data) for token in TOKENS])
+        self.assertEqual(
+            [(True, encode(["uint256"], [int(TOKENS[0], 16) % 1000])), (False, b"")],
+            result,
+        )
+
+    def test_failure_raises(self):
+        web3 = Web3(TokenProvider(aggregator=True))
+        with self.assertRaises(ContractLogicError):
+            Multicall(web3.eth).call(self.calls(web3))
+
+    def test_chunks(self):
+        provider = TokenProvider(aggregator=True)
+        web3 = Web3(provider)
+        multicall = Multicall(web3.eth, max_calls=1)
+        result = multicall.call(self.calls(web3)[:1] * 3)
+        self.assertEqual([int(TOKENS[0], 16) % 1000] * 3, result)
+        self.assertEqual(3, provider.calls["eth_call"])
+
+    def test_for_client(self):
+        eth = Web3(TokenProvider(aggregator=True)).eth
+        multicall = Multicall.for_client(eth)
+        self.assertIs(multicall, Multicall.for_client(eth, MULTICALL3_ADDRESS.lower()))
+        self.assertIsNot(multicall, Multicall.for_client(eth, OWNER))
+        # The shared instances do not keep the client alive
+        client = weakref.ref(eth)
+        del eth, multicall
+        gc.collect()
+        self.assertIsNone(client())
@@ -0,0 +1,166 @@
+import gc
+import weakref
+from unittest import TestCase
+
+from web3 import Web3
+
+from tests.unit.fakes import FakeProvider, TransferNode, zksync_client
+from zksync2.core.block_watcher import BlockWatcher
+from zksync2.core.types import TransferTransaction
+from zksync2.core.utils import ADDRESS_DEFAULT
+from zksync2.core.fee_oracle import FeeOracle
+from zksync2.core.nonce_manager import NonceManager
+from zksync2.core.receipt_waiter import ReceiptWaiter
+
+ADDRESS = "0x36615Cf349d7F6344891B1e7CA7C72883F5dc049"
+
+
+class FakeEth:
+    def __init__(self, count: int = 0):
+        self.count = count
+        self.calls = 0
+
+    def get_transaction_count(self, address, block_identifier):
+        self.calls += 1
+        return self.count
+
+
+class NonceManagerTests(TestCase):
+    def setUp(self) -> None:
+        self.eth = FakeEth(5)
+        self.manager = NonceManager(self.eth, max_idle=60)
+
+    def test_sequential_nonces(self):
+        nonces = [self.manager.next_nonce(ADDRESS) for _ in range(3)]
+        self.assertEqual([5, 6, 7], nonces)
+        self.assertEqual(1, self.eth.calls)
+        self.assertEqual([5, 6, 7], self.manager.pending(ADDRESS.lower()))
+
+    def test_release_refills_gap(self):
+        for _ in range(3):
+            self.manager.next_nonce(ADDRESS)
+        self.manager.release(ADDRESS, 6)
+        self.assertEqual(6, self.manager.next_nonce(ADDRESS))
+        self.assertEqual(8, self.manager.next_nonce(ADDRESS))
+
+    def test_nonce_too_low(self):
+        self.manager.next_nonce(ADDRESS)
+        self.eth.count = 10
+        handled = self.manager.handle_error(
+            ADDRESS, 5, ValueError({"message": "nonce too low"})
+        )
+        self.assertTrue(handled)
+        self.assertEqual([], self.manager.pending(ADDRESS))
+        self.assertEqual(10, self.manager.next_nonce(ADDRESS))
+
+    def test_nonce_too_high(self):
+        for _ in range(3):
+            self.manager.next_nonce(ADDRESS)
+        handled = self.manager.handle_error(ADDRESS, 7, ValueError("Nonce is too high"))
+        self.assertTrue(handled)
+        self.assertEqual(
+            [5, 6, 7], [self.manager.next_nonce(ADDRESS) for _ in range(3)]
+        )
+
+    def test_other_errors_are_ignored(self):
+        self.manager.next_nonce(ADDRESS)
+        self.assertFalse(
+            self.manager.handle_error(ADDRESS, 5, ValueError("insufficient funds"))
+        )
+        self.assertEqual(1, self.eth.calls)
+
+    def test_resync_after_idle(self):
+        manager = NonceManager(self.eth, max_idle=0)
+        manager.next_nonce(ADDRESS)
+        self.eth.count = 9
+        self.assertEqual(9, manager.next_nonce(ADDRESS))
+        self.assertEqual(2, self.eth.calls)
+
+    def test_for_client_is_shared(self):
+        self.assertIs(
+            NonceManager.for_client(self.eth), NonceManager.for_client(self.eth)
+        )
+
+    def test_for_client_does_not_keep_client_alive(self):
+        eth = Web3(FakeProvider()).eth
+        for cls in (NonceManager, FeeOracle, ReceiptWaiter, BlockWatcher):
+            self.assertIs(cls.for_client(eth), cls.for_client(eth))
+        client = weakref.ref(eth)
+        del eth
+        gc.collect()
+        self.assertIsNone(client())
+
+    def test_built_transactions_do_not_reserve(self):
+        zksync = zksync_client(TransferNode(nonce=7)).zksync
+        transfer = TransferTransaction(
+            to=ADDRESS, amount=1, token_address=ADDRESS_DEFAULT
+        )
+        zksync.get_transfer_transaction(transfer, ADDRESS)
+        self.assertEqual(7, transfer.options.nonce)
+        # Sent by the caller, nonce_manager would never learn about it
+        self.assertEqual([], zksync.nonce_manager.pending(ADDRESS))
+
+        # Starts after the nonces reserved by wallets
+        self.assertEqual(7, zksync.nonce_manager.next_nonce(ADDRESS))
+        transfer = TransferTransaction(
+            to=ADDRESS, amount=1, token_address=ADDRESS_DEFAULT
+        )
+        zksync.get_transfer_transaction(transfer, ADDRESS)
+        self.assertEqual(8, transfer.options.nonce)
+        self.assertEqual([7], zksync.nonce_manager.pending(ADDRESS))
+
+    def test_rejected_transaction_releases_nonce(self):
+        self.manager.next_nonce(ADDRESS)
+        self.manager.handle_error(ADDRESS, 5, ValueError("insufficient funds"))
+        self.assertEqual(5, self.manager.next_nonce(ADDRESS))
+
+    def test_known_transaction_keeps_nonce(self):
+        self.manager.next_nonce(ADDRESS)
+        self.manager.handle_error(ADDRESS, 5, ValueError("already known"))
+        self.manager.release(ADDRESS, 5)
+        self.assertEqual([5], self.manager.pending(ADDRESS))
+        self.assertEqual(6, self.manager.next_nonce(ADDRESS))
+
+    def test_reserve_releases_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with self.manager.reserve(ADDRESS) as nonce:
+                self.assertEqual(5, nonce)
+                raise RuntimeError("estimation failed")
+        self.assertEqual([], self.manager.pending(ADDRESS))
+        with self.manager.reserve(ADDRESS) as nonce:
+            self.manager.mark_sent(ADDRESS, nonce)
+        self.assertEqual(5, nonce)
+        self.assertEqual([5], self.manager.pending(ADDRESS))
+
+    def test_reserve_keeps_given_nonce(self):
+        self.manager.next_nonce(ADDRESS)
+        with self.assertRaises(RuntimeError):
+            with self.manager.reserve(ADDRESS, 5):
+                raise RuntimeError("estimation failed")
+        self.assertEqual([5], self.manager.pending(ADDRESS))
+
+    def test_resync_reclaims_leaked_nonce(self):
+        manager = NonceManager(self.eth, max_idle=60, max_unsent_age=0)
+        # 5 is leaked by a failed builder, 6 and 7 are sent and queued behind it
+        for _ in range(3):
+            manager.next_nonce(ADDRESS)
+        manager.mark_sent(ADDRESS, 6)
+        manager.mark_sent(ADDRESS, 7)
+        manager.max_idle = 0
+        self.assertEqual(5, manager.next_nonce(ADDRESS))
+        self.assertEqual([5, 6, 7], manager.pending(ADDRESS))
+        manager.max_idle = 60
+        self.assertEqual(8, manager.next_nonce(ADDRESS))
+
+    def test_resync_restarts_at_chain_nonce(self):
+        manager = NonceManager(self.eth, max_idle=60, max_unsent_age=0)
+        for _ in range(3):
+            manager.next_nonce(ADDRESS)
+        manager.max_idle = 0
+        self.assertEqual(5, manager.next_nonce(ADDRESS))
+        self.assertEqual([5], manager.pending(ADDRESS))
+
+    def test_resync_keeps_recent_nonces(self):
+        manager = NonceManager(self.eth, max_idle=0)
+        manager.next_nonce(ADDRESS)
+        self.assertEqual(6, manager.next_nonce(ADDRESS))
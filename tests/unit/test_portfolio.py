@@ -0,0 +1,89 @@
+from unittest import TestCase
+
+from eth_abi import decode, encode
+from eth_utils import keccak
+from hexbytes import HexBytes
+from web3 import Web3
+from web3._utils.module import attach_modules
+
+from tests.unit.fakes import FakeProvider, RpcError
+from zksync2.core.utils import ADDRESS_DEFAULT, L2_ETH_TOKEN_ADDRESS
+from zksync2.module.zksync_module import ZkSync
+
+ADDRESSES = [
+    "0x36615Cf349d7F6344891B1e7CA7C72883F5dc049",
+    "0xa61464658AfeAf65CccaaFD3a512b69A83B77618",
+    "0x0D43eB5B8a47bA8900d84AA36656c92024e9772e",
+]
+TOKEN = "0x0faF6df7054946141266420b43783387A78d82A9"
+BALANCE_OF = keccak(text="balanceOf(address)")[:4]
+ETH_BALANCE_OF = keccak(text="balanceOf(uint256)")[:4]
+
+
+class TokenProvider(FakeProvider):
+    def __init__(self):
+        super().__init__(
+            {
+                "eth_blockNumber": "0x10",
+                "eth_getCode": "0x",
+                "zks_getAllAccountBalances": self.all_balances,
+                "eth_call": self.call,
+            }
+        )
+        self.blocks = set()
+
+    def all_balances(self, params):
+        balances = {"0x0000000000000000000000000000000000000000": "0x1"}
+        if params[0] == ADDRESSES[1]:
+            balances[TOKEN] = "0x2"
+        return balances
+
+    def call(self, params):
+        self.blocks.add(params[1])
+        data = bytes(HexBytes(params[0]["data"]))
+        # L2EthToken only has balanceOf(uint256), ERC20 tokens balanceOf(address)
+        if params[0]["to"].lower() == L2_ETH_TOKEN_ADDRESS:
+            if data[:4] != ETH_BALANCE_OF:
+                raise RpcError("revert", code=3)
+            owner = decode(["uint256"], data[4:])[0].to_bytes(20, "big")
+            scale = 1
+        else:
+            if data[:4] != BALANCE_OF:
+                raise RpcError("revert", code=3)
+            owner = decode(["address"], data[4:])[0]
+            scale = 100
+        balance = ADDRESSES.index(Web3.to_checksum_address(owner)) + 1
+        return "0x" + encode(["uint256"], [balance * scale]).hex()
+
+
+class PortfolioSnapshotTests(TestCase):
+    def setUp(self) -> None:
+        self.provider = TokenProvider()
+        self.web3 = Web3(self.provider)
+        attach_modules(self.web3, {"zksync": (ZkSync,)})
+
+    def test_snapshot(self):
+        snapshot = self.web3.zksync.portfolio_snapshot(
+            ADDRESSES, max_concurrency=2, batch_size=2
+        )
+        self.assertEqual(16, snapshot.block_number)
+        self.assertEqual({"0x10"}, self.provider.blocks)
+        self.assertEqual(2, len(snapshot.tokens))
+        eth, token = snapshot.tokens
+        self.assertEqual([1, 2, 3], snapshot.balances[eth])
+        self.assertEqual([100, 200, 300], snapshot.balances[token])
+        self.assertEqual(200, snapshot.balance(ADDRESSES[1], token))
+        self.assertEqual(3, snapshot.balance(ADDRESSES[2].lower(), eth))
+
+    def test_given_tokens_and_block(self):
+        snapshot = self.web3.zksync.portfolio_snapshot(
+            ADDRESSES[:1], tokens=[TOKEN], block=7
+        )
+        self.assertEqual({"0x7"}, self.provider.blocks)
+        self.assertEqual({TOKEN: [100]}, snapshot.balances)
+
+    def test_get_balances(self):
+        self.assertEqual(
+            [2, 200],
+            self.web3.zksync.zks_get_balances(ADDRESSES[1], [ADDRESS_DEFAULT, TOKEN]),
+        )
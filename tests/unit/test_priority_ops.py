@@ -0,0 +1,112 @@
+from unittest import TestCase
+
+from eth_abi import encode
+from web3 import Web3
+from web3._utils.module import attach_modules
+
+from tests.unit.fakes import FakeProvider, receipt
+from zksync2.core.priority_ops import l2_hashes_from_receipt, new_priority_request_topic
+from zksync2.manage_contracts.utils import zksync_abi_default
+from zksync2.module.zksync_module import ZkSync
+
+MAIN_CONTRACT = "0x9A6DE0f62Aa270A8bCB1e2610078650D539B1Ef9"
+CANONICAL_TRANSACTION = (
+    "(uint256,uint256,uint256,uint256,uint256,uint256,uint256,uint256,uint256,"
+    "uint256,uint256[4],bytes,bytes,uint256[],bytes,bytes)"
+)
+
+
+def priority_request_log(tx_id: int, l2_hash: bytes, address=MAIN_CONTRACT) -> dict:
+    transaction = (0,) * 10 + ([0] * 4, b"data", b"", [], b"", b"")
+    data = encode(
+        ["uint256", "bytes32", "uint64", CANONICAL_TRANSACTION, "bytes[]"],
+        [tx_id, l2_hash, 0, transaction, [b"dep"]],
+    )
+    return {
+        "address": address,
+        "topics": [new_priority_request_topic()],
+        "data": data,
+        "blockHash": b"\x01" * 32,
+        "blockNumber": 1,
+        "transactionHash": b"\x02" * 32,
+        "transactionIndex": 0,
+        "logIndex": tx_id,
+        "removed": False,
+    }
+
+
+def l1_receipt(*logs) -> dict:
+    transfer = {
+        "address": MAIN_CONTRACT,
+        "topics": [Web3.keccak(text="Transfer(address,address,uint256)")],
+        "data": b"",
+        "transactionHash": b"\x02" * 32,
+        "logIndex": 0,
+    }
+    return {"transactionHash": b"\x02" * 32, "logs": [transfer, *logs]}
+
+
+class ChainProvider(FakeProvider):
+    def __init__(self):
+        super().__init__(
+            {
+                "eth_blockNumber": self.block_number,
+                "eth_getTransactionReceipt": lambda params: receipt(
+                    params[0], self.head
+                ),
+            }
+        )
+        self.head = 1
+
+    def block_number(self, params):
+        self.head += 1
+        return hex(self.head)
+
+
+class PriorityOpsTests(TestCase):
+    def test_matches_event_decoding(self):
+        receipt = l1_receipt(
+            priority_request_log(1, b"\xaa" * 32),
+            priority_request_log(2, b"\xbb" * 32, address="0x" + "00" * 19 + "01"),
+        )
+        contract = Web3().eth.contract(MAIN_CONTRACT, abi=zksync_abi_default())
+        decoded = contract.events["NewPriorityRequest"]().process_receipt(receipt)
+        self.assertEqual(
+            [log["args"]["txHash"] for log in decoded], l2_hashes_from_receipt(receipt)
+        )
+        self.assertEqual(
+            [b"\xaa" * 32], l2_hashes_from_receipt(receipt, MAIN_CONTRACT.lower())
+        )
+
+    def test_l2_hash_of_contract(self):
+        other = "0x" + "00" * 19 + "01"
+        receipt = l1_receipt(
+            priority_request_log(1, b"\xbb" * 32, address=other),
+            priority_request_log(2, b"\xaa" * 32),
+        )
+        contract = Web3().eth.contract(MAIN_CONTRACT, abi=zksync_abi_default())
+        # The request of another contract is skipped
+        self.assertEqual(
+            b"\xaa" * 32, ZkSync.get_l2_hash_from_priority_op(receipt, contract)
+        )
+        with self.assertRaises(RuntimeError):
+            ZkSync.get_l2_hash_from_priority_op(l1_receipt(), contract)
+
+    def test_tracker(self):
+        web3 = Web3(ChainProvider())
+        attach_modules(web3, {"zksync": (ZkSync,)})
+        web3.zksync.receipt_waiter.min_poll_latency = 0.001
+        web3.zksync.receipt_waiter.block_time = 0.001
+        tracker = web3.zksync.priority_op_tracker(MAIN_CONTRACT)
+        for i in range(1, 4):
+            tracker.add(
+                l1_receipt(priority_request_log(i, bytes([i]) * 32)), submitted_at=0
+            )
+        ops = tracker.wait(timeout=5)
+        self.assertEqual(
+            [bytes([i]) * 32 for i in range(1, 4)], [op.l2_hash for op in ops]
+        )
+        self.assertTrue(all(op.l2_receipt.status == 1 for op in ops))
+        self.assertEqual([], tracker.pending())
+        latencies = tracker.latency_percentiles((50, 100))
+        self.assertEqual(max(op.latency for op in ops), latencies[100])
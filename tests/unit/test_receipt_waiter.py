@@ -0,0 +1,114 @@
+import time
+from concurrent.futures import Future
+from unittest import TestCase
+
+from web3 import Web3
+from web3.exceptions import TimeExhausted
+
+from tests.unit.fakes import FakeProvider, receipt, zksync_client
+from zksync2.core.receipt_waiter import ReceiptWaiter, _Waiting
+
+HASHES = ["0x" + f"{i:064x}" for i in range(1, 6)]
+
+
+class CancelledOnSet(Future):
+    # Cancelled by the caller right before the poller sets it
+    def set_result(self, result):
+        self.cancel()
+        super().set_result(result)
+
+
+class ChainProvider(FakeProvider):
+    def __init__(self):
+        super().__init__(
+            {
+                "eth_blockNumber": self.block_number,
+                "eth_getTransactionReceipt": self.receipt,
+            }
+        )
+        self.head = 1
+        # Block in which each transaction is included
+        self.included = {h: i + 2 for i, h in enumerate(HASHES[:4])}
+
+    def block_number(self, params):
+        # Every tick mines a block
+        self.head += 1
+        return hex(self.head)
+
+    def receipt(self, params):
+        block = self.included.get(params[0])
+        if block is None or block > self.head:
+            return None
+        return receipt(params[0], block)
+
+
+class ReceiptWaiterTests(TestCase):
+    def setUp(self) -> None:
+        self.provider = ChainProvider()
+        self.waiter = ReceiptWaiter(
+            Web3(self.provider).eth, min_poll_latency=0.001, max_poll_latency=0.01
+        )
+
+    def test_wait(self):
+        receipts = self.waiter.wait(HASHES[:4], timeout=5)
+        self.assertEqual([2, 3, 4, 5], [r.blockNumber for r in receipts])
+        self.assertEqual(1, receipts[0].status)
+        # Each missing receipt is fetched once per block
+        self.assertLessEqual(
+            self.provider.calls["eth_getTransactionReceipt"], 4 + 3 + 2 + 1
+        )
+
+    def test_as_completed(self):
+        receipts = list(self.waiter.as_completed(reversed(HASHES[:4]), timeout=5))
+        self.assertEqual([2, 3, 4, 5], [r.blockNumber for r in receipts])
+
+    def test_same_hash_shares_future(self):
+        self.assertIs(
+            self.waiter.submit(HASHES[3], timeout=5),
+            self.waiter.submit(HASHES[3], timeout=5),
+        )
+
+    def test_timeout(self):
+        future = self.waiter.submit(HASHES[4], timeout=0.05)
+        self.assertEqual(5, self.waiter.wait(HASHES[3:4], timeout=5)[0].blockNumber)
+        with self.assertRaises(TimeExhausted):
+            future.result(timeout=5)
+
+    def test_replacement(self):
+        # HASHES[4] is never included, its replacement HASHES[0] is
+        self.waiter.add_replacement(HASHES[4], HASHES[0])
+        receipt = self.waiter.wait(HASHES[4:], timeout=5)[0]
+        self.assertEqual(HASHES[0], Web3.to_hex(receipt.transactionHash))
+
+    def test_wait_bounded_by_own_timeout(self):
+        self.waiter.submit(HASHES[4], timeout=5)
+        started = time.monotonic()
+        with self.assertRaises(TimeExhausted):
+            self.waiter.wait(HASHES[4:], timeout=0.1)
+        self.assertLess(time.monotonic() - started, 1)
+
+    def test_cancelled_future(self):
+        self.waiter.submit(HASHES[0], timeout=5).cancel()
+        receipts = self.waiter.wait(HASHES[:2], timeout=5)
+        self.assertEqual([2, 3], [r.blockNumber for r in receipts])
+
+    def test_cancel_during_tick(self):
+        waiting = _Waiting(time.monotonic() + 5)
+        waiting.future = CancelledOnSet()
+        self.waiter._waiting[HASHES[0]] = waiting
+        self.provider.head = 5
+        self.waiter._tick()
+        self.assertTrue(waiting.future.cancelled())
+        self.assertEqual({}, self.waiter._waiting)
+        # The waiter keeps serving other waits
+        self.assertEqual(3, self.waiter.wait(HASHES[1:2], timeout=5)[0].blockNumber)
+
+    def test_client_wait_for_transaction_receipt(self):
+        zksync = zksync_client(self.provider).zksync
+        zksync.receipt_waiter.min_poll_latency = 0.001
+        zksync.receipt_waiter.max_poll_latency = 0.01
+        self.assertEqual(3, zksync.wait_for_transaction_receipt(HASHES[1]).blockNumber)
+        with self.assertRaises(TimeExhausted):
+            zksync.wait_for_transaction_receipt(HASHES[4], timeout=0.05)
+        # Served by the shared waiter, which follows the head, not by a loop of its own
+        self.assertGreater(self.provider.calls["eth_blockNumber"], 0)
@@ -0,0 +1,155 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from eth_abi import encode
+from eth_account import Account
+from eth_utils import keccak
+from hexbytes import HexBytes
+from web3 import Web3
+
+from tests.unit.fakes import FakeProvider, RpcError
+from zksync2.module.request_types import EIP712Meta
+from zksync2.signer.eth_signer import PrivateKeyEthSigner
+from zksync2.transaction.signed_queue import Broadcaster, SignedTransactionLog
+from zksync2.transaction.transaction712 import Transaction712
+
+RECIPIENT = "0xa61464658AfeAf65CccaaFD3a512b69A83B77618"
+PRIVATE_KEY = "0xfd1f96220fa3a40c46d65f81d61dd90af600746fd47e5c82673da937a48b38ef"
+DIGEST = "0x7519adb6e67031ee048d921120687e4fbdf83961bcf43756f349d689eed2b80c"
+SIGNATURE = (
+    "0xd1740be683cca48d4141aa1c74509a65acd53eb5ea84ea054170446cbbd40521"
+    "0688b5bd9a8c6c404238e45a816b4b8b5692f08bd6a7cbfc41e5bbe0dcc3d9011b"
+)
+TX_HASH = "0x3391a0376306e43118a7b774d66d4165c0e5fc191c6b09f0f092722eb941571e"
+
+
+class NodeProvider(FakeProvider):
+    def __init__(self):
+        super().__init__(
+            {
+                "eth_getTransactionByHash": self.transaction,
+                "eth_sendRawTransaction": self.send,
+            }
+        )
+        self.known = set()
+        self.sent = []
+        self.reject = {}
+
+    def transaction(self, params):
+        return {"hash": params[0]} if params[0] in self.known else None
+
+    def send(self, params):
+        raw = HexBytes(params[0])
+        if raw in self.reject:
+            raise RpcError(self.reject[raw])
+        self.sent.append(raw)
+        return "0x" + "00" * 32
+
+
+class SignedQueueTests(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "queue.log")
+        self.account = Account.create()
+        self.signer = PrivateKeyEthSigner(self.account, 270)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def append(self, log: SignedTransactionLog, nonce: int, expires_at: int = None):
+        tx = Transaction712(
+            chain_id=270,
+            nonce=nonce,
+            gas_limit=300000,
+            to=RECIPIENT,
+            value=nonce,
+            data=b"",
+            maxPriorityFeePerGas=0,
+            maxFeePerGas=250000000,
+            from_=self.account.address,
+            meta=EIP712Meta(),
+        )
+        signature = self.signer.sign_typed_data(tx.to_eip712_struct())
+        return tx, signature, log.append_transaction712(tx, signature, expires_at)
+
+    def test_round_trip(self):
+        with SignedTransactionLog(self.path) as log:
+            appended = [self.append(log, nonce) for nonce in range(3)]
+        with open(self.path, "ab") as f:
+            # A record torn by a crash
+            f.write(b"\x40\x00\x00\x00\x01")
+        with SignedTransactionLog(self.path, readonly=True) as log:
+            read = [tx for _, tx in log.read()]
+        self.assertEqual(3, len(read))
+        for (tx, signature, queued), back in zip(appended, read):
+            self.assertIsInstance(back.raw, memoryview)
+            self.assertEqual(tx.encode(signature), bytes(back.raw))
+            self.assertEqual(queued.tx_hash, back.tx_hash)
+            self.assertEqual(self.account.address, back.sender)
+            self.assertEqual(tx.nonce, back.nonce)
+            self.assertEqual(250000000, back.max_fee_per_gas)
+            self.assertIsNone(back.expires_at)
+
+        # The writer cuts off the torn record and appends after the last complete one
+        with SignedTransactionLog(self.path) as log:
+            self.append(log, 3)
+            self.assertEqual([0, 1, 2, 3], [tx.nonce for _, tx in log.read()])
+
+    def test_transaction_hash(self):
+        # The transaction of the upstream EIP-712 digest vector (see test_transaction712)
+        # signed with the deterministic signature of PRIVATE_KEY
+        tx = Transaction712(
+            chain_id=42,
+            nonce=42,
+            gas_limit=54321,
+            to="0xCcCCccccCCCCcCCCCCCcCcCccCcCCCcCcccccccC",
+            value=0,
+            data=keccak(text="increment(uint256)")[:4] + encode(["uint256"], [42]),
+            maxPriorityFeePerGas=0,
+            maxFeePerGas=0,
+            from_="0x1234512345123451234512345123451234512345",
+            meta=EIP712Meta(0),
+        )
+        signer = PrivateKeyEthSigner(Account.from_key(PRIVATE_KEY), 42)
+        signature = signer.sign_typed_data(tx.to_eip712_struct())
+        self.assertEqual(DIGEST, Web3.to_hex(signature.messageHash))
+        self.assertEqual(SIGNATURE, Web3.to_hex(signature.signature))
+        with SignedTransactionLog(self.path) as log:
+            queued = log.append_transaction712(tx, signature)
+        # keccak(digest || keccak(signature)), as the node computes it
+        self.assertEqual(TX_HASH, Web3.to_hex(queued.tx_hash))
+
+    def test_broadcast(self):
+        provider = NodeProvider()
+        web3 = Web3(provider)
+        with SignedTransactionLog(self.path) as log:
+            entries = [self.append(log, nonce)[2] for nonce in range(6)]
+            self.append(log, 6, expires_at=1)
+        provider.known.add(Web3.to_hex(entries[0].tx_hash))
+        provider.reject[bytes(entries[1].raw)] = "already known"
+        provider.reject[bytes(entries[2].raw)] = "nonce too low"
+        provider.reject[bytes(entries[3].raw)] = "insufficient funds"
+
+        with SignedTransactionLog(self.path, readonly=True) as log:
+            result = Broadcaster(log, web3, batch_size=3).broadcast()
+        self.assertEqual([entries[4].tx_hash, entries[5].tx_hash], result.sent)
+        self.assertEqual([entries[0].tx_hash, entries[1].tx_hash], result.known)
+        # The permanent rejection is skipped, the broadcast stops at the retryable one
+        self.assertEqual([entries[2].tx_hash], [h for h, _ in result.failed])
+        self.assertEqual([entries[3].tx_hash], [h for h, _ in result.retry])
+        self.assertEqual([], result.expired)
+
+        # Once funded, a new broadcaster resumes from the retryable transaction
+        del provider.reject[bytes(entries[3].raw)]
+        provider.known.update(Web3.to_hex(e.tx_hash) for e in entries[4:])
+        with SignedTransactionLog(self.path) as log:
+            entry = self.append(log, 7)[2]
+        with SignedTransactionLog(self.path, readonly=True) as log:
+            broadcaster = Broadcaster(log, web3, batch_size=3)
+            result = broadcaster.broadcast()
+            self.assertEqual([entries[3].tx_hash, entry.tx_hash], result.sent)
+            self.assertEqual([entries[4].tx_hash, entries[5].tx_hash], result.known)
+            self.assertEqual(1, len(result.expired))
+            self.assertEqual(0, broadcaster.pending())
+        self.assertEqual(4, len(provider.sent))
@@ -0,0 +1,46 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from zksync2.core.token_mapping import TokenBridge, TokenMapping, TokenMappingCache
+
+L1_TOKEN = "0x0faF6df7054946141266420b43783387A78d82A9"
+L2_TOKEN = "0x36615Cf349d7F6344891B1e7CA7C72883F5dc049"
+
+
+class TokenMappingCacheTests(TestCase):
+    def setUp(self) -> None:
+        self.lookups = 0
+
+    def lookup(self, token):
+        self.lookups += 1
+        return TokenMapping(token, L2_TOKEN, TokenBridge.ERC20)
+
+    def test_lookup_once(self):
+        cache = TokenMappingCache()
+        first = cache.get_or_lookup_l1(L1_TOKEN, self.lookup)
+        second = cache.get_or_lookup_l1(L1_TOKEN.lower(), self.lookup)
+        self.assertIs(first, second)
+        self.assertEqual(1, self.lookups)
+        self.assertIs(first, cache.by_l2(L2_TOKEN))
+
+    def test_unknown_tokens_are_not_cached(self):
+        cache = TokenMappingCache()
+        self.assertIsNone(cache.get_or_lookup_l2(L2_TOKEN, lambda token: None))
+        self.assertEqual(0, len(cache))
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tokens.json")
+            cache = TokenMappingCache(path)
+            cache.update(
+                [
+                    TokenMapping(L1_TOKEN, L2_TOKEN, TokenBridge.WETH),
+                    TokenMapping("0x01", "0x02", TokenBridge.ERC20),
+                ]
+            )
+            loaded = TokenMappingCache(path)
+            self.assertEqual(["tokens.json"], os.listdir(directory))
+        self.assertEqual(2, len(loaded))
+        self.assertEqual(TokenBridge.WETH, loaded.by_l1(L1_TOKEN).bridge)
+        self.assertEqual(L1_TOKEN, loaded.by_l2(L2_TOKEN).l1_address)
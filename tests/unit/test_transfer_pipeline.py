@@ -0,0 +1,54 @@
+from unittest import TestCase
+
+from tests.unit.fakes import TransferNode, make_wallet, zksync_client
+from zksync2.account.wallet_l2 import WalletL2
+from zksync2.core.types import TransferTransaction
+
+RECIPIENT = "0xa61464658AfeAf65CccaaFD3a512b69A83B77618"
+
+
+class TransferPipelineTests(TestCase):
+    def setUp(self) -> None:
+        self.provider = TransferNode()
+        self.wallet = make_wallet(WalletL2, zksync_client(self.provider))
+
+    def test_sends_in_nonce_order(self):
+        with self.wallet.transfer_pipeline(max_in_flight=1, max_pending=4) as pipeline:
+            futures = [
+                pipeline.submit(TransferTransaction(to=RECIPIENT, amount=i))
+                for i in range(1, 11)
+            ]
+        hashes = [future.result() for future in futures]
+        self.assertEqual(10, len(set(hashes)))
+        self.assertEqual([(i + 6, i) for i in range(1, 11)], self.provider.sent)
+        self.assertEqual(10, self.provider.calls["eth_estimateGas"])
+
+    def test_failed_send(self):
+        with self.wallet.transfer_pipeline(max_in_flight=3) as pipeline:
+            futures = [
+                pipeline.submit(TransferTransaction(to=RECIPIENT, amount=i))
+                for i in range(10, 20)
+            ]
+        self.assertLessEqual(self.provider.max_in_flight, 3)
+        with self.assertRaises(ValueError):
+            futures[3].result()
+        self.assertEqual(9, sum(future.exception() is None for future in futures))
+        # A later transfer took the nonce of the failed one, leaving no gap
+        nonces = sorted(nonce for nonce, _ in self.provider.sent)
+        self.assertEqual(list(range(7, 16)), nonces)
+        self.assertEqual({}, pipeline.filled_gaps)
+        next_nonce = self.wallet._zksync_web3.zksync.nonce_manager.next_nonce(
+            self.wallet._l1_account.address
+        )
+        self.assertEqual(16, next_nonce)
+
+    def test_fills_gap_on_close(self):
+        # The second transfer is already in flight when the first one fails
+        with self.wallet.transfer_pipeline(max_in_flight=2) as pipeline:
+            futures = [
+                pipeline.submit(TransferTransaction(to=RECIPIENT, amount=amount))
+                for amount in (13, 12)
+            ]
+        self.assertIsNotNone(futures[0].exception())
+        self.assertEqual([7], list(pipeline.filled_gaps))
+        self.assertEqual([(8, 12), (7, 0)], self.provider.sent)
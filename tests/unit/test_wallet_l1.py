@@ -0,0 +1,76 @@
+from unittest import TestCase
+
+from eth_abi import decode, encode
+from eth_utils import keccak
+from hexbytes import HexBytes
+from web3 import Web3
+
+from tests.unit.fakes import MAIN_CONTRACT, FakeProvider, make_wallet
+from zksync2.account.wallet_l1 import WalletL1
+from zksync2.core.utils import encode_custom_bridge_data
+from zksync2.manage_contracts.multicall import MULTICALL3_ADDRESS
+
+TOKEN = "0x0faF6df7054946141266420b43783387A78d82A9"
+TOKEN_METADATA = {
+    keccak(text="name()")[:4]: encode(["string"], ["Token"]),
+    keccak(text="symbol()")[:4]: encode(["string"], ["TKN"]),
+    keccak(text="decimals()")[:4]: encode(["uint8"], [18]),
+}
+
+
+class L1Provider(FakeProvider):
+    def __init__(self):
+        super().__init__(
+            {
+                "eth_chainId": "0x9",
+                "eth_getCode": "0x60",
+                "eth_call": self.call,
+            }
+        )
+
+    def call(self, params):
+        tx = params[0]
+        data = bytes(HexBytes(tx["data"]))
+        if tx["to"].lower() == MULTICALL3_ADDRESS.lower():
+            calls = decode(["(address,bool,bytes)[]"], data[4:])[0]
+            results = [
+                (True, TOKEN_METADATA[call_data[:4]]) for _, _, call_data in calls
+            ]
+            return "0x" + encode(["(bool,bytes)[]"], [results]).hex()
+        assert tx["to"].lower() == MAIN_CONTRACT.lower()
+        # l2TransactionBaseCost(gas price, l2 gas limit, gas per pubdata)
+        gas_price, l2_gas_limit, _ = decode(["uint256"] * 3, data[4:])
+        return "0x" + encode(["uint256"], [gas_price * l2_gas_limit]).hex()
+
+
+class WalletL1Tests(TestCase):
+    def setUp(self) -> None:
+        self.provider = L1Provider()
+        self.wallet = make_wallet(WalletL1, eth_web3=Web3(self.provider))
+
+    def test_custom_bridge_data(self):
+        self.assertEqual(
+            encode_custom_bridge_data("Token", "TKN", 18),
+            self.wallet._custom_bridge_data(TOKEN),
+        )
+        # name, symbol and decimals are read through one aggregated call
+        self.assertEqual(1, self.provider.calls["eth_call"])
+
+    def test_base_cost_cache(self):
+        self.wallet.BASE_COST_CACHE_SIZE = 2
+        self.assertEqual(10, self.wallet.get_base_cost(1, gas_price=10))
+        self.assertEqual(20, self.wallet.get_base_cost(2, gas_price=10))
+        self.assertEqual(10, self.wallet.get_base_cost(1, gas_price=10))
+        self.assertEqual(2, self.provider.calls["eth_call"])
+
+        # Evicts the least recently used entry only
+        self.assertEqual(30, self.wallet.get_base_cost(3, gas_price=10))
+        self.assertEqual(10, self.wallet.get_base_cost(1, gas_price=10))
+        self.assertEqual(3, self.provider.calls["eth_call"])
+        self.assertEqual(20, self.wallet.get_base_cost(2, gas_price=10))
+        self.assertEqual(4, self.provider.calls["eth_call"])
+
+        # Expired entries are fetched again
+        self.wallet.BASE_COST_TTL = 0
+        self.assertEqual(20, self.wallet.get_base_cost(2, gas_price=10))
+        self.assertEqual(5, self.provider.calls["eth_call"])
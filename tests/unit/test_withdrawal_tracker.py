@@ -0,0 +1,104 @@
+import os
+import tempfile
+from types import SimpleNamespace
+from unittest import TestCase
+
+from eth_abi import decode, encode
+from hexbytes import HexBytes
+from web3 import Web3
+
+from tests.unit.fakes import MAIN_CONTRACT, FakeProvider
+from zksync2.account.withdrawal_tracker import WithdrawalStatus, WithdrawalTracker
+from zksync2.core.utils import ADDRESS_DEFAULT
+from zksync2.manage_contracts.utils import zksync_abi_default
+
+
+class L1Provider(FakeProvider):
+    def __init__(self):
+        super().__init__({"eth_getCode": "0x", "eth_call": self.call})
+        self.finalized = set()
+
+    def call(self, params):
+        batch, index = decode(
+            ["uint256", "uint256"], bytes(HexBytes(params[0]["data"]))[4:]
+        )
+        return "0x" + encode(["bool"], [(batch, index) in self.finalized]).hex()
+
+
+class FakeZkSync:
+    def __init__(self):
+        self.batches = {"0x01": 5, "0x02": 8}
+        self.latest_batch = 10
+        self.executed = 4
+        self.detail_calls = 0
+
+    def get_transaction_receipt(self, withdraw_hash):
+        batch = self.batches.get(withdraw_hash)
+        return {"l1BatchNumber": None if batch is None else hex(batch)}
+
+    def zks_l1_batch_number(self):
+        return self.latest_batch
+
+    def zks_get_l1_batch_details(self, batch):
+        self.detail_calls += 1
+        executed_at = "now" if batch <= self.executed else None
+        return SimpleNamespace(executed_at=executed_at)
+
+
+class WithdrawalTrackerTests(TestCase):
+    def setUp(self) -> None:
+        self.l1 = L1Provider()
+        self.eth_web3 = Web3(self.l1)
+        self.zksync = FakeZkSync()
+        contract = self.eth_web3.eth.contract(MAIN_CONTRACT, abi=zksync_abi_default())
+        self.wallet = SimpleNamespace(
+            _zksync_web3=SimpleNamespace(zksync=self.zksync),
+            _eth_web3=self.eth_web3,
+            _finalize_withdrawal_params=lambda withdraw_hash, index: {
+                "sender": ADDRESS_DEFAULT,
+                "l2_message_index": int(withdraw_hash, 16),
+            },
+            _is_withdrawal_finalized_call=lambda sender, batch, index: (
+                contract.functions.isEthWithdrawalFinalized(batch, index)
+            ),
+        )
+        self.events = []
+        self.tracker = WithdrawalTracker(
+            self.wallet,
+            on_finalizable=lambda w: self.events.append(
+                ("finalizable", w.withdraw_hash)
+            ),
+            on_finalized=lambda w: self.events.append(("finalized", w.withdraw_hash)),
+        )
+
+    def test_follows_batches(self):
+        self.tracker.add("0x01")
+        self.tracker.add("0x02")
+        self.assertEqual([], self.tracker.poll())
+        self.assertEqual(4, self.tracker.executed_batch)
+
+        self.zksync.executed = 6
+        self.assertEqual(["0x01"], [w.withdraw_hash for w in self.tracker.poll()])
+        self.assertEqual([("finalizable", "0x01")], self.events)
+
+        # No new batch: one lookup of the latest batch, no bisection
+        calls = self.zksync.detail_calls
+        self.assertEqual([], self.tracker.poll())
+        self.assertEqual(calls + 1, self.zksync.detail_calls)
+
+        self.l1.finalized.add((5, 1))
+        self.tracker.poll()
+        self.assertEqual(("finalized", "0x01"), self.events[-1])
+        self.assertEqual(1, len(self.tracker))
+        self.assertEqual(WithdrawalStatus.PENDING, self.tracker.withdrawals()[0].status)
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "withdrawals.json")
+            tracker = WithdrawalTracker(self.wallet, path)
+            tracker.add("0x01")
+            self.zksync.executed = 6
+            tracker.poll()
+            loaded = WithdrawalTracker(self.wallet, path)
+        self.assertEqual(6, loaded.executed_batch)
+        self.assertEqual(WithdrawalStatus.FINALIZABLE, loaded.withdrawals()[0].status)
@@ -0,0 +1,35 @@
+import importlib
+
+# Public names are resolved on first access, "import zksync2" does not import web3
+_LAZY_ATTRIBUTES = {
+    "ZkSyncBuilder": "zksync2.module.module_builder",
+    "Wallet": "zksync2.account.wallet",
+    "PrivateKeyEthSigner": "zksync2.signer.eth_signer",
+}
+
+_SUBMODULES = (
+    "account",
+    "core",
+    "eip712",
+    "manage_contracts",
+    "module",
+    "signer",
+    "transaction",
+)
+
+__all__ = list(_LAZY_ATTRIBUTES) + list(_SUBMODULES)
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module(f"{__name__}.{name}")
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
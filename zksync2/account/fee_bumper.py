@@ -0,0 +1,370 @@
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Optional, Tuple
+
+from eth_account.signers.base import BaseAccount
+from eth_typing import HexStr
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.eth import Eth
+from web3.types import TxParams, TxReceipt
+
+from zksync2.core.fee_oracle import FeeOracle, FeeSuggestion
+from zksync2.core.receipt_waiter import ReceiptWaiter, format_receipt
+from zksync2.core.rpc_batch import batch_request
+from zksync2.signer.eth_signer import PrivateKeyEthSigner
+from zksync2.transaction.transaction712 import Transaction712
+
+# Nodes only accept a replacement paying at least this much more (geth txpool.pricebump)
+MIN_REPLACEMENT_BUMP_PERCENT = 10
+
+
+def _bumped(value: int, percent: int) -> int:
+    return -(-value * (100 + percent) // 100)
+
+
+@dataclass
+class FeeBumpPolicy:
+    """
+    When and how much stuck transactions are repriced.
+
+    :param stuck_after: Seconds without a receipt after which the latest variant is replaced.
+    :param bump_percent: Increase of both fees per replacement, at least 10.
+    :param max_fee_per_gas_cap: Upper bound of maxFeePerGas, None for no bound.
+    :param max_priority_fee_per_gas_cap: Upper bound of maxPriorityFeePerGas, None for no bound.
+    :param max_bumps: Maximum number of replacements of one transaction.
+    """
+
+    stuck_after: float = 30.0
+    bump_percent: int = 15
+    max_fee_per_gas_cap: Optional[int] = None
+    max_priority_fee_per_gas_cap: Optional[int] = None
+    max_bumps: int = 5
+
+    def bump(
+        self,
+        max_fee_per_gas: int,
+        max_priority_fee_per_gas: int,
+        suggestion: FeeSuggestion = None,
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Returns the fees of the replacement, at least the current suggestion,
+        or None when the caps leave no room for a replacement nodes would accept.
+        """
+        max_fee = _bumped(max_fee_per_gas, self.bump_percent)
+        priority_fee = _bumped(max_priority_fee_per_gas, self.bump_percent)
+        if suggestion is not None:
+            max_fee = max(max_fee, suggestion.max_fee_per_gas)
+            priority_fee = max(priority_fee, suggestion.max_priority_fee_per_gas)
+        if self.max_fee_per_gas_cap is not None:
+            max_fee = min(max_fee, self.max_fee_per_gas_cap)
+        if self.max_priority_fee_per_gas_cap is not None:
+            priority_fee = min(priority_fee, self.max_priority_fee_per_gas_cap)
+        priority_fee = min(priority_fee, max_fee)
+        if max_fee < _bumped(
+            max_fee_per_gas, MIN_REPLACEMENT_BUMP_PERCENT
+        ) or priority_fee < _bumped(
+            max_priority_fee_per_gas, MIN_REPLACEMENT_BUMP_PERCENT
+        ):
+            return None
+        return max_fee, priority_fee
+
+
+@dataclass
+class TransactionVariant:
+    tx_hash: HexBytes
+    max_fee_per_gas: int
+    max_priority_fee_per_gas: int
+    sent_at: float
+
+
+@dataclass
+class WatchedTransaction:
+    sender: HexStr
+    nonce: int
+    variants: List[TransactionVariant]
+    resign: Callable[[int, int], bytes] = field(repr=False)
+    confirmed: Optional[TransactionVariant] = None
+    receipt: Optional[TxReceipt] = None
+    # The nonce was used by a transaction that is not one of the variants
+    superseded: bool = False
+    nonce_used_without_receipt: bool = field(default=False, repr=False)
+    last_error: Optional[Exception] = None
+
+    @property
+    def latest(self) -> TransactionVariant:
+        return self.variants[-1]
+
+    @property
+    def bumps(self) -> int:
+        return len(self.variants) - 1
+
+    @property
+    def done(self) -> bool:
+        return self.confirmed is not None or self.superseded
+
+
+class FeeBumper:
+    """
+    Watches sent transactions and replaces the ones stuck for longer than
+    policy.stuck_after with a copy at the same nonce paying higher fees.
+
+    Every transaction is kept with the function re-signing it for given fees,
+    see watch_transaction712 and watch_l1_transaction. Each poll fetches the receipts
+    of all variants and the nonces of their senders in one JSON-RPC batch,
+    then replaces the stuck transactions. Once a variant has a receipt it is recorded
+    as the confirmed one and the transaction is no longer watched.
+
+    Every replacement is registered with the receipt waiter of the client, so waiting
+    for the hash of the transaction as first sent, e.g. with wait_for_transaction_receipts,
+    returns the receipt of whichever variant was included.
+    """
+
+    def __init__(
+        self,
+        eth: Eth,
+        policy: FeeBumpPolicy = None,
+        fee_oracle: FeeOracle = None,
+        on_replaced: Callable[[WatchedTransaction], None] = None,
+        on_confirmed: Callable[[WatchedTransaction], None] = None,
+        receipt_waiter: ReceiptWaiter = None,
+    ):
+        """
+        :param eth: The eth module of the client the transactions are sent to.
+        :param policy: When and how much to bump, defaults to FeeBumpPolicy().
+        :param fee_oracle: Source of the current fee suggestion, defaults to the one of the client.
+        :param receipt_waiter: Told about the replacements, defaults to the one of the client.
+        """
+        self._eth = eth
+        self.policy = FeeBumpPolicy() if policy is None else policy
+        self.fee_oracle = (
+            FeeOracle.for_client(eth) if fee_oracle is None else fee_oracle
+        )
+        self.receipt_waiter = (
+            ReceiptWaiter.for_client(eth) if receipt_waiter is None else receipt_waiter
+        )
+        self.on_replaced = on_replaced
+        self.on_confirmed = on_confirmed
+        self._watched: Dict[Tuple[str, int], WatchedTransaction] = {}
+        # Guards _watched, the RPCs of a poll are made without holding it
+        self._lock = threading.RLock()
+        # One poll at a time, so a stuck transaction is replaced once
+        self._poll_lock = threading.Lock()
+        self._poller: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def __len__(self):
+        return len(self._watched)
+
+    def watch(
+        self,
+        tx_hash: HexBytes,
+        sender: HexStr,
+        nonce: int,
+        max_fee_per_gas: int,
+        max_priority_fee_per_gas: int,
+        resign: Callable[[int, int], bytes],
+    ) -> WatchedTransaction:
+        """
+        Starts watching a sent transaction.
+
+        :param tx_hash: Hash of the sent transaction.
+        :param sender: Address of the sender.
+        :param nonce: Nonce of the transaction.
+        :param max_fee_per_gas: Fee cap of the sent transaction (its gas price for legacy transactions).
+        :param max_priority_fee_per_gas: Priority fee of the sent transaction.
+        :param resign: Returns the raw transaction re-signed with the given max fee and priority fee.
+        """
+        watched = WatchedTransaction(
+            sender=Web3.to_checksum_address(sender),
+            nonce=nonce,
+            variants=[
+                TransactionVariant(
+                    HexBytes(tx_hash),
+                    max_fee_per_gas,
+                    max_priority_fee_per_gas,
+                    time.monotonic(),
+                )
+            ],
+            resign=resign,
+        )
+        with self._lock:
+            self._watched[(watched.sender, nonce)] = watched
+        return watched
+
+    def watch_transaction712(
+        self, tx_hash: HexBytes, tx: Transaction712, signer: PrivateKeyEthSigner
+    ) -> WatchedTransaction:
+        """
+        Watches an EIP-712 transaction sent to zkSync.
+
+        :param tx_hash: Hash of the sent transaction.
+        :param tx: The transaction as it was signed.
+        :param signer: The signer of the transaction.
+        """
+
+        def resign(max_fee_per_gas: int, max_priority_fee_per_gas: int) -> bytes:
+            bumped = replace(
+                tx,
+                maxFeePerGas=max_fee_per_gas,
+                maxPriorityFeePerGas=max_priority_fee_per_gas,
+            )
+            return bumped.encode(signer.sign_typed_data(bumped.to_eip712_struct()))
+
+        return self.watch(
+            tx_hash,
+            tx.from_,
+            tx.nonce,
+            tx.maxFeePerGas,
+            tx.maxPriorityFeePerGas,
+            resign,
+        )
+
+    def watch_l1_transaction(
+        self, tx_hash: HexBytes, tx: TxParams, account: BaseAccount
+    ) -> WatchedTransaction:
+        """
+        Watches a legacy or EIP-1559 transaction, e.g. an L1 deposit.
+
+        :param tx_hash: Hash of the sent transaction.
+        :param tx: The transaction as it was signed.
+        :param account: The account which signed the transaction.
+        """
+        legacy = "gasPrice" in tx
+
+        def resign(max_fee_per_gas: int, max_priority_fee_per_gas: int) -> bytes:
+            bumped = dict(tx)
+            if legacy:
+                bumped["gasPrice"] = max_fee_per_gas
+            else:
+                bumped["maxFeePerGas"] = max_fee_per_gas
+                bumped["maxPriorityFeePerGas"] = max_priority_fee_per_gas
+            return account.sign_transaction(bumped).rawTransaction
+
+        if legacy:
+            max_fee = priority_fee = tx["gasPrice"]
+        else:
+            max_fee, priority_fee = tx["maxFeePerGas"], tx["maxPriorityFeePerGas"]
+        sender = tx.get("from", account.address)
+        return self.watch(tx_hash, sender, tx["nonce"], max_fee, priority_fee, resign)
+
+    def watched(self) -> List[WatchedTransaction]:
+        return list(self._watched.values())
+
+    def poll(self) -> List[WatchedTransaction]:
+        """
+        Checks the watched transactions, replaces the stuck ones
+        and returns the ones that were confirmed or superseded.
+        """
+        with self._poll_lock:
+            finished, replaced = self._poll()
+        if self.on_confirmed is not None:
+            for w in finished:
+                if w.confirmed is not None:
+                    self.on_confirmed(w)
+        if self.on_replaced is not None:
+            for w in replaced:
+                self.on_replaced(w)
+        return finished
+
+    def _poll(self) -> Tuple[List[WatchedTransaction], List[WatchedTransaction]]:
+        with self._lock:
+            watched = list(self._watched.values())
+        if len(watched) == 0:
+            return [], []
+        variants = [(w, v) for w in watched for v in list(w.variants)]
+        senders = sorted({w.sender for w in watched})
+        results = batch_request(
+            self._eth.w3,
+            [
+                ("eth_getTransactionReceipt", [Web3.to_hex(v.tx_hash)])
+                for _, v in variants
+            ]
+            + [("eth_getTransactionCount", [s, "latest"]) for s in senders],
+        )
+        receipts = results[: len(variants)]
+        nonces = dict(zip(senders, results[len(variants) :]))
+        for (w, variant), receipt in zip(variants, receipts):
+            if isinstance(receipt, dict) and receipt.get("blockHash") is not None:
+                w.confirmed = variant
+                w.receipt = format_receipt(receipt)
+        finished = []
+        for w in watched:
+            nonce = nonces[w.sender]
+            if w.confirmed is None and isinstance(nonce, str):
+                # No receipt while the nonce is used means another transaction took it,
+                # it is confirmed on the next poll in case a variant was included
+                # between the two requests of the batch
+                used = int(nonce, 16) > w.nonce
+                w.superseded = used and w.nonce_used_without_receipt
+                w.nonce_used_without_receipt = used
+            if w.done:
+                finished.append(w)
+        with self._lock:
+            for w in finished:
+                # Unless watched again in the meantime, e.g. at a reused nonce
+                if self._watched.get((w.sender, w.nonce)) is w:
+                    del self._watched[(w.sender, w.nonce)]
+        now = time.monotonic()
+        stuck = [
+            w
+            for w in watched
+            if not w.done
+            and now - w.latest.sent_at >= self.policy.stuck_after
+            and w.bumps < self.policy.max_bumps
+        ]
+        replaced = [w for w in stuck if self._replace(w)]
+        return finished, replaced
+
+    def _replace(self, watched: WatchedTransaction) -> bool:
+        latest = watched.latest
+        suggestion = None
+        try:
+            suggestion = self.fee_oracle.suggest_fees()
+        except Exception:
+            # Bump from the current fees alone
+            pass
+        fees = self.policy.bump(
+            latest.max_fee_per_gas, latest.max_priority_fee_per_gas, suggestion
+        )
+        if fees is None:
+            return False
+        try:
+            tx_hash = self._eth.send_raw_transaction(watched.resign(*fees))
+        except ValueError as error:
+            # E.g. nonce too low when a variant was just included, the next poll finds it
+            watched.last_error = error
+            return False
+        watched.variants.append(TransactionVariant(tx_hash, *fees, time.monotonic()))
+        self.receipt_waiter.add_replacement(watched.variants[0].tx_hash, tx_hash)
+        return True
+
+    def start(self, interval: float = 5.0):
+        """
+        Polls from a daemon thread.
+
+        :param interval: Seconds between polls.
+        """
+        if self._poller is not None and self._poller.is_alive():
+            return
+        self._stop.clear()
+        self._poller = threading.Thread(
+            target=self._poll_loop, args=(interval,), daemon=True
+        )
+        self._poller.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._poller is not None:
+            self._poller.join()
+            self._poller = None
+
+    def _poll_loop(self, interval: float):
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception:
+                # Node errors are retried on the next poll
+                pass
+            self._stop.wait(interval)
@@ -0,0 +1,323 @@
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, wait
+from dataclasses import dataclass, field, replace
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from eth_typing import HexStr
+from web3 import Web3
+
+from zksync2.account.transfer_pipeline import TransferPipeline
+from zksync2.account.wallet_l2 import WalletL2
+from zksync2.core.rpc_batch import batch_request
+from zksync2.core.types import TransactionOptions, TransferTransaction
+from zksync2.core.utils import ADDRESS_DEFAULT, percentiles
+from zksync2.transaction.transaction_builders import TxTransfer
+
+Payout = Tuple[HexStr, int, HexStr]
+
+
+@dataclass
+class PayoutStats:
+    submitted: int = 0
+    sent: int = 0
+    confirmed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    # Sent but without a receipt within the confirmation timeout
+    unconfirmed: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+    finished_at: Optional[float] = None
+    latencies: List[float] = field(default_factory=list, repr=False)
+    errors: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def elapsed(self) -> float:
+        end = time.monotonic() if self.finished_at is None else self.finished_at
+        return end - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """
+        Sent transfers per second.
+        """
+        elapsed = self.elapsed
+        return self.sent / elapsed if elapsed > 0 else 0.0
+
+    def latency_percentiles(
+        self, ranks: Sequence[float] = (50, 90, 99)
+    ) -> Dict[float, float]:
+        """
+        Returns percentiles of the time from submission to the transaction hash, in seconds.
+        """
+        return percentiles(self.latencies, ranks)
+
+    def report(self) -> str:
+        latencies = ", ".join(
+            f"p{rank:g}={value * 1000:.1f}ms"
+            for rank, value in self.latency_percentiles().items()
+        )
+        lines = [
+            f"sent {self.sent}, confirmed {self.confirmed}, failed {self.failed}, "
+            f"unconfirmed {self.unconfirmed}, skipped {self.skipped}",
+            f"{self.throughput:.1f} tx/s over {self.elapsed:.1f}s",
+            f"latency {latencies or '-'}",
+        ]
+        lines += [f"error x{count}: {error}" for error, count in self.errors.items()]
+        return "\n".join(lines)
+
+    def _error(self, error: BaseException):
+        message = str(error)
+        self.errors[message] = self.errors.get(message, 0) + 1
+
+
+class MassPayout:
+    """
+    Pays many recipients from a set of funded accounts.
+
+    Payouts are dealt round-robin to one TransferPipeline per sender, so every sender
+    has its own nonce lane. The gas limit of a token is estimated once per run,
+    for a transfer to a fresh address, which pays for a new balance slot, and all
+    its transfers are copied from that template.
+
+    With a checkpoint path every sent payout is appended to a JSON lines file together
+    with its hash, and again once its receipt confirms it. A payout is identified
+    by recipient, token, amount and occurrence (the n-th identical payout of the stream),
+    so running the same stream again, e.g. after a crash, skips the confirmed payouts.
+    Payouts sent but not confirmed are looked up first: the ones still known to the node
+    are waited for, the ones dropped or reverted are sent again. A crash between
+    a send and its checkpoint line can still repeat that single payout.
+    """
+
+    DEFAULT_GAS_MARGIN = 0.1
+    DEFAULT_CONFIRM_TIMEOUT = 300
+    LOOKUP_BATCH = 500
+
+    def __init__(
+        self,
+        wallets: Sequence[WalletL2],
+        checkpoint_path: Union[str, os.PathLike] = None,
+        estimate_workers: int = TransferPipeline.DEFAULT_ESTIMATE_WORKERS,
+        max_in_flight: int = TransferPipeline.DEFAULT_MAX_IN_FLIGHT,
+        max_pending: int = TransferPipeline.DEFAULT_MAX_PENDING,
+        gas_margin: float = DEFAULT_GAS_MARGIN,
+        confirm_timeout: float = DEFAULT_CONFIRM_TIMEOUT,
+        on_progress: Callable[[PayoutStats], None] = None,
+        progress_every: int = 1000,
+    ):
+        """
+        :param wallets: The funded sender wallets, all of the same client.
+        :param checkpoint_path: The JSON lines checkpoint, None to not keep one.
+        :param gas_margin: Fraction added to the estimated gas limit of each token.
+        :param confirm_timeout: Seconds to wait for the receipts of the sent payouts.
+        """
+        if len(wallets) == 0:
+            raise ValueError("At least one sender wallet is required")
+        self._wallets = list(wallets)
+        self._zksync = self._wallets[0]._zksync_web3.zksync
+        self.checkpoint_path = (
+            None if checkpoint_path is None else Path(checkpoint_path)
+        )
+        self.estimate_workers = estimate_workers
+        self.max_in_flight = max_in_flight
+        self.max_pending = max_pending
+        self.gas_margin = gas_margin
+        self.confirm_timeout = confirm_timeout
+        self.on_progress = on_progress
+        self.progress_every = progress_every
+        self.stats = PayoutStats()
+        # Payouts sent and not confirmed yet, and confirmed ones, by key
+        self._sent: Dict[str, HexStr] = {}
+        self._confirmed: Dict[str, HexStr] = {}
+        self._confirmations: List[Tuple[str, HexStr, Future]] = []
+        self._templates: Dict[str, TransferTransaction] = {}
+        self._lock = threading.Lock()
+        self._templates_lock = threading.Lock()
+        if self.checkpoint_path is not None and self.checkpoint_path.exists():
+            with self.checkpoint_path.open() as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        if entry.get("confirmed"):
+                            self._sent.pop(entry["key"], None)
+                            self._confirmed[entry["key"]] = entry["hash"]
+                        else:
+                            self._sent[entry["key"]] = entry["hash"]
+
+    def is_sent(self, key: str) -> bool:
+        return key in self._sent or key in self._confirmed
+
+    def is_confirmed(self, key: str) -> bool:
+        return key in self._confirmed
+
+    @staticmethod
+    def payout_key(to: HexStr, amount: int, token: HexStr, occurrence: int) -> str:
+        return f"{to.lower()}:{token.lower()}:{amount}:{occurrence}"
+
+    def run(self, payouts: Iterable[Payout]) -> PayoutStats:
+        """
+        Sends the payouts and returns the statistics once all of them are confirmed,
+        failed or out of confirm_timeout. The payouts are consumed lazily,
+        back-pressure of the pipelines bounds memory use.
+
+        :param payouts: Tuples of recipient, amount and token address (the zero address for ETH).
+        """
+        self.stats = PayoutStats()
+        self._confirmations = []
+        occurrences = Counter()
+        checkpoint = None
+        if self.checkpoint_path is not None:
+            self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+            checkpoint = self.checkpoint_path.open("a")
+        pipelines = []
+        try:
+            self._recheck(checkpoint)
+            pipelines = [
+                TransferPipeline(
+                    wallet, self.estimate_workers, self.max_in_flight, self.max_pending
+                )
+                for wallet in self._wallets
+            ]
+            for index, (to, amount, token) in enumerate(payouts):
+                to = Web3.to_checksum_address(to)
+                token = ADDRESS_DEFAULT if token is None else token
+                identity = (to.lower(), token.lower(), amount)
+                key = self.payout_key(to, amount, token, occurrences[identity])
+                occurrences[identity] += 1
+                if self.is_sent(key):
+                    with self._lock:
+                        self.stats.skipped += 1
+                    continue
+                tx = replace(self._template(token), to=to, amount=amount)
+                tx.options = replace(tx.options)
+                pipeline = pipelines[index % len(pipelines)]
+                with self._lock:
+                    self.stats.submitted += 1
+                submitted_at = time.monotonic()
+                future = pipeline.submit(tx)
+                future.add_done_callback(
+                    partial(self._done, key, submitted_at, checkpoint)
+                )
+        finally:
+            for pipeline in pipelines:
+                pipeline.close()
+            self._confirm(checkpoint)
+            if checkpoint is not None:
+                checkpoint.close()
+            self.stats.finished_at = time.monotonic()
+        return self.stats
+
+    def _recheck(self, checkpoint):
+        # Looks up the payouts sent by an earlier run and not confirmed
+        unconfirmed = list(self._sent.items())
+        for start in range(0, len(unconfirmed), self.LOOKUP_BATCH):
+            chunk = unconfirmed[start : start + self.LOOKUP_BATCH]
+            results = batch_request(
+                self._zksync.w3,
+                [("eth_getTransactionReceipt", [h]) for _, h in chunk]
+                + [("eth_getTransactionByHash", [h]) for _, h in chunk],
+            )
+            for (key, tx_hash), receipt, tx in zip(
+                chunk, results[: len(chunk)], results[len(chunk) :]
+            ):
+                if isinstance(receipt, dict) and receipt.get("blockHash") is not None:
+                    if int(receipt["status"], 16) == 1:
+                        self._mark_confirmed(key, tx_hash, checkpoint)
+                    else:
+                        # Reverted, sent again
+                        del self._sent[key]
+                elif tx is None:
+                    # Dropped by the node, sent again
+                    del self._sent[key]
+                else:
+                    self._watch(key, tx_hash)
+
+    def _template(self, token: HexStr) -> TransferTransaction:
+        with self._templates_lock:
+            template = self._templates.get(token.lower())
+            if template is None:
+                gas_limit = self._estimate_gas(token)
+                template = TransferTransaction(
+                    to=ADDRESS_DEFAULT,
+                    token_address=token,
+                    options=TransactionOptions(gas_limit=gas_limit),
+                )
+                self._templates[token.lower()] = template
+            return template
+
+    def _estimate_gas(self, token: HexStr) -> int:
+        # A minimal transfer from the first sender to a fresh address, a recipient
+        # without a balance costs the most as its balance slot is written for the first time
+        wallet = self._wallets[0]
+        sender = wallet._l1_account.address
+        transaction = TxTransfer(
+            web3=self._zksync,
+            token=token,
+            chain_id=wallet._metadata.l2_chain_id,
+            nonce=self._zksync.get_transaction_count(sender),
+            from_=sender,
+            to=Web3.to_checksum_address(os.urandom(20)),
+            value=1,
+            gas_price=self._zksync.fee_oracle.gas_price(),
+        )
+        gas = self._zksync.zks_estimate_gas_transfer(transaction.tx)
+        return math.ceil(gas * (1 + self.gas_margin))
+
+    def _write(self, checkpoint, entry: dict):
+        if checkpoint is not None:
+            checkpoint.write(json.dumps(entry) + "\n")
+            checkpoint.flush()
+
+    def _watch(self, key: str, tx_hash: HexStr):
+        future = self._zksync.receipt_waiter.submit(tx_hash, self.confirm_timeout)
+        with self._lock:
+            self._confirmations.append((key, tx_hash, future))
+
+    def _mark_confirmed(self, key: str, tx_hash: HexStr, checkpoint):
+        with self._lock:
+            self._sent.pop(key, None)
+            self._confirmed[key] = tx_hash
+            self._write(checkpoint, {"key": key, "hash": tx_hash, "confirmed": True})
+
+    def _done(self, key: str, submitted_at: float, checkpoint, future: Future):
+        latency = time.monotonic() - submitted_at
+        error = future.exception()
+        with self._lock:
+            if error is None:
+                tx_hash = Web3.to_hex(future.result())
+                self._sent[key] = tx_hash
+                self.stats.sent += 1
+                self.stats.latencies.append(latency)
+                self._write(checkpoint, {"key": key, "hash": tx_hash})
+            else:
+                self.stats.failed += 1
+                self.stats._error(error)
+            done = self.stats.sent + self.stats.failed
+        if error is None:
+            self._watch(key, tx_hash)
+        if self.on_progress is not None and done % self.progress_every == 0:
+            self.on_progress(self.stats)
+
+    def _confirm(self, checkpoint):
+        # Waits for the receipts of the sent payouts, bounded by confirm_timeout
+        confirmations = list(self._confirmations)
+        wait([future for _, _, future in confirmations])
+        for key, tx_hash, future in confirmations:
+            error = future.exception()
+            if error is not None:
+                # Stays sent in the checkpoint and is looked up on the next run
+                self.stats.unconfirmed += 1
+            elif future.result()["status"] == 1:
+                self.stats.confirmed += 1
+                self._mark_confirmed(key, tx_hash, checkpoint)
+            else:
+                self.stats.failed += 1
+                self.stats._error(RuntimeError(f"Transaction {tx_hash} reverted"))
+                with self._lock:
+                    self._sent.pop(key, None)
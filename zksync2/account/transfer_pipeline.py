@@ -0,0 +1,243 @@
+import heapq
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional
+
+from eth_typing import HexStr
+
+from zksync2.account.wallet_l2 import WalletL2
+from zksync2.core.nonce_manager import KNOWN_TRANSACTION, NONCE_ERROR
+from zksync2.core.types import TransactionOptions, TransferTransaction
+from zksync2.core.utils import ADDRESS_DEFAULT
+from zksync2.signer.eth_signer import PrivateKeyEthSigner
+from zksync2.transaction.transaction712 import Transaction712
+
+
+@dataclass
+class _Item:
+    sequence: int
+    tx: TransferTransaction
+    future: Future
+    # Whether the nonce was taken by the pipeline, only those are reassigned
+    managed: bool = True
+    tx_712: Optional[Transaction712] = None
+    estimated_tx: Optional[dict] = None
+    raw: Optional[bytes] = None
+    failed: bool = False
+
+
+class TransferPipeline:
+    """
+    Sends many transfers of one account with the stages of WalletL2.transfer overlapped.
+
+    Nonces are taken from the nonce manager of the client in submission order.
+    Building, gas estimation and signing run on a pool of estimate_workers threads
+    with one signer shared by all transfers, and the signed transactions are handed
+    to a pool of max_in_flight threads in nonce order, so that at most max_in_flight
+    eth_sendRawTransaction calls are outstanding. submit blocks while max_pending
+    transfers are in the pipeline.
+
+    The nonce of a transfer which fails before or when it is sent is kept by the pipeline
+    and given to the next transfer to be sent, which is re-signed, so that the later
+    transfers are not stuck behind a gap. A gap left once nothing remains to be sent,
+    e.g. when a send fails while a later one is already in flight, is filled on close
+    with a transfer of zero to the account itself, see filled_gaps.
+
+    Fees are served by the fee oracle of the client, which is refreshed in the background
+    while the pipeline is open. Transfers of the same shape only pay for one live estimate
+    when the client has a gas_estimate_cache.
+    """
+
+    DEFAULT_ESTIMATE_WORKERS = 8
+    DEFAULT_MAX_IN_FLIGHT = 32
+    DEFAULT_MAX_PENDING = 1024
+
+    def __init__(
+        self,
+        wallet: WalletL2,
+        estimate_workers: int = DEFAULT_ESTIMATE_WORKERS,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        max_pending: int = DEFAULT_MAX_PENDING,
+    ):
+        self._wallet = wallet
+        self._zksync = wallet._zksync_web3.zksync
+        self._account = wallet._l1_account
+        self._chain_id = wallet._metadata.l2_chain_id
+        self._signer = PrivateKeyEthSigner(self._account, self._chain_id)
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._submit_lock = threading.Lock()
+        self._sequence = 0
+        # Prepared transactions waiting for their predecessors, by sequence
+        self._ready: Dict[int, _Item] = {}
+        self._next_to_send = 0
+        self._ready_lock = threading.Lock()
+        # Nonces of failed transfers, given to the next transfers to be sent
+        self._free: List[int] = []
+        self._max_sent: Optional[int] = None
+        self._nonce_lock = threading.Lock()
+        # Hashes of the transfers which filled gaps on close, by nonce
+        self.filled_gaps: Dict[int, HexStr] = {}
+        self._workers = ThreadPoolExecutor(
+            estimate_workers, thread_name_prefix="zksync2-transfer"
+        )
+        self._senders = ThreadPoolExecutor(
+            max_in_flight, thread_name_prefix="zksync2-send"
+        )
+        self._owns_refresh = not self._zksync.fee_oracle.refreshing
+        self._zksync.fee_oracle.start_background_refresh()
+
+    def submit(self, tx: TransferTransaction) -> Future:
+        """
+        Queues a transfer and returns a future resolved with its hash once it is sent.
+        Blocks while the pipeline is full.
+
+        :param tx: TransferTransaction class. Required parameters are to and amount.
+        """
+        self._slots.acquire()
+        if tx.options is None:
+            tx.options = TransactionOptions()
+        if tx.options.chain_id is None:
+            tx.options.chain_id = self._chain_id
+        if tx.token_address is None:
+            tx.token_address = ADDRESS_DEFAULT
+        future = Future()
+        with self._submit_lock:
+            managed = tx.options.nonce is None
+            if managed:
+                tx.options.nonce = self._zksync.nonce_manager.next_nonce(
+                    self._account.address
+                )
+            item = _Item(self._sequence, tx, future, managed)
+            self._sequence += 1
+        self._workers.submit(self._prepare, item)
+        return future
+
+    def close(self):
+        """
+        Waits until all submitted transfers are sent, fills the gaps left by failed ones
+        and stops the workers.
+        """
+        self._workers.shutdown(wait=True)
+        self._senders.shutdown(wait=True)
+        self._fill_gaps()
+        if self._owns_refresh:
+            self._zksync.fee_oracle.stop_background_refresh()
+
+    def __enter__(self) -> "TransferPipeline":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _sign(self, tx_712: Transaction712) -> bytes:
+        return tx_712.encode(self._signer.sign_typed_data(tx_712.to_eip712_struct()))
+
+    def _prepare(self, item: _Item):
+        try:
+            tx_fun_call = self._zksync.get_transfer_transaction(
+                item.tx, self._account.address
+            )
+            gas_limit = item.tx.options.gas_limit
+            if gas_limit == 0:
+                gas_limit = self._zksync.zks_estimate_gas_transfer(tx_fun_call.tx)
+            item.estimated_tx = tx_fun_call.tx
+            item.tx_712 = tx_fun_call.tx712(gas_limit)
+            item.raw = self._sign(item.tx_712)
+        except BaseException as error:
+            item.failed = True
+            self._finish(item, error=error)
+        self._dispatch(item)
+
+    def _dispatch(self, item: _Item):
+        # Hands prepared transactions to the senders in nonce order
+        with self._ready_lock:
+            self._ready[item.sequence] = item
+            while self._next_to_send in self._ready:
+                ready = self._ready.pop(self._next_to_send)
+                self._next_to_send += 1
+                if not ready.failed:
+                    self._senders.submit(self._send, ready)
+                elif ready.managed:
+                    self._free_nonce(ready.tx.options.nonce)
+
+    def _free_nonce(self, nonce: int):
+        with self._nonce_lock:
+            heapq.heappush(self._free, nonce)
+
+    def _send(self, item: _Item):
+        address = self._account.address
+        with self._nonce_lock:
+            if item.managed and self._free and self._free[0] < item.tx.options.nonce:
+                # Takes the lower nonce of a failed transfer and leaves its own to the next one
+                nonce = heapq.heapreplace(self._free, item.tx.options.nonce)
+                item.tx.options.nonce = nonce
+                item.tx_712 = replace(item.tx_712, nonce=nonce)
+                item.raw = None
+        nonce = item.tx.options.nonce
+        try:
+            if item.raw is None:
+                item.raw = self._sign(item.tx_712)
+            tx_hash = self._zksync.send_raw_transaction(item.raw)
+        except BaseException as error:
+            self._send_failed(item, error)
+            self._finish(item, error=error)
+            return
+        self._zksync.nonce_manager.mark_sent(address, nonce)
+        with self._nonce_lock:
+            if self._max_sent is None or nonce > self._max_sent:
+                self._max_sent = nonce
+        self._finish(item, tx_hash)
+
+    def _send_failed(self, item: _Item, error: BaseException):
+        nonce = item.tx.options.nonce
+        if not isinstance(error, ValueError):
+            # E.g. a connection error, the transaction may have reached the node
+            return
+        if self._zksync.gas_estimate_cache is not None:
+            self._zksync.gas_estimate_cache.report_failure(item.estimated_tx)
+        message = str(error)
+        rejected = NONCE_ERROR.search(message) is None and not any(
+            known in message.lower() for known in KNOWN_TRANSACTION
+        )
+        if rejected and item.managed:
+            self._free_nonce(nonce)
+        else:
+            self._zksync.nonce_manager.handle_error(self._account.address, nonce, error)
+
+    def _fill_gaps(self):
+        address = self._account.address
+        with self._nonce_lock:
+            free, self._free = sorted(self._free), []
+            max_sent = self._max_sent
+        for nonce in free:
+            if max_sent is not None and nonce < max_sent:
+                try:
+                    self.filled_gaps[nonce] = self._send_filler(nonce)
+                    continue
+                except Exception:
+                    # Left to the nonce manager, the next transaction of the account fills it
+                    pass
+            self._zksync.nonce_manager.release(address, nonce)
+
+    def _send_filler(self, nonce: int) -> HexStr:
+        tx = TransferTransaction(
+            to=self._account.address,
+            amount=0,
+            token_address=ADDRESS_DEFAULT,
+            options=TransactionOptions(nonce=nonce, chain_id=self._chain_id),
+        )
+        tx_fun_call = self._zksync.get_transfer_transaction(tx, self._account.address)
+        tx_712 = tx_fun_call.tx712(
+            self._zksync.zks_estimate_gas_transfer(tx_fun_call.tx)
+        )
+        tx_hash = self._zksync.send_raw_transaction(self._sign(tx_712))
+        self._zksync.nonce_manager.mark_sent(self._account.address, nonce)
+        return tx_hash
+
+    def _finish(self, item: _Item, tx_hash: HexStr = None, error: BaseException = None):
+        self._slots.release()
+        if error is not None:
+            item.future.set_exception(error)
+        else:
+            item.future.set_result(tx_hash)
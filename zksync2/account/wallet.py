@@ -1,5 +1,6 @@
 from zksync2.account.wallet_l1 import WalletL1
 from zksync2.account.wallet_l2 import WalletL2
+from zksync2.core.chain_metadata import ChainMetadata
 
 from web3 import Web3
 
@@ -7,12 +8,18 @@ from eth_account.signers.base import BaseAccount
 
 
 class Wallet(WalletL1, WalletL2):
-    def __init__(self, zksync_web3: Web3, eth_web3: Web3, l1_account: BaseAccount):
+    def __init__(
+        self,
+        zksync_web3: Web3,
+        eth_web3: Web3,
+        l1_account: BaseAccount,
+        metadata: ChainMetadata = None,
+    ):
         self._eth_web3 = eth_web3
         self._zksync_web3 = zksync_web3
         self._l1_account = l1_account
-        WalletL1.__init__(self, zksync_web3, eth_web3, l1_account)
-        WalletL2.__init__(self, zksync_web3, eth_web3, l1_account)
+        WalletL1.__init__(self, zksync_web3, eth_web3, l1_account, metadata)
+        WalletL2.__init__(self, zksync_web3, eth_web3, l1_account, self._metadata)
 
     def sign_transaction(self, tx):
         return self._l1_account.sign_transaction(tx)
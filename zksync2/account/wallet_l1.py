@@ -1,17 +1,31 @@
-from typing import Union, Type
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List, Optional, Union, Type
 
 from eth_account.signers.base import BaseAccount
 from eth_typing import HexStr, Address
 from eth_utils import event_signature_to_log_topic, add_0x_prefix
+from hexbytes import HexBytes
 from web3 import Web3
 from web3.contract import Contract
+from web3.contract.contract import ContractFunction
 from web3.middleware import geth_poa_middleware
-from web3.types import TxReceipt
+from web3._utils.transactions import fill_transaction_defaults
+from web3.types import TxParams, TxReceipt
 
+from zksync2.account.fee_bumper import FeeBumper
 from zksync2.account.utils import (
     deposit_to_request_execute,
     prepare_transaction_options,
 )
+from zksync2.core.chain_metadata import ChainMetadata
+from zksync2.core.concurrency import run_concurrently
+from zksync2.core.fee_oracle import FeeOracle
+from zksync2.core.nonce_manager import NonceManager
+from zksync2.core.token_mapping import TokenBridge
 from zksync2.core.types import (
     BridgeAddresses,
     ZksMessageProof,
@@ -23,20 +37,23 @@ from zksync2.core.types import (
     FullDepositFee,
     L1BridgeContracts,
     TransactionOptions,
+    FinalizeWithdrawalResult,
 )
 from zksync2.core.utils import (
     RecommendedGasLimit,
     to_bytes,
     is_eth,
     apply_l1_to_l2_alias,
-    get_custom_bridge_data,
+    encode_custom_bridge_data,
     BOOTLOADER_FORMAL_ADDRESS,
     undo_l1_to_l2_alias,
     DEPOSIT_GAS_PER_PUBDATA_LIMIT,
 )
 from zksync2.manage_contracts.deploy_addresses import ZkSyncAddresses
+from zksync2.manage_contracts.function_encoder import function_encoder
+from zksync2.manage_contracts.multicall import Multicall
 from zksync2.manage_contracts.utils import (
-    zksync_abi_default,
+    cached_contract,
     l1_bridge_abi_default,
     get_erc20_abi,
     l2_bridge_abi_default,
@@ -59,21 +76,35 @@ class WalletL1:
     DEPOSIT_GAS_PER_PUBDATA_LIMIT = 800
     RECOMMENDED_DEPOSIT_L2_GAS_LIMIT = 10000000
     L1_MESSENGER_ADDRESS = "0x0000000000000000000000000000000000008008"
+    BASE_COST_TTL = 60.0
+    BASE_COST_CACHE_SIZE = 64
 
-    def __init__(self, zksync_web3: Web3, eth_web3: Web3, l1_account: BaseAccount):
+    def __init__(
+        self,
+        zksync_web3: Web3,
+        eth_web3: Web3,
+        l1_account: BaseAccount,
+        metadata: ChainMetadata = None,
+    ):
         self._eth_web3 = eth_web3
-        self._eth_web3.middleware_onion.inject(geth_poa_middleware, layer=0)
+        if geth_poa_middleware not in self._eth_web3.middleware_onion:
+            self._eth_web3.middleware_onion.inject(geth_poa_middleware, layer=0)
         self._zksync_web3 = zksync_web3
-        self._main_contract_address = Web3.to_checksum_address(
-            self._zksync_web3.zksync.zks_main_contract()
-        )
-        self.contract = self._eth_web3.eth.contract(
-            self._main_contract_address, abi=zksync_abi_default()
-        )
+        if metadata is None:
+            metadata = ChainMetadata.for_clients(zksync_web3, eth_web3)
+        self._metadata = metadata
+        self._main_contract_address = metadata.main_contract_address
+        self.contract = metadata.main_contract(self._eth_web3)
         self._l1_account = l1_account
-        self.bridge_addresses: BridgeAddresses = (
-            self._zksync_web3.zksync.zks_get_bridge_contracts()
-        )
+        self.bridge_addresses: BridgeAddresses = metadata.bridge_addresses
+        self._l1_nonce_manager = NonceManager.for_client(self._eth_web3.eth)
+        self._l1_fee_oracle = FeeOracle.for_client(self._eth_web3.eth)
+        # Set to replace stuck L1 transactions (e.g. deposits) sent by the wallet
+        self.l1_fee_bumper: Optional[FeeBumper] = None
+        # (gas price, l2 gas limit, gas per pubdata) -> (base cost, time), LRU first
+        self._base_costs = OrderedDict()
+        self._base_costs_lock = threading.Lock()
+        self._l1_bridges = {}
 
     @property
     def main_contract(self) -> Union[Type[Contract], Contract]:
@@ -85,6 +116,74 @@ class WalletL1:
         """Returns the wallet address."""
         return self._l1_account.address
 
+    def _send_l1_transaction(self, tx) -> HexBytes:
+        signed_tx = self._l1_account.sign_transaction(tx)
+        try:
+            tx_hash = self._eth_web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        except ValueError as error:
+            self._l1_nonce_manager.handle_error(self.address, tx["nonce"], error)
+            raise
+        self._l1_nonce_manager.mark_sent(self.address, tx["nonce"])
+        if self.l1_fee_bumper is not None:
+            self.l1_fee_bumper.watch_l1_transaction(tx_hash, tx, self._l1_account)
+        return tx_hash
+
+    def _fill_l1_fee_options(self, options: TransactionOptions):
+        if options.gas_price is None and options.max_fee_per_gas is None:
+            fees = None
+            if self._metadata.l1_london_ready:
+                fees = self._l1_fee_oracle.suggest_fees()
+            if fees is None:
+                options.gas_price = self._l1_fee_oracle.gas_price()
+                return
+            if options.max_priority_fee_per_gas is None:
+                options.max_priority_fee_per_gas = fees.max_priority_fee_per_gas
+            options.max_fee_per_gas = (
+                int(fees.base_fee * self._l1_fee_oracle.base_fee_multiplier)
+                + options.max_priority_fee_per_gas
+            )
+        elif options.gas_price is None:
+            options.gas_price = self._l1_fee_oracle.gas_price()
+
+    @staticmethod
+    def _gas_price_for_estimation(options: TransactionOptions) -> int:
+        if options.max_priority_fee_per_gas is not None:
+            return options.max_fee_per_gas
+        return options.gas_price
+
+    def _is_weth_token(self, token: HexStr) -> bool:
+        mapping = self._zksync_web3.zksync.token_mapping_by_l1(token)
+        return mapping is not None and mapping.bridge == TokenBridge.WETH
+
+    def _default_l1_bridge(self, token: HexStr) -> HexStr:
+        if self._is_weth_token(token):
+            return self.bridge_addresses.weth_bridge_l1
+        return self.bridge_addresses.erc20_l1_default_bridge
+
+    def _l1_token(self, token: HexStr) -> Contract:
+        return cached_contract(
+            self._eth_web3.eth,
+            Web3.to_checksum_address(token),
+            abi=get_erc20_abi(),
+        )
+
+    def _custom_bridge_data(self, token: HexStr) -> bytes:
+        # name, symbol and decimals in one round trip
+        functions = self._l1_token(token).functions
+        name, symbol, decimals = Multicall.for_client(self._eth_web3.eth).call(
+            [functions.name(), functions.symbol(), functions.decimals()]
+        )
+        return encode_custom_bridge_data(name, symbol, decimals)
+
+    def _build_request_l2_transaction(
+        self, args: tuple, options: TransactionOptions, from_: HexStr
+    ) -> TxParams:
+        # Same as contract.functions.requestL2Transaction(*args).build_transaction(...)
+        tx = prepare_transaction_options(options, from_)
+        tx["to"] = self._main_contract_address
+        tx["data"] = function_encoder("IZkSync", "requestL2Transaction").encode(*args)
+        return fill_transaction_defaults(self._eth_web3, tx)
+
     def _get_withdraw_log(self, tx_receipt: TxReceipt, index: int = 0):
         topic = event_signature_to_log_topic("L1MessageSent(address,bytes32,bytes)")
 
@@ -129,13 +228,15 @@ class WalletL1:
     def get_l1_bridge_contracts(self) -> L1BridgeContracts:
         """Returns L1 bridge contract wrappers."""
         return L1BridgeContracts(
-            erc20=self._eth_web3.eth.contract(
+            erc20=cached_contract(
+                self._eth_web3.eth,
                 address=Web3.to_checksum_address(
                     self.bridge_addresses.erc20_l1_default_bridge
                 ),
                 abi=l1_bridge_abi_default(),
             ),
-            weth=self._eth_web3.eth.contract(
+            weth=cached_contract(
+                self._eth_web3.eth,
                 address=Web3.to_checksum_address(self.bridge_addresses.weth_bridge_l1),
                 abi=l1_bridge_abi_default(),
             ),
@@ -154,13 +255,35 @@ class WalletL1:
         if is_eth(token):
             return self._eth_web3.eth.get_balance(self.address, block.value)
         else:
-            token_contract = self._eth_web3.eth.contract(
-                address=Web3.to_checksum_address(token), abi=get_erc20_abi()
+            token_contract = cached_contract(
+                self._eth_web3.eth,
+                address=Web3.to_checksum_address(token),
+                abi=get_erc20_abi(),
             )
             return token_contract.functions.balanceOf(self.address).call(
-                {"chainId": self._eth_web3.eth.chain_id, "from": self.address}
+                {"chainId": self._metadata.l1_chain_id, "from": self.address}
             )
 
+    def get_l1_balances(
+        self,
+        tokens: List[HexStr],
+        block: EthBlockParams = EthBlockParams.LATEST,
+    ) -> List[int]:
+        """
+        Returns the amounts of the tokens the Wallet has on Ethereum in one round trip.
+
+        :param tokens: Token addresses, ETH is the zero address.
+        :param block: The block the balances should be checked on.
+        """
+        multicall = Multicall.for_client(self._eth_web3.eth)
+        calls = [
+            multicall.get_eth_balance(self.address)
+            if is_eth(token)
+            else self._l1_token(token).functions.balanceOf(self.address)
+            for token in tokens
+        ]
+        return multicall.call(calls, block.value)
+
     def get_allowance_l1(self, token: HexStr, bridge_address: Address = None):
         """
         Returns the amount of approved tokens for a specific L1 bridge.
@@ -168,47 +291,47 @@ class WalletL1:
         :param token: The address of the token on L1.
         :param bridge_address: The address of the bridge contract to be used. Defaults to the default zkSync bridge (either L1EthBridge or L1Erc20Bridge).
         """
-        token_contract = self._eth_web3.eth.contract(
-            address=Web3.to_checksum_address(token), abi=get_erc20_abi()
+        token_contract = cached_contract(
+            self._eth_web3.eth,
+            address=Web3.to_checksum_address(token),
+            abi=get_erc20_abi(),
         )
         if bridge_address is None:
-            l2_weth_token = ADDRESS_DEFAULT
-            try:
-                l2_weth_token = (
-                    self.get_l1_bridge_contracts()
-                    .weth.functions.l2TokenAddress(token)
-                    .call()
-                )
-            except:
-                pass
-            if l2_weth_token == ADDRESS_DEFAULT:
-                bridge_address = self.bridge_addresses.erc20_l1_default_bridge
-            else:
-                bridge_address = self.bridge_addresses.weth_bridge_l1
+            bridge_address = self._default_l1_bridge(token)
         return token_contract.functions.allowance(self.address, bridge_address).call(
             {
-                "chainId": self._eth_web3.eth.chain_id,
+                "chainId": self._metadata.l1_chain_id,
                 "from": self.address,
             }
         )
 
+    def get_allowances_l1(
+        self, tokens: List[HexStr], bridge_address: Address = None
+    ) -> List[int]:
+        """
+        Returns the amounts of approved tokens for the L1 bridges in one round trip.
+
+        :param tokens: The addresses of the tokens on L1.
+        :param bridge_address: The address of the bridge contract to be used. Defaults to the default zkSync bridge of each token.
+        """
+        if bridge_address is None:
+            self._zksync_web3.zksync.prefetch_token_mappings(tokens)
+        calls = [
+            self._l1_token(token).functions.allowance(
+                self.address,
+                bridge_address or self._default_l1_bridge(token),
+            )
+            for token in tokens
+        ]
+        return Multicall.for_client(self._eth_web3.eth).call(calls)
+
     def l2_token_address(self, address: HexStr) -> HexStr:
         """
         Returns the L2 token address equivalent for a L1 token address as they are not equal. ETH's address is set to zero address.
 
         :param address: The address of the token on L1.
         """
-        if is_eth(address):
-            return ADDRESS_DEFAULT
-
-        contracts = self.get_l1_bridge_contracts()
-        try:
-            l2_weth_token = contracts.weth.functions.l2TokenAddress(address).call()
-            if l2_weth_token != ADDRESS_DEFAULT:
-                return l2_weth_token
-        except:
-            pass
-        return contracts.erc20.functions.l2TokenAddress(address).call()
+        return self._zksync_web3.zksync.l2_token_address(address)
 
     def approve_erc20(
         self,
@@ -230,38 +353,29 @@ class WalletL1:
                 "ETH token can't be approved. The address of the token does not exist on L1"
             )
 
-        erc20 = self._eth_web3.eth.contract(
-            address=Web3.to_checksum_address(token), abi=get_erc20_abi()
+        erc20 = cached_contract(
+            self._eth_web3.eth,
+            address=Web3.to_checksum_address(token),
+            abi=get_erc20_abi(),
         )
 
         if bridge_address is None:
-            l2_weth_token = ADDRESS_DEFAULT
-            try:
-                l2_weth_token = (
-                    self.get_l1_bridge_contracts()
-                    .weth.functions.l2TokenAddress(token)
-                    .call()
-                )
-            except:
-                pass
-            if l2_weth_token == ADDRESS_DEFAULT:
-                bridge_address = self.bridge_addresses.erc20_l1_default_bridge
-            else:
-                bridge_address = self.bridge_addresses.weth_bridge_l1
+            bridge_address = self._default_l1_bridge(token)
         if gas_limit is None:
             # TODO: get the approve(bridgeAddress, amount) estimateGas transaction to put correct gas_limit
             gas_limit = RecommendedGasLimit.ERC20_APPROVE
-        options = TransactionOptions(
-            chain_id=self._eth_web3.eth.chain_id,
-            gas_price=self._eth_web3.eth.gas_price,
-            gas_limit=gas_limit,
-            nonce=self._eth_web3.eth.get_transaction_count(self.address),
-        )
-        tx = erc20.functions.approve(bridge_address, amount).build_transaction(
-            prepare_transaction_options(options, self.address)
-        )
-        signed_tx = self._l1_account.sign_transaction(tx)
-        tx_hash = self._eth_web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        gas_price = self._l1_fee_oracle.gas_price()
+        with self._l1_nonce_manager.reserve(self.address) as nonce:
+            options = TransactionOptions(
+                chain_id=self._metadata.l1_chain_id,
+                gas_price=gas_price,
+                gas_limit=gas_limit,
+                nonce=nonce,
+            )
+            tx = erc20.functions.approve(bridge_address, amount).build_transaction(
+                prepare_transaction_options(options, self.address)
+            )
+            tx_hash = self._send_l1_transaction(tx)
         tx_receipt = self._eth_web3.eth.wait_for_transaction_receipt(tx_hash)
 
         return tx_receipt
@@ -280,95 +394,125 @@ class WalletL1:
         :param gas_price: The L1 gas price of the L1 transaction that will send the request for an execute call (optional).
         """
         if gas_price is None:
-            gas_price = self._eth_web3.eth.gas_price
-        options = TransactionOptions(
-            chain_id=self._eth_web3.eth.chain_id,
-            nonce=self._eth_web3.eth.get_transaction_count(self.address),
-        )
-        return self.contract.functions.l2TransactionBaseCost(
+            gas_price = self._l1_fee_oracle.gas_price()
+        key = (gas_price, l2_gas_limit, gas_per_pubdata_byte)
+        with self._base_costs_lock:
+            cached = self._base_costs.get(key)
+            if cached is not None and time.monotonic() - cached[1] < self.BASE_COST_TTL:
+                self._base_costs.move_to_end(key)
+                return cached[0]
+        options = TransactionOptions(chain_id=self._metadata.l1_chain_id)
+        base_cost = self.contract.functions.l2TransactionBaseCost(
             gas_price, l2_gas_limit, gas_per_pubdata_byte
         ).call(prepare_transaction_options(options, self.address))
-
-    def prepare_deposit_tx(self, transaction: DepositTransaction) -> DepositTransaction:
-        """
-        Returns populated deposit transaction.
-
-        :param transaction: DepositTransaction class. Not optional arguments are token(L1 token address) and amount.
-        """
+        with self._base_costs_lock:
+            self._base_costs[key] = (base_cost, time.monotonic())
+            self._base_costs.move_to_end(key)
+            while len(self._base_costs) > self.BASE_COST_CACHE_SIZE:
+                self._base_costs.popitem(last=False)
+        return base_cost
+
+    def _populate_deposit_tx(self, transaction: DepositTransaction, amount: int) -> int:
+        # Fills the deposit and returns its base cost. The lookups that do not depend
+        # on each other (fees, token route, token metadata and the ETH L2 gas estimate)
+        # are issued concurrently, the token route and bridge data are kept on the
+        # transaction so that deposit and estimate_gas_deposit do not look them up again.
         if transaction.options is None:
             transaction.options = TransactionOptions()
         if transaction.to is None:
             transaction.to = self.address
         if transaction.options.chain_id is None:
-            transaction.options.chain_id = self._eth_web3.eth.chain_id
-        if transaction.bridge_address is not None:
-            bridge_contract = self._eth_web3.eth.contract(
-                address=Web3.to_checksum_address(transaction.bridge_address),
-                abi=l1_bridge_abi_default(),
-            )
+            transaction.options.chain_id = self._metadata.l1_chain_id
+        token = transaction.token
+        estimate = transaction.l2_gas_limit is None
 
+        lookups = {"fees": lambda: self._fill_l1_fee_options(transaction.options)}
+        if is_eth(token):
+            if estimate:
+                lookups["l2_gas_limit"] = partial(
+                    self.estimate_default_bridge_deposit_l2_gas,
+                    token,
+                    amount,
+                    transaction.to,
+                    transaction.gas_per_pubdata_byte,
+                    self.address,
+                )
+        elif transaction.bridge_address is None:
+            lookups["is_weth"] = partial(self._is_weth_token, token)
+            known = self._zksync_web3.zksync.token_mapping_cache.by_l1(token)
+            if (
+                estimate
+                and transaction.custom_bridge_data is None
+                and (known is None or known.bridge == TokenBridge.ERC20)
+            ):
+                # Not needed for WETH, fetched before the route is known to save a round trip
+                lookups["bridge_data"] = partial(self._custom_bridge_data, token)
+        else:
+            if estimate:
+                bridge_contract = cached_contract(
+                    self._eth_web3.eth,
+                    address=Web3.to_checksum_address(transaction.bridge_address),
+                    abi=l1_bridge_abi_default(),
+                )
+                lookups["l2_address"] = bridge_contract.functions.l2TokenAddress(
+                    token
+                ).call
+            if (
+                transaction.custom_bridge_data is None
+                and transaction.bridge_address != self.bridge_addresses.weth_bridge_l1
+            ):
+                lookups["bridge_data"] = partial(self._custom_bridge_data, token)
+        results = dict(zip(lookups, run_concurrently(*lookups.values())))
+
+        if is_eth(token):
+            if estimate:
+                transaction.l2_gas_limit = results["l2_gas_limit"]
+        else:
+            value = 0
+            if transaction.bridge_address is None:
+                if results["is_weth"]:
+                    value = amount
+                    transaction.bridge_address = self.bridge_addresses.weth_bridge_l1
+                    l2_address = self.bridge_addresses.weth_bridge_l2
+                else:
+                    transaction.bridge_address = (
+                        self.bridge_addresses.erc20_l1_default_bridge
+                    )
+                    l2_address = self.bridge_addresses.erc20_l2_default_bridge
+            else:
+                l2_address = results.get("l2_address")
             if transaction.custom_bridge_data is None:
                 if transaction.bridge_address == self.bridge_addresses.weth_bridge_l1:
                     transaction.custom_bridge_data = "0x"
                 else:
-                    token_contract = self._zksync_web3.zksync.contract(
-                        transaction.token, abi=get_erc20_abi()
-                    )
-                    transaction.custom_bridge_data = get_custom_bridge_data(
-                        token_contract
-                    )
-
-            if transaction.l2_gas_limit is None:
-                l2_address = bridge_contract.functions.l2TokenAddress(
-                    transaction.token
-                ).call()
+                    transaction.custom_bridge_data = results.get("bridge_data")
+            if estimate:
                 transaction.l2_gas_limit = self.estimate_custom_bridge_deposit_l2_gas(
                     transaction.bridge_address,
                     l2_address,
-                    transaction.token,
-                    transaction.amount,
+                    token,
+                    amount,
                     transaction.to,
                     transaction.custom_bridge_data,
                     self.address,
                     transaction.gas_per_pubdata_byte,
+                    value,
                 )
-        elif transaction.l2_gas_limit is None:
-            transaction.l2_gas_limit = self.estimate_default_bridge_deposit_l2_gas(
-                transaction.token,
-                transaction.amount,
-                transaction.to,
-                transaction.gas_per_pubdata_byte,
-                self.address,
-            )
-        if (
-            transaction.options.gas_price is None
-            and transaction.options.max_fee_per_gas is None
-        ):
-            isReady, head = self.check_if_l1_chain_is_london_ready()
-            if isReady:
-                if transaction.options.max_priority_fee_per_gas is None:
-                    transaction.options.max_priority_fee_per_gas = (
-                        self._eth_web3.eth.max_priority_fee
-                    )
-                transaction.options.max_fee_per_gas = int(
-                    ((head["baseFeePerGas"] * 3) / 2)
-                    + transaction.options.max_priority_fee_per_gas
-                )
-        else:
-            transaction.options.gas_price = self._eth_web3.eth.gas_price
 
-        gas_price_for_estimation: int
-        if transaction.options.max_priority_fee_per_gas is not None:
-            gas_price_for_estimation = transaction.options.max_fee_per_gas
-        else:
-            gas_price_for_estimation = transaction.options.gas_price
-
-        base_cost = self.get_base_cost(
+        return self.get_base_cost(
             transaction.l2_gas_limit,
             transaction.gas_per_pubdata_byte,
-            gas_price_for_estimation,
+            self._gas_price_for_estimation(transaction.options),
         )
 
+    def prepare_deposit_tx(self, transaction: DepositTransaction) -> DepositTransaction:
+        """
+        Returns populated deposit transaction.
+
+        :param transaction: DepositTransaction class. Not optional arguments are token(L1 token address) and amount.
+        """
+        base_cost = self._populate_deposit_tx(transaction, transaction.amount)
+
         if is_eth(transaction.token):
             transaction.options.value = (
                 base_cost + transaction.operator_tip + transaction.amount
@@ -392,81 +536,17 @@ class WalletL1:
         """
         dummy_amount = 1
 
-        if transaction.options is None:
-            transaction.options = TransactionOptions()
-
-        if transaction.to is None:
-            transaction.to = self.address
-
-        if transaction.bridge_address is not None:
-            bridge_contract = self._eth_web3.eth.contract(
-                address=Web3.to_checksum_address(transaction.bridge_address),
-                abi=l1_bridge_abi_default(),
-            )
+        base_cost = self._populate_deposit_tx(transaction, dummy_amount)
+        gas_price_for_estimation = self._gas_price_for_estimation(transaction.options)
 
-            if transaction.custom_bridge_data is None:
-                if transaction.bridge_address == self.bridge_addresses.weth_bridge_l1:
-                    transaction.custom_bridge_data = "0x"
-                else:
-                    token_contract = self._zksync_web3.zksync.contract(
-                        transaction.token, abi=get_erc20_abi()
-                    )
-                    transaction.custom_bridge_data = get_custom_bridge_data(
-                        token_contract
-                    )
-
-            if transaction.l2_gas_limit is None:
-                l2_address = bridge_contract.functions.l2TokenAddress(
-                    transaction.token
-                ).call()
-                transaction.l2_gas_limit = self.estimate_custom_bridge_deposit_l2_gas(
-                    transaction.bridge_address,
-                    l2_address,
-                    transaction.token,
-                    dummy_amount,
-                    transaction.to,
-                    transaction.custom_bridge_data,
-                    self.address,
-                    transaction.gas_per_pubdata_byte,
+        lookups = [self.get_l1_balance]
+        if not is_eth(transaction.token):
+            lookups.append(
+                lambda: self.get_allowance_l1(
+                    transaction.token, transaction.bridge_address
                 )
-        elif transaction.l2_gas_limit is None:
-            transaction.l2_gas_limit = self.estimate_default_bridge_deposit_l2_gas(
-                transaction.token,
-                dummy_amount,
-                transaction.to,
-                transaction.gas_per_pubdata_byte,
-                self.address,
             )
-        if (
-            transaction.options.gas_price is None
-            and transaction.options.max_fee_per_gas is None
-        ):
-            isReady, head = self.check_if_l1_chain_is_london_ready()
-            if isReady:
-                if transaction.options.max_priority_fee_per_gas is None:
-                    transaction.options.max_priority_fee_per_gas = (
-                        self._eth_web3.eth.max_priority_fee
-                    )
-                transaction.options.max_fee_per_gas = int(
-                    ((head["baseFeePerGas"] * 3) / 2)
-                    + transaction.options.max_priority_fee_per_gas
-                )
-        else:
-            transaction.options.gas_price = self._eth_web3.eth.gas_price
-
-        gas_price_for_estimation: int
-        if transaction.options.max_priority_fee_per_gas is not None:
-            gas_price_for_estimation = transaction.options.max_fee_per_gas
-        else:
-            gas_price_for_estimation = transaction.options.gas_price
-
-        base_cost = self.get_base_cost(
-            transaction.l2_gas_limit,
-            transaction.gas_per_pubdata_byte,
-            gas_price_for_estimation,
-        )
-
-        self_balance_eth = self.get_l1_balance()
+        self_balance_eth, *allowance = run_concurrently(*lookups)
         # We could use 0, because the final fee will anyway be bigger than
         if base_cost >= (self_balance_eth + dummy_amount):
             recommended_eth_balance = (
@@ -486,10 +566,7 @@ class WalletL1:
             )
 
         if not is_eth(transaction.token):
-            allowance = self.get_allowance_l1(
-                transaction.token, transaction.bridge_address
-            )
-            if allowance < dummy_amount:
+            if allowance[0] < dummy_amount:
                 RuntimeError("Not enough allowance to cover the deposit")
 
         # Deleting the explicit gas limits in the fee estimation
@@ -543,52 +620,41 @@ class WalletL1:
                 )
 
             if transaction.bridge_address is not None:
-                l1_bridge = self._eth_web3.eth.contract(
+                l1_bridge = cached_contract(
+                    self._eth_web3.eth,
                     address=Web3.to_checksum_address(transaction.bridge_address),
                     abi=l1_bridge_abi_default(),
                 )
             else:
-                l2_weth_token = ADDRESS_DEFAULT
-                try:
-                    l2_weth_token = (
-                        self.get_l1_bridge_contracts()
-                        .weth.functions.l2TokenAddress(transaction.token)
-                        .call()
-                    )
-                except:
-                    pass
-                if l2_weth_token == ADDRESS_DEFAULT:
-                    bridge_address = self.bridge_addresses.erc20_l1_default_bridge
-                else:
-                    bridge_address = self.bridge_addresses.weth_bridge_l1
-                l1_bridge = self._eth_web3.eth.contract(
-                    address=Web3.to_checksum_address(bridge_address),
+                l1_bridge = cached_contract(
+                    self._eth_web3.eth,
+                    address=Web3.to_checksum_address(
+                        self._default_l1_bridge(transaction.token)
+                    ),
                     abi=l1_bridge_abi_default(),
                 )
-            if transaction.options.nonce is None:
-                transaction.options.nonce = self._eth_web3.eth.get_transaction_count(
-                    self.address
+            with self._l1_nonce_manager.reserve(
+                self.address, transaction.options.nonce
+            ) as nonce:
+                transaction.options.nonce = nonce
+                tx = l1_bridge.functions.deposit(
+                    transaction.to,
+                    transaction.token,
+                    transaction.amount,
+                    transaction.l2_gas_limit,
+                    transaction.gas_per_pubdata_byte,
+                    transaction.refund_recipient,
+                ).build_transaction(
+                    {
+                        "from": self.address,
+                        "maxFeePerGas": transaction.options.max_fee_per_gas,
+                        "maxPriorityFeePerGas": transaction.options.max_priority_fee_per_gas,
+                        "nonce": transaction.options.nonce,
+                        "value": transaction.options.value,
+                    }
                 )
-            tx = l1_bridge.functions.deposit(
-                transaction.to,
-                transaction.token,
-                transaction.amount,
-                transaction.l2_gas_limit,
-                transaction.gas_per_pubdata_byte,
-                transaction.refund_recipient,
-            ).build_transaction(
-                {
-                    "from": self.address,
-                    "maxFeePerGas": transaction.options.max_fee_per_gas,
-                    "maxPriorityFeePerGas": transaction.options.max_priority_fee_per_gas,
-                    "nonce": self._eth_web3.eth.get_transaction_count(self.address),
-                    "value": transaction.options.value,
-                }
-            )
-            signed_tx = self._l1_account.sign_transaction(tx)
-            txn_hash = self._eth_web3.eth.send_raw_transaction(signed_tx.rawTransaction)
 
-            return txn_hash
+                return self._send_l1_transaction(tx)
 
     def estimate_gas_deposit(self, transaction: DepositTransaction):
         """
@@ -599,16 +665,18 @@ class WalletL1:
         """
         transaction = self.prepare_deposit_tx(transaction)
         if is_eth(transaction.token):
-            tx = self.contract.functions.requestL2Transaction(
-                Web3.to_checksum_address(transaction.to),
-                transaction.l2_value,
-                HexStr("0x"),
-                transaction.l2_gas_limit,
-                transaction.gas_per_pubdata_byte,
-                list(),
+            tx = self._build_request_l2_transaction(
+                (
+                    Web3.to_checksum_address(transaction.to),
+                    transaction.l2_value,
+                    HexStr("0x"),
+                    transaction.l2_gas_limit,
+                    transaction.gas_per_pubdata_byte,
+                    list(),
+                    self.address,
+                ),
+                transaction.options,
                 self.address,
-            ).build_transaction(
-                prepare_transaction_options(transaction.options, self.address)
             )
 
             return self._eth_web3.eth.estimate_gas(tx)
@@ -616,9 +684,10 @@ class WalletL1:
             if transaction.bridge_address is None:
                 bridge = self.get_l1_bridge_contracts().erc20
             else:
-                bridge = self._eth_web3.eth.contract(
+                bridge = cached_contract(
+                    self._eth_web3.eth,
                     Web3.to_checksum_address(transaction.bridge_address),
-                    abi=get_erc20_abi(),
+                    abi=l1_bridge_abi_default(),
                 )
 
             tx = bridge.functions.deposit(
@@ -657,12 +726,13 @@ class WalletL1:
         transaction = self._zksync_web3.zksync.eth_get_transaction_by_hash(deposit_hash)
 
         l1_bridge_address = undo_l1_to_l2_alias(receipt.from_)
-        l1_bridge = self._eth_web3.eth.contract(
+        l1_bridge = cached_contract(
+            self._eth_web3.eth,
             address=Web3.to_checksum_address(l1_bridge_address),
             abi=l1_bridge_abi_default(),
         )
 
-        l2_bridge = self._eth_web3.eth.contract(abi=l2_bridge_abi_default())
+        l2_bridge = cached_contract(self._eth_web3.eth, abi=l2_bridge_abi_default())
         calldata = l2_bridge.decode_function_input(transaction["data"])
 
         proof = self._zksync_web3.zksync.zks_get_log_proof(
@@ -672,7 +742,7 @@ class WalletL1:
             raise RuntimeError("Log proof not found!")
 
         options = TransactionOptions(
-            chain_id=self._eth_web3.eth.chain_id,
+            chain_id=self._metadata.l1_chain_id,
             nonce=self._eth_web3.eth.get_transaction_count(self.address),
         )
         return l1_bridge.functions.claimFailedDeposit(
@@ -703,23 +773,11 @@ class WalletL1:
             )
             return self._zksync_web3.zksync.zks_estimate_l1_to_l2_execute(func_call.tx)
         else:
-            l2_weth_token = ADDRESS_DEFAULT
-            try:
-                l2_weth_token = (
-                    self.get_l1_bridge_contracts()
-                    .weth.functions.l2TokenAddress(token)
-                    .call()
-                )
-            except:
-                pass
-            if l2_weth_token == ADDRESS_DEFAULT:
+            if not self._is_weth_token(token):
                 value = 0
                 l1_bridge_address = self.bridge_addresses.erc20_l1_default_bridge
                 l2_bridge_address = self.bridge_addresses.erc20_l2_default_bridge
-                token_contract = self._eth_web3.eth.contract(
-                    Web3.to_checksum_address(token), abi=get_erc20_abi()
-                )
-                bridge_data = get_custom_bridge_data(token_contract)
+                bridge_data = self._custom_bridge_data(token)
             else:
                 value = amount
                 l1_bridge_address = self.bridge_addresses.weth_bridge_l1
@@ -768,12 +826,50 @@ class WalletL1:
         amount: int,
         bridge_data: bytes,
     ) -> HexStr:
-        l2_bridge = self._eth_web3.eth.contract(abi=l2_bridge_abi_default())
-        return l2_bridge.encodeABI(
-            "finalizeDeposit",
-            (l1_sender, l2_receiver, l1_token_address, amount, bridge_data),
+        return function_encoder("IL2Bridge", "finalizeDeposit").encode(
+            l1_sender, l2_receiver, l1_token_address, amount, bridge_data
+        )
+
+    def _l1_bridge_of(self, l2_bridge_address: HexStr) -> Contract:
+        # The L1 counterpart of an L2 bridge never changes, it is fetched once
+        key = l2_bridge_address.lower()
+        l1_bridge_address = self._l1_bridges.get(key)
+        if l1_bridge_address is None:
+            l2_bridge = cached_contract(
+                self._zksync_web3.zksync,
+                address=Web3.to_checksum_address(l2_bridge_address),
+                abi=l2_bridge_abi_default(),
+            )
+            l1_bridge_address = l2_bridge.functions.l1Bridge().call()
+            self._l1_bridges[key] = l1_bridge_address
+        return cached_contract(
+            self._eth_web3.eth,
+            address=Web3.to_checksum_address(l1_bridge_address),
+            abi=l1_bridge_abi_default(),
         )
 
+    def _finalize_withdrawal_transaction(
+        self, params: dict, options: TransactionOptions
+    ) -> TxParams:
+        merkle_proof = [to_bytes(proof) for proof in params["proof"]]
+        if is_eth(params["sender"]):
+            withdraw_to = HexStr("0x" + params["message"][4:24].hex())
+            if withdraw_to.lower() == self.bridge_addresses.weth_bridge_l1.lower():
+                finalize = (
+                    self.get_l1_bridge_contracts().weth.functions.finalizeEthWithdrawal
+                )
+            else:
+                finalize = self.contract.functions.finalizeEthWithdrawal
+        else:
+            finalize = self._l1_bridge_of(params["sender"]).functions.finalizeWithdrawal
+        return finalize(
+            params["l1_batch_number"],
+            params["l2_message_index"],
+            params["l2_tx_number_in_block"],
+            params["message"],
+            merkle_proof,
+        ).build_transaction(prepare_transaction_options(options, self.address))
+
     def finalize_withdrawal(self, withdraw_hash, index: int = 0):
         """
         Proves the inclusion of the L2 -> L1 withdrawal message.
@@ -782,67 +878,72 @@ class WalletL1:
         :param index:nIn case there were multiple withdrawals in one transaction, you may pass an index of the withdrawal you want to finalize (defaults to 0).
         """
         params = self._finalize_withdrawal_params(withdraw_hash, index)
-        merkle_proof = []
-        for proof in params["proof"]:
-            merkle_proof.append(to_bytes(proof))
+        with self._l1_nonce_manager.reserve(self.address) as nonce:
+            options = TransactionOptions(
+                chain_id=self._metadata.l1_chain_id, nonce=nonce
+            )
+            tx = self._finalize_withdrawal_transaction(params, options)
+            return self._send_l1_transaction(tx)
 
-        options = TransactionOptions(
-            chain_id=self._eth_web3.eth.chain_id,
-            nonce=self._eth_web3.eth.get_transaction_count(self.address),
-        )
+    def finalize_withdrawals(
+        self, withdraw_hashes: List[HexStr], index: int = 0, max_concurrency: int = 8
+    ) -> List[FinalizeWithdrawalResult]:
+        """
+        Finalizes many withdrawals. Receipts and proofs are fetched and the transactions built
+        concurrently, while the built ones are signed and broadcast in order from one thread.
+        Each transaction takes its nonce once the previous one was sent, so a rejected transaction
+        leaves its nonce to the next one instead of a gap stalling the later ones.
+        A failed withdrawal does not stop the others, its error is set on its result.
+
+        :param withdraw_hashes: Hashes of the L2 transactions where the withdrawals were initiated.
+        :param index: The index of the withdrawal in each transaction (defaults to 0).
+        :param max_concurrency: The maximum number of withdrawals being prepared at the same time.
+        """
+        results = [FinalizeWithdrawalResult(h, index) for h in withdraw_hashes]
+        options = TransactionOptions(chain_id=self._metadata.l1_chain_id)
+        self._fill_l1_fee_options(options)
 
-        if is_eth(params["sender"]):
-            withdraw_to = HexStr("0x" + params["message"][4:24].hex())
-            if withdraw_to.lower() == self.bridge_addresses.weth_bridge_l1.lower():
-                tx = (
-                    self.get_l1_bridge_contracts()
-                    .weth.functions.finalizeEthWithdrawal(
-                        params["l1_batch_number"],
-                        params["l2_message_index"],
-                        params["l2_tx_number_in_block"],
-                        params["message"],
-                        merkle_proof,
-                    )
-                    .build_transaction(
-                        prepare_transaction_options(options, self.address)
-                    )
-                )
-            else:
-                tx = self.contract.functions.finalizeEthWithdrawal(
-                    params["l1_batch_number"],
-                    params["l2_message_index"],
-                    params["l2_tx_number_in_block"],
-                    params["message"],
-                    merkle_proof,
-                ).build_transaction(prepare_transaction_options(options, self.address))
-            signed = self._l1_account.sign_transaction(tx)
-            tx_hash = self._eth_web3.eth.send_raw_transaction(signed.rawTransaction)
-            return tx_hash
-        else:
-            l2_bridge = self._zksync_web3.zksync.contract(
-                address=Web3.to_checksum_address(params["sender"]),
-                abi=l2_bridge_abi_default(),
-            )
-            l1_bridge = self._eth_web3.eth.contract(
-                address=Web3.to_checksum_address(l2_bridge.functions.l1Bridge().call()),
-                abi=l1_bridge_abi_default(),
+        def build(result: FinalizeWithdrawalResult) -> TxParams:
+            params = self._finalize_withdrawal_params(result.withdraw_hash, index)
+            return self._finalize_withdrawal_transaction(params, options)
+
+        def send(result: FinalizeWithdrawalResult, tx: TxParams):
+            try:
+                with self._l1_nonce_manager.reserve(self.address) as nonce:
+                    tx["nonce"] = nonce
+                    result.tx_hash = self._send_l1_transaction(tx)
+            except Exception as error:
+                result.error = error
+
+        broadcaster = ThreadPoolExecutor(1)
+        with ThreadPoolExecutor(max_concurrency) as pool, broadcaster:
+            builds = [pool.submit(build, result) for result in results]
+            for result, future in zip(results, builds):
+                try:
+                    tx = future.result()
+                except Exception as error:
+                    result.error = error
+                    continue
+                broadcaster.submit(send, result, tx)
+        return results
+
+    def _is_withdrawal_finalized_call(
+        self, sender: HexStr, l1_batch_number: int, l2_message_index: int
+    ) -> ContractFunction:
+        if is_eth(sender):
+            return self.contract.functions.isEthWithdrawalFinalized(
+                l1_batch_number, l2_message_index
             )
-            l1_batch_number = params["l1_batch_number"]
-            l2_message_index = params["l2_message_index"]
-            l2_tx_number_in_block = params["l2_tx_number_in_block"]
-            message = params["message"]
-
-            tx = l1_bridge.functions.finalizeWithdrawal(
-                params["l1_batch_number"],
-                params["l2_message_index"],
-                params["l2_tx_number_in_block"],
-                params["message"],
-                merkle_proof,
-            ).build_transaction(prepare_transaction_options(options, self.address))
-
-            signed = self._l1_account.sign_transaction(tx)
-            tx_hash = self._eth_web3.eth.send_raw_transaction(signed.rawTransaction)
-            return tx_hash
+        l1_bridge = cached_contract(
+            self._eth_web3.eth,
+            address=Web3.to_checksum_address(
+                self.bridge_addresses.erc20_l1_default_bridge
+            ),
+            abi=l1_bridge_abi_default(),
+        )
+        return l1_bridge.functions.isWithdrawalFinalized(
+            l1_batch_number, l2_message_index
+        )
 
     def is_withdrawal_finalized(self, withdraw_hash, index: int = 0):
         """
@@ -851,34 +952,10 @@ class WalletL1:
         :param withdraw_hash: Hash of the L2 transaction where the withdrawal was initiated.
         :param index:nIn case there were multiple withdrawals in one transaction, you may pass an index of the withdrawal you want to finalize (defaults to 0).
         """
-        tx_receipt = self._zksync_web3.zksync.get_transaction_receipt(withdraw_hash)
-        log, _ = self._get_withdraw_log(tx_receipt, index)
-        l2_to_l1_log_index, _ = self._get_withdraw_l2_to_l1_log(tx_receipt, index)
-        sender = add_0x_prefix(HexStr(log["topics"][1][12:].hex()))
-        hex_hash = withdraw_hash
-        proof: ZksMessageProof = self._zksync_web3.zksync.zks_get_log_proof(
-            hex_hash, l2_to_l1_log_index
-        )
-
-        l2_block_number = log["l1BatchNumber"]
-        options = TransactionOptions(
-            chain_id=self._eth_web3.eth.chain_id,
-            nonce=self._eth_web3.eth.get_transaction_count(self.address),
-        )
-        if is_eth(sender):
-            return self.contract.functions.isEthWithdrawalFinalized(
-                int(l2_block_number, 16), proof.id
-            ).call(prepare_transaction_options(options, self.address))
-        else:
-            l1_bridge = self._eth_web3.eth.contract(
-                address=Web3.to_checksum_address(
-                    self.bridge_addresses.erc20_l1_default_bridge
-                ),
-                abi=l1_bridge_abi_default(),
-            )
-            return l1_bridge.functions.isWithdrawalFinalized(
-                int(l2_block_number, 16), proof.id
-            ).call()
+        params = self._finalize_withdrawal_params(withdraw_hash, index)
+        return self._is_withdrawal_finalized_call(
+            params["sender"], params["l1_batch_number"], params["l2_message_index"]
+        ).call({"chainId": self._metadata.l1_chain_id, "from": self.address})
 
     def request_execute(self, transaction: RequestExecuteCallMsg):
         """
@@ -896,21 +973,25 @@ class WalletL1:
             )
         """
         transaction = self.get_request_execute_transaction(transaction)
-        tx = self.contract.functions.requestL2Transaction(
-            transaction.contract_address,
-            transaction.l2_value,
-            transaction.call_data,
-            transaction.l2_gas_limit,
-            transaction.gas_per_pubdata_byte,
-            transaction.factory_deps,
-            transaction.refund_recipient,
-        ).build_transaction(
-            prepare_transaction_options(transaction.options, transaction.from_)
-        )
-        signed_tx = self._l1_account.sign_transaction(tx)
-        tx_hash = self._eth_web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        with self._l1_nonce_manager.reserve(
+            self.address, transaction.options.nonce
+        ) as nonce:
+            transaction.options.nonce = nonce
+            tx = self._build_request_l2_transaction(
+                (
+                    transaction.contract_address,
+                    transaction.l2_value,
+                    transaction.call_data,
+                    transaction.l2_gas_limit,
+                    transaction.gas_per_pubdata_byte,
+                    transaction.factory_deps,
+                    transaction.refund_recipient,
+                ),
+                transaction.options,
+                transaction.from_,
+            )
 
-        return tx_hash
+            return self._send_l1_transaction(tx)
 
     def check_if_l1_chain_is_london_ready(self):
         head = self._eth_web3.eth.get_block("latest")
@@ -935,10 +1016,6 @@ class WalletL1:
             transaction.refund_recipient = self.address
         if transaction.from_ is None:
             transaction.from_ = self.address
-        if transaction.options.nonce is None:
-            transaction.options.nonce = self._eth_web3.eth.get_transaction_count(
-                self.address
-            )
         if transaction.l2_gas_limit == 0:
             meta = EIP712Meta(
                 gas_per_pub_data=transaction.gas_per_pubdata_byte,
@@ -953,22 +1030,7 @@ class WalletL1:
                     }
                 )
             )
-        if (
-            transaction.options.gas_price is None
-            and transaction.options.max_fee_per_gas is None
-        ):
-            isReady, head = self.check_if_l1_chain_is_london_ready()
-            if isReady:
-                if transaction.options.max_priority_fee_per_gas is None:
-                    transaction.options.max_priority_fee_per_gas = (
-                        self._eth_web3.eth.max_priority_fee
-                    )
-                transaction.options.max_fee_per_gas = int(
-                    ((head["baseFeePerGas"] * 3) / 2)
-                    + transaction.options.max_priority_fee_per_gas
-                )
-        else:
-            transaction.options.gas_price = self._eth_web3.eth.gas_price
+        self._fill_l1_fee_options(transaction.options)
 
         gas_price_for_estimation: int
         if transaction.options.max_priority_fee_per_gas is not None:
@@ -999,16 +1061,18 @@ class WalletL1:
             contract_address(L2 contract to be called) and call_data (the input of the L2 transaction).
         """
         transaction = self.get_request_execute_transaction(transaction)
-        tx = self.contract.functions.requestL2Transaction(
-            Web3.to_checksum_address(transaction.contract_address),
-            transaction.l2_value,
-            transaction.call_data,
-            transaction.l2_gas_limit,
-            transaction.gas_per_pubdata_byte,
-            transaction.factory_deps,
-            transaction.refund_recipient,
-        ).build_transaction(
-            prepare_transaction_options(transaction.options, self.address)
+        tx = self._build_request_l2_transaction(
+            (
+                Web3.to_checksum_address(transaction.contract_address),
+                transaction.l2_value,
+                transaction.call_data,
+                transaction.l2_gas_limit,
+                transaction.gas_per_pubdata_byte,
+                transaction.factory_deps,
+                transaction.refund_recipient,
+            ),
+            transaction.options,
+            self.address,
         )
 
         return self._eth_web3.eth.estimate_gas(tx)
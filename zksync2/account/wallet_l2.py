@@ -1,22 +1,26 @@
+from typing import List, Optional, TYPE_CHECKING
+
 from eth_account.signers.base import BaseAccount
 from web3 import Web3
 
 from eth_typing import HexStr
 from web3 import Web3
 
+from zksync2.account.fee_bumper import FeeBumper
 from zksync2.account.utils import prepare_transaction_options, options_from_712
+from zksync2.core.chain_metadata import ChainMetadata
+from zksync2.core.token_mapping import TokenBridge
 from zksync2.core.types import (
     ZkBlockParams,
     L2BridgeContracts,
     TransferTransaction,
     TransactionOptions,
     WithdrawTransaction,
-    ADDRESS_DEFAULT,
 )
 from zksync2.core.utils import is_eth
 from zksync2.manage_contracts.deploy_addresses import ZkSyncAddresses
 from zksync2.manage_contracts.utils import (
-    zksync_abi_default,
+    cached_contract,
     nonce_holder_abi_default,
     l2_bridge_abi_default,
     get_erc20_abi,
@@ -27,17 +31,28 @@ from zksync2.signer.eth_signer import PrivateKeyEthSigner
 from zksync2.transaction.transaction712 import Transaction712
 from zksync2.transaction.transaction_builders import TxFunctionCall, TxWithdraw
 
+if TYPE_CHECKING:
+    from zksync2.account.transfer_pipeline import TransferPipeline
+
 
 class WalletL2:
-    def __init__(self, zksync_web3: Web3, eth_web3: Web3, l1_account: BaseAccount):
+    def __init__(
+        self,
+        zksync_web3: Web3,
+        eth_web3: Web3,
+        l1_account: BaseAccount,
+        metadata: ChainMetadata = None,
+    ):
         self._eth_web3 = eth_web3
         self._zksync_web3 = zksync_web3
-        self._main_contract_address = self._zksync_web3.zksync.zks_main_contract()
+        if metadata is None:
+            metadata = ChainMetadata.for_clients(zksync_web3, eth_web3)
+        self._metadata = metadata
+        self._main_contract_address = metadata.main_contract_address
         self._l1_account = l1_account
-        self.contract = self._eth_web3.eth.contract(
-            Web3.to_checksum_address(self._main_contract_address),
-            abi=zksync_abi_default(),
-        )
+        self.contract = metadata.main_contract(self._eth_web3)
+        # Set to replace stuck transfers and withdrawals sent by the wallet
+        self.l2_fee_bumper: Optional[FeeBumper] = None
 
     def get_balance(
         self, block_tag=ZkBlockParams.COMMITTED.value, token_address: HexStr = None
@@ -52,6 +67,19 @@ class WalletL2:
             self._l1_account.address, block_tag, token_address
         )
 
+    def get_balances(
+        self, tokens: List[HexStr], block_tag=ZkBlockParams.COMMITTED.value
+    ) -> List[int]:
+        """
+        Returns the balances of the account for many tokens in one round trip.
+
+        :param tokens: The token addresses, ETH is the zero address.
+        :param block_tag: The block tag to get the balances at. Defaults to 'committed'.
+        """
+        return self._zksync_web3.zksync.zks_get_balances(
+            self._l1_account.address, tokens, block_tag
+        )
+
     def get_all_balances(self) -> ZksAccountBalances:
         """
         Returns the balance of the account.
@@ -64,7 +92,8 @@ class WalletL2:
         """
         Returns all token balances of the account.
         """
-        nonce_holder = self._zksync_web3.zksync.contract(
+        nonce_holder = cached_contract(
+            self._zksync_web3.zksync,
             address=ZkSyncAddresses.NONCE_HOLDER_ADDRESS.value,
             abi=nonce_holder_abi_default(),
         )
@@ -79,11 +108,13 @@ class WalletL2:
         """
         addresses = self._zksync_web3.zksync.zks_get_bridge_contracts()
         return L2BridgeContracts(
-            erc20=self._zksync_web3.eth.contract(
+            erc20=cached_contract(
+                self._zksync_web3.eth,
                 address=Web3.to_checksum_address(addresses.erc20_l2_default_bridge),
                 abi=l2_bridge_abi_default(),
             ),
-            weth=self._zksync_web3.eth.contract(
+            weth=cached_contract(
+                self._zksync_web3.eth,
                 address=Web3.to_checksum_address(addresses.weth_bridge_l2),
                 abi=l2_bridge_abi_default(),
             ),
@@ -98,20 +129,47 @@ class WalletL2:
         Returns:
         - Transaction hash.
         """
-        tx_fun_call = self._zksync_web3.zksync.get_transfer_transaction(
-            tx, self._l1_account.address
-        )
-        if tx.options.gas_limit == 0:
-            tx_712 = tx_fun_call.tx712(
-                self._zksync_web3.zksync.zks_estimate_gas_transfer(tx_fun_call.tx)
+        zksync = self._zksync_web3.zksync
+        if tx.options is None:
+            tx.options = TransactionOptions()
+        with zksync.nonce_manager.reserve(
+            self._l1_account.address, tx.options.nonce
+        ) as nonce:
+            tx.options.nonce = nonce
+            tx_fun_call = zksync.get_transfer_transaction(tx, self._l1_account.address)
+            gas_limit = tx.options.gas_limit
+            if gas_limit == 0:
+                gas_limit = zksync.zks_estimate_gas_transfer(tx_fun_call.tx)
+            tx_712 = tx_fun_call.tx712(gas_limit)
+            signer = PrivateKeyEthSigner(self._l1_account, tx.options.chain_id)
+            signed_message = signer.sign_typed_data(tx_712.to_eip712_struct())
+
+            msg = tx_712.encode(signed_message)
+
+            tx_hash = zksync.send_reserved_raw_transaction(
+                msg, self._l1_account.address, nonce, tx_fun_call.tx
             )
-        signer = PrivateKeyEthSigner(self._l1_account, tx.options.chain_id)
-        signed_message = signer.sign_typed_data(tx_712.to_eip712_struct())
+        if self.l2_fee_bumper is not None:
+            self.l2_fee_bumper.watch_transaction712(tx_hash, tx_712, signer)
+        return tx_hash
 
-        msg = tx_712.encode(signed_message)
-        tx_hash = self._zksync_web3.zksync.send_raw_transaction(msg)
+    def transfer_pipeline(
+        self,
+        estimate_workers: int = 8,
+        max_in_flight: int = 32,
+        max_pending: int = 1024,
+    ) -> "TransferPipeline":
+        """
+        Returns a pipeline sending many transfers with overlapped estimation, signing and sending,
+        see TransferPipeline.
 
-        return tx_hash
+        :param estimate_workers: Threads building, estimating and signing transfers.
+        :param max_in_flight: Maximum number of concurrent eth_sendRawTransaction calls.
+        :param max_pending: Maximum number of transfers in the pipeline before submit blocks.
+        """
+        from zksync2.account.transfer_pipeline import TransferPipeline
+
+        return TransferPipeline(self, estimate_workers, max_in_flight, max_pending)
 
     def withdraw(self, tx: WithdrawTransaction):
         """
@@ -126,53 +184,49 @@ class WalletL2:
         if tx.options is None:
             tx.options = TransactionOptions()
         if tx.options.chain_id is None:
-            tx.options.chain_id = self._zksync_web3.zksync.chain_id
-        if tx.options.nonce is None:
-            tx.options.nonce = self._zksync_web3.zksync.get_transaction_count(
-                Web3.to_checksum_address(self._l1_account.address),
-                ZkBlockParams.LATEST.value,
-            )
+            tx.options.chain_id = self._metadata.l2_chain_id
         if tx.options.gas_price is None:
-            tx.options.gas_price = self._zksync_web3.zksync.gas_price
+            tx.options.gas_price = self._zksync_web3.zksync.fee_oracle.gas_price()
 
         if not is_eth(tx.token):
             if tx.bridge_address is None:
-                l2_weth_token = ADDRESS_DEFAULT
-                try:
-                    l2_weth_token = (
-                        self.get_l2_bridge_contracts()
-                        .weth.functions.l1TokenAddress(tx.token)
-                        .call()
-                    )
-                except:
-                    pass
-                if l2_weth_token == ADDRESS_DEFAULT:
+                mapping = self._zksync_web3.zksync.token_mapping_by_l2(tx.token)
+                if mapping is not None and mapping.bridge == TokenBridge.WETH:
                     tx.bridge_address = Web3.to_checksum_address(
-                        self.get_l2_bridge_contracts().erc20.address
+                        self._metadata.bridge_addresses.weth_bridge_l2
                     )
                 else:
                     tx.bridge_address = Web3.to_checksum_address(
-                        self.get_l2_bridge_contracts().weth.address
+                        self._metadata.bridge_addresses.erc20_l2_default_bridge
                     )
 
-        transaction = TxWithdraw(
-            web3=self._zksync_web3,
-            account=self._l1_account,
-            chain_id=tx.options.chain_id,
-            nonce=tx.options.nonce,
-            to=tx.to,
-            amount=tx.amount,
-            gas_limit=0 if tx.options.gas_limit is None else tx.options.gas_limit,
-            gas_price=tx.options.gas_price,
-            token=tx.token,
-            bridge_address=tx.bridge_address,
-            paymaster_params=tx.paymaster_params,
-        )
-        signer = PrivateKeyEthSigner(self._l1_account, tx.options.chain_id)
-        estimated_gas = self._zksync_web3.zksync.eth_estimate_gas(transaction.tx)
-        tx_712 = transaction.tx712(estimated_gas)
-        signed_message = signer.sign_typed_data(tx_712.to_eip712_struct())
+        with self._zksync_web3.zksync.nonce_manager.reserve(
+            self._l1_account.address, tx.options.nonce
+        ) as nonce:
+            tx.options.nonce = nonce
+            transaction = TxWithdraw(
+                web3=self._zksync_web3,
+                account=self._l1_account,
+                chain_id=tx.options.chain_id,
+                nonce=tx.options.nonce,
+                to=tx.to,
+                amount=tx.amount,
+                gas_limit=0 if tx.options.gas_limit is None else tx.options.gas_limit,
+                gas_price=tx.options.gas_price,
+                token=tx.token,
+                bridge_address=tx.bridge_address,
+                paymaster_params=tx.paymaster_params,
+            )
+            signer = PrivateKeyEthSigner(self._l1_account, tx.options.chain_id)
+            estimated_gas = self._zksync_web3.zksync.eth_estimate_gas(transaction.tx)
+            tx_712 = transaction.tx712(estimated_gas)
+            signed_message = signer.sign_typed_data(tx_712.to_eip712_struct())
 
-        msg = tx_712.encode(signed_message)
+            msg = tx_712.encode(signed_message)
 
-        return self._zksync_web3.zksync.send_raw_transaction(msg)
+            tx_hash = self._zksync_web3.zksync.send_reserved_raw_transaction(
+                msg, self._l1_account.address, nonce, transaction.tx
+            )
+        if self.l2_fee_bumper is not None:
+            self.l2_fee_bumper.watch_transaction712(tx_hash, tx_712, signer)
+        return tx_hash
@@ -0,0 +1,263 @@
+import json
+import os
+import threading
+from dataclasses import dataclass
+from enum import Enum
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+from eth_typing import HexStr
+from web3.exceptions import TransactionNotFound
+
+from zksync2.account.wallet_l1 import WalletL1
+from zksync2.core.concurrency import run_concurrently
+from zksync2.core.utils import write_json_atomic
+from zksync2.manage_contracts.multicall import Multicall
+
+
+class WithdrawalStatus(Enum):
+    PENDING = "pending"
+    FINALIZABLE = "finalizable"
+    FINALIZED = "finalized"
+
+
+@dataclass
+class TrackedWithdrawal:
+    withdraw_hash: HexStr
+    index: int = 0
+    l1_batch_number: Optional[int] = None
+    sender: Optional[HexStr] = None
+    l2_message_index: Optional[int] = None
+    status: WithdrawalStatus = WithdrawalStatus.PENDING
+
+    @property
+    def key(self) -> str:
+        return f"{self.withdraw_hash.lower()}:{self.index}"
+
+    def to_dict(self) -> dict:
+        return {
+            "withdraw_hash": self.withdraw_hash,
+            "index": self.index,
+            "l1_batch_number": self.l1_batch_number,
+            "sender": self.sender,
+            "l2_message_index": self.l2_message_index,
+            "status": self.status.value,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TrackedWithdrawal":
+        return cls(
+            withdraw_hash=HexStr(data["withdraw_hash"]),
+            index=data["index"],
+            l1_batch_number=data["l1_batch_number"],
+            sender=data["sender"],
+            l2_message_index=data["l2_message_index"],
+            status=WithdrawalStatus(data["status"]),
+        )
+
+
+class WithdrawalTracker:
+    """
+    Follows withdrawals until they are finalized on L1.
+
+    Each poll finds the last L1 batch executed on L1 with a binary search over
+    zks_getL1BatchDetails, starting from the one found by the previous poll.
+    Only the withdrawals of batches executed since then are fetched and checked,
+    withdrawals not sealed in a batch yet get their receipt fetched again,
+    and all finalizable withdrawals are checked for finalization with one multicall.
+
+    on_finalizable is called when the batch of a withdrawal is executed, on_finalized when
+    the withdrawal is finalized on L1, after which it is no longer tracked.
+    With a path the pending withdrawals are kept in a JSON file.
+    """
+
+    def __init__(
+        self,
+        wallet: WalletL1,
+        path: Union[str, os.PathLike] = None,
+        on_finalizable: Callable[[TrackedWithdrawal], None] = None,
+        on_finalized: Callable[[TrackedWithdrawal], None] = None,
+    ):
+        self._wallet = wallet
+        self._zksync = wallet._zksync_web3.zksync
+        self.path = None if path is None else Path(path)
+        self.on_finalizable = on_finalizable
+        self.on_finalized = on_finalized
+        self.executed_batch: Optional[int] = None
+        self._withdrawals: Dict[str, TrackedWithdrawal] = {}
+        self._lock = threading.RLock()
+        self._poller: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        if self.path is not None and self.path.exists():
+            with self.path.open() as f:
+                data = json.load(f)
+            self.executed_batch = data["executed_batch"]
+            for item in data["withdrawals"]:
+                withdrawal = TrackedWithdrawal.from_dict(item)
+                self._withdrawals[withdrawal.key] = withdrawal
+
+    def __len__(self):
+        return len(self._withdrawals)
+
+    def add(self, withdraw_hash: HexStr, index: int = 0) -> TrackedWithdrawal:
+        """
+        Starts tracking a withdrawal, its batch is resolved on the next poll.
+
+        :param withdraw_hash: Hash of the L2 transaction where the withdrawal was initiated.
+        :param index: The index of the withdrawal in the transaction (defaults to 0).
+        """
+        withdrawal = TrackedWithdrawal(withdraw_hash, index)
+        with self._lock:
+            withdrawal = self._withdrawals.setdefault(withdrawal.key, withdrawal)
+            self._save()
+        return withdrawal
+
+    def withdrawals(self, status: WithdrawalStatus = None) -> List[TrackedWithdrawal]:
+        return [
+            w
+            for w in self._withdrawals.values()
+            if status is None or w.status == status
+        ]
+
+    def poll(self) -> List[TrackedWithdrawal]:
+        """
+        Updates the tracked withdrawals and returns the ones whose status changed.
+        """
+        with self._lock:
+            self._resolve_batches()
+            self.executed_batch = self._last_executed_batch()
+            finalizable = self._mark_finalizable()
+            finalized = self._check_finalized()
+            self._save()
+        if self.on_finalizable is not None:
+            for withdrawal in finalizable:
+                self.on_finalizable(withdrawal)
+        if self.on_finalized is not None:
+            for withdrawal in finalized:
+                self.on_finalized(withdrawal)
+        return finalizable + [w for w in finalized if w not in finalizable]
+
+    def start(self, interval: float = 10.0):
+        """
+        Polls from a daemon thread.
+
+        :param interval: Seconds between polls.
+        """
+        if self._poller is not None and self._poller.is_alive():
+            return
+        self._stop.clear()
+        self._poller = threading.Thread(
+            target=self._poll_loop, args=(interval,), daemon=True
+        )
+        self._poller.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._poller is not None:
+            self._poller.join()
+            self._poller = None
+
+    def _poll_loop(self, interval: float):
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception:
+                # Node errors are retried on the next poll
+                pass
+            self._stop.wait(interval)
+
+    def _receipt(self, withdrawal: TrackedWithdrawal):
+        try:
+            return self._zksync.get_transaction_receipt(withdrawal.withdraw_hash)
+        except TransactionNotFound:
+            return None
+
+    def _resolve_batches(self):
+        unsealed = [w for w in self._withdrawals.values() if w.l1_batch_number is None]
+        receipts = run_concurrently(*(partial(self._receipt, w) for w in unsealed))
+        for withdrawal, receipt in zip(unsealed, receipts):
+            if receipt is not None and receipt.get("l1BatchNumber") is not None:
+                withdrawal.l1_batch_number = int(receipt["l1BatchNumber"], 16)
+
+    def _is_executed(self, batch: int) -> bool:
+        return self._zksync.zks_get_l1_batch_details(batch).executed_at is not None
+
+    def _last_executed_batch(self) -> int:
+        # Batches are executed in order, the last executed one is found by bisection
+        low = -1 if self.executed_batch is None else self.executed_batch
+        high = self._zksync.zks_l1_batch_number()
+        if high <= low:
+            return low
+        # Usually nothing or everything was executed since the previous poll
+        if low >= 0 and not self._is_executed(low + 1):
+            return low
+        if self._is_executed(high):
+            return high
+        while high - low > 1:
+            middle = (low + high) // 2
+            if self._is_executed(middle):
+                low = middle
+            else:
+                high = middle
+        return low
+
+    def _finalize_withdrawal_params(self, withdrawal: TrackedWithdrawal):
+        try:
+            return self._wallet._finalize_withdrawal_params(
+                withdrawal.withdraw_hash, withdrawal.index
+            )
+        except Exception:
+            # E.g. the proof is not served yet, retried on the next poll
+            return None
+
+    def _mark_finalizable(self) -> List[TrackedWithdrawal]:
+        # Pending withdrawals of executed batches are the ones whose batch was executed
+        # since the previous poll, or which were added since then
+        executed = [
+            w
+            for w in self._withdrawals.values()
+            if w.status == WithdrawalStatus.PENDING
+            and w.l1_batch_number is not None
+            and w.l1_batch_number <= self.executed_batch
+        ]
+        params = run_concurrently(
+            *(partial(self._finalize_withdrawal_params, w) for w in executed)
+        )
+        finalizable = []
+        for withdrawal, p in zip(executed, params):
+            if p is not None:
+                withdrawal.sender = p["sender"]
+                withdrawal.l2_message_index = p["l2_message_index"]
+                withdrawal.status = WithdrawalStatus.FINALIZABLE
+                finalizable.append(withdrawal)
+        return finalizable
+
+    def _check_finalized(self) -> List[TrackedWithdrawal]:
+        finalizable = self.withdrawals(WithdrawalStatus.FINALIZABLE)
+        finalized = Multicall.for_client(self._wallet._eth_web3.eth).call(
+            [
+                self._wallet._is_withdrawal_finalized_call(
+                    w.sender, w.l1_batch_number, w.l2_message_index
+                )
+                for w in finalizable
+            ]
+        )
+        changed = []
+        for withdrawal, is_finalized in zip(finalizable, finalized):
+            if is_finalized:
+                withdrawal.status = WithdrawalStatus.FINALIZED
+                del self._withdrawals[withdrawal.key]
+                changed.append(withdrawal)
+        return changed
+
+    def _save(self):
+        if self.path is None:
+            return
+        write_json_atomic(
+            self.path,
+            {
+                "executed_batch": self.executed_batch,
+                "withdrawals": [w.to_dict() for w in self._withdrawals.values()],
+            },
+        )
@@ -0,0 +1,120 @@
+import threading
+import time
+from typing import Dict, Optional, Sequence
+
+from web3.eth import Eth
+from web3.exceptions import TimeExhausted
+
+from zksync2.core.rpc_batch import batch_request
+from zksync2.core.utils import client_instance
+
+
+class BlockWatcher:
+    """
+    Tracks the heights of the latest, committed and finalized blocks of a chain
+    from one polling thread, so that any number of waiters costs one batched
+    eth_getBlockByNumber request per tick.
+
+    The thread runs while someone waits for a height and stops afterwards.
+    """
+
+    TAGS = ("latest", "committed", "finalized")
+    DEFAULT_POLL_LATENCY = 1.0
+
+    _watchers_lock = threading.Lock()
+
+    def __init__(
+        self,
+        eth: Eth,
+        poll_latency: float = DEFAULT_POLL_LATENCY,
+        tags: Sequence[str] = TAGS,
+    ):
+        self._eth = eth
+        self.poll_latency = poll_latency
+        self.tags = tuple(tags)
+        self._heights: Dict[str, Optional[int]] = {tag: None for tag in self.tags}
+        self._condition = threading.Condition()
+        self._waiters = 0
+        self._poller: Optional[threading.Thread] = None
+
+    @classmethod
+    def for_client(cls, eth: Eth) -> "BlockWatcher":
+        """
+        Returns the watcher shared by all users of the client.
+
+        :param eth: The eth module of the client, e.g. web3.eth or web3.zksync.
+        """
+        return client_instance(
+            eth, "_zksync2_block_watcher", lambda: cls(eth), cls._watchers_lock
+        )
+
+    def height(self, tag: str) -> Optional[int]:
+        """
+        Returns the last seen height of the tag, None before the first poll.
+        """
+        return self._heights[tag]
+
+    def refresh(self):
+        """
+        Fetches the heights of all tags in one batch.
+        Tags the node does not know keep their previous height.
+        """
+        results = batch_request(
+            self._eth.w3,
+            [("eth_getBlockByNumber", [tag, False]) for tag in self.tags],
+        )
+        with self._condition:
+            for tag, block in zip(self.tags, results):
+                if isinstance(block, dict):
+                    height = int(block["number"], 16)
+                    previous = self._heights[tag]
+                    self._heights[tag] = (
+                        height if previous is None else max(previous, height)
+                    )
+            self._condition.notify_all()
+
+    def wait_for(self, tag: str, block_number: int, timeout: float = 120) -> int:
+        """
+        Blocks until the height of the tag reaches block_number and returns the height.
+        Raises TimeExhausted after timeout seconds.
+
+        :param tag: One of the watched tags, e.g. "finalized".
+        :param block_number: The height to wait for.
+        :param timeout: Seconds to wait.
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            self._waiters += 1
+            try:
+                if self._poller is None:
+                    self._poller = threading.Thread(
+                        target=self._poll_loop, name="zksync2-blocks", daemon=True
+                    )
+                    self._poller.start()
+                while not self._reached(tag, block_number):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeExhausted(
+                            f"Block {block_number} is not {tag} after {timeout} seconds"
+                        )
+                    self._condition.wait(remaining)
+                return self._heights[tag]
+            finally:
+                self._waiters -= 1
+
+    def _reached(self, tag: str, block_number: int) -> bool:
+        height = self._heights[tag]
+        return height is not None and height >= block_number
+
+    def _poll_loop(self):
+        while True:
+            with self._condition:
+                if self._waiters == 0:
+                    self._poller = None
+                    return
+            try:
+                self.refresh()
+            except Exception:
+                # Node errors are retried on the next tick
+                pass
+            time.sleep(self.poll_latency)
@@ -0,0 +1,127 @@
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Union
+from weakref import WeakKeyDictionary
+
+from eth_typing import HexStr
+from web3 import Web3
+from web3.contract import Contract
+
+from zksync2.core.types import BridgeAddresses
+from zksync2.core.utils import client_instance
+from zksync2.manage_contracts.utils import zksync_abi_default
+
+
+@dataclass
+class ChainMetadata:
+    """
+    Static facts about an L1/L2 pair needed to build wallets:
+    chain ids, the main zkSync contract, the default bridges and whether L1 has a base fee.
+
+    Fetched once with fetch/for_clients and shared by any number of wallets,
+    or saved to disk and loaded on the next start without any RPC.
+    """
+
+    l1_chain_id: int
+    l2_chain_id: int
+    main_contract_address: HexStr
+    bridge_addresses: BridgeAddresses
+    l1_london_ready: bool
+
+    _registry = WeakKeyDictionary()
+    _registry_lock = threading.Lock()
+
+    @classmethod
+    def fetch(cls, zksync_web3: Web3, eth_web3: Web3) -> "ChainMetadata":
+        """
+        Fetches the metadata from the nodes.
+
+        :param zksync_web3: The L2 client.
+        :param eth_web3: The L1 client.
+        """
+        head = eth_web3.eth.get_block("latest")
+        return cls(
+            l1_chain_id=eth_web3.eth.chain_id,
+            l2_chain_id=zksync_web3.zksync.chain_id,
+            main_contract_address=HexStr(
+                Web3.to_checksum_address(zksync_web3.zksync.zks_main_contract())
+            ),
+            bridge_addresses=zksync_web3.zksync.zks_get_bridge_contracts(),
+            l1_london_ready=head.get("baseFeePerGas") is not None,
+        )
+
+    @classmethod
+    def for_clients(cls, zksync_web3: Web3, eth_web3: Web3) -> "ChainMetadata":
+        """
+        Returns the metadata of the clients, fetched on the first call and shared afterwards.
+
+        :param zksync_web3: The L2 client.
+        :param eth_web3: The L1 client.
+        """
+        with cls._registry_lock:
+            by_l1 = cls._registry.setdefault(zksync_web3, WeakKeyDictionary())
+            metadata = by_l1.get(eth_web3)
+            if metadata is None:
+                metadata = cls.fetch(zksync_web3, eth_web3)
+                by_l1[eth_web3] = metadata
+            return metadata
+
+    def register(self, zksync_web3: Web3, eth_web3: Web3):
+        """
+        Makes for_clients return this metadata for the clients, e.g. after loading it from disk.
+        The cached main contract address and bridge addresses of the L2 client are set as well.
+        """
+        with self._registry_lock:
+            by_l1 = self._registry.setdefault(zksync_web3, WeakKeyDictionary())
+            by_l1[eth_web3] = self
+        if zksync_web3.zksync.main_contract_address is None:
+            zksync_web3.zksync.main_contract_address = self.main_contract_address
+        if zksync_web3.zksync.bridge_addresses is None:
+            zksync_web3.zksync.bridge_addresses = self.bridge_addresses
+
+    def main_contract(self, eth_web3: Web3) -> Contract:
+        """
+        Returns the main zkSync contract bound to the L1 client, built once per client.
+        """
+        # Kept on the client, a contract references its client and would keep it alive
+        # as a value of a registry keyed by the client
+        address = Web3.to_checksum_address(self.main_contract_address)
+        contracts = client_instance(
+            eth_web3, "_zksync2_main_contracts", dict, self._registry_lock
+        )
+        contract = contracts.get(address)
+        if contract is None:
+            contract = eth_web3.eth.contract(address, abi=zksync_abi_default())
+            contracts[address] = contract
+        return contract
+
+    def to_dict(self) -> dict:
+        return {
+            "l1_chain_id": self.l1_chain_id,
+            "l2_chain_id": self.l2_chain_id,
+            "main_contract_address": self.main_contract_address,
+            "bridge_addresses": asdict(self.bridge_addresses),
+            "l1_london_ready": self.l1_london_ready,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ChainMetadata":
+        return cls(
+            l1_chain_id=data["l1_chain_id"],
+            l2_chain_id=data["l2_chain_id"],
+            main_contract_address=HexStr(data["main_contract_address"]),
+            bridge_addresses=BridgeAddresses(**data["bridge_addresses"]),
+            l1_london_ready=data["l1_london_ready"],
+        )
+
+    def save(self, path: Union[str, os.PathLike]):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]) -> "ChainMetadata":
+        with Path(path).open() as f:
+            return cls.from_dict(json.load(f))
@@ -0,0 +1,62 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple
+
+MAX_WORKERS = 16
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_worker = threading.local()
+
+
+def shared_executor() -> ThreadPoolExecutor:
+    """
+    Returns the thread pool the SDK uses to issue independent RPC calls concurrently,
+    created on first use.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=MAX_WORKERS,
+                    thread_name_prefix="zksync2",
+                    initializer=_mark_worker,
+                )
+    return _executor
+
+
+def _mark_worker():
+    _worker.active = True
+
+
+def run_concurrently(*calls: Callable[[], Any]) -> Tuple[Any, ...]:
+    """
+    Runs the calls on the shared pool and returns their results in order.
+    The first exception raised by a call is re-raised once all calls are done.
+
+    Calls made from a pool thread run sequentially in that thread,
+    so nested use can not exhaust the pool and deadlock.
+
+    :param calls: Callables without arguments, usually RPC calls.
+    """
+    if len(calls) < 2 or getattr(_worker, "active", False):
+        return tuple(call() for call in calls)
+    executor = shared_executor()
+    futures: List[Future] = [executor.submit(call) for call in calls[1:]]
+    # The caller would just wait otherwise, it makes the first call itself
+    first_error = None
+    try:
+        first = calls[0]()
+    except BaseException as error:
+        first, first_error = None, error
+    results = [first]
+    for future in futures:
+        try:
+            results.append(future.result())
+        except BaseException as error:
+            results.append(None)
+            first_error = first_error or error
+    if first_error is not None:
+        raise first_error
+    return tuple(results)
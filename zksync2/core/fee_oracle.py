@@ -0,0 +1,179 @@
+import statistics
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from web3.eth import Eth
+
+from zksync2.core.utils import client_instance
+
+
+@dataclass
+class FeeSuggestion:
+    base_fee: int
+    max_priority_fee_per_gas: int
+    max_fee_per_gas: int
+
+
+class FeeOracle:
+    """
+    Serves the gas price and EIP-1559 fee suggestions of a chain from a cache,
+    so that a burst of transactions triggers one fee fetch per TTL instead of one per transaction.
+
+    EIP-1559 suggestions are computed from eth_feeHistory: the priority fee is the median
+    of the reward percentile over the last history_blocks blocks, the max fee is
+    base_fee * base_fee_multiplier + priority fee. On chains without a base fee (pre-London)
+    suggest_fees returns None and callers use gas_price.
+    """
+
+    DEFAULT_TTL = 3.0
+    DEFAULT_HISTORY_BLOCKS = 10
+    DEFAULT_REWARD_PERCENTILE = 50
+    DEFAULT_BASE_FEE_MULTIPLIER = 1.5
+
+    _oracles_lock = threading.Lock()
+
+    def __init__(
+        self,
+        eth: Eth,
+        ttl: float = DEFAULT_TTL,
+        history_blocks: int = DEFAULT_HISTORY_BLOCKS,
+        reward_percentile: float = DEFAULT_REWARD_PERCENTILE,
+        base_fee_multiplier: float = DEFAULT_BASE_FEE_MULTIPLIER,
+    ):
+        self._eth = eth
+        self.ttl = ttl
+        self.history_blocks = history_blocks
+        self.reward_percentile = reward_percentile
+        self.base_fee_multiplier = base_fee_multiplier
+        self._values: Dict[str, Any] = {}
+        self._fetched_at: Dict[str, float] = {}
+        self._locks = {"gas_price": threading.Lock(), "fees": threading.Lock()}
+        self._refresher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @classmethod
+    def for_client(cls, eth: Eth) -> "FeeOracle":
+        """
+        Returns the oracle shared by all users of the client.
+
+        :param eth: The eth module of the client, e.g. web3.eth or web3.zksync.
+        """
+        return client_instance(
+            eth, "_zksync2_fee_oracle", lambda: cls(eth), cls._oracles_lock
+        )
+
+    def _cached(self, key: str, fetch: Callable[[], Any], force: bool = False):
+        with self._locks[key]:
+            fetched_at = self._fetched_at.get(key)
+            if force or fetched_at is None or time.monotonic() - fetched_at > self.ttl:
+                self._values[key] = fetch()
+                self._fetched_at[key] = time.monotonic()
+            return self._values[key]
+
+    def gas_price(self) -> int:
+        """
+        Returns the gas price of the chain (eth_gasPrice).
+        """
+        return self._cached("gas_price", lambda: self._eth.gas_price)
+
+    def suggest_fees(self) -> Optional[FeeSuggestion]:
+        """
+        Returns EIP-1559 fee suggestion, None if the chain has no base fee.
+        """
+        return self._cached("fees", self._fetch_fees)
+
+    def base_fee(self) -> Optional[int]:
+        """
+        Returns the base fee of the next block, None if the chain has no base fee.
+        """
+        fees = self.suggest_fees()
+        return None if fees is None else fees.base_fee
+
+    def max_priority_fee(self) -> int:
+        """
+        Returns the suggested priority fee, falls back to eth_maxPriorityFeePerGas.
+        """
+        fees = self.suggest_fees()
+        if fees is None:
+            return self._eth.max_priority_fee
+        return fees.max_priority_fee_per_gas
+
+    def invalidate(self):
+        """
+        Drops the cached values, the next read fetches them from the chain.
+        """
+        for key, lock in self._locks.items():
+            with lock:
+                self._fetched_at.pop(key, None)
+
+    def refresh(self):
+        """
+        Fetches all values from the chain regardless of their age.
+        """
+        self._cached("gas_price", lambda: self._eth.gas_price, force=True)
+        self._cached("fees", self._fetch_fees, force=True)
+
+    def start_background_refresh(self, interval: float = None):
+        """
+        Refreshes the cached values from a daemon thread, so that reads never wait for the node.
+
+        :param interval: Seconds between refreshes, defaults to half of the TTL.
+        """
+        if self.refreshing:
+            return
+        if interval is None:
+            interval = self.ttl / 2
+        self._stop.clear()
+        self._refresher = threading.Thread(
+            target=self._refresh_loop, args=(interval,), daemon=True
+        )
+        self._refresher.start()
+
+    @property
+    def refreshing(self) -> bool:
+        return self._refresher is not None and self._refresher.is_alive()
+
+    def stop_background_refresh(self):
+        self._stop.set()
+        if self._refresher is not None:
+            self._refresher.join()
+            self._refresher = None
+
+    def _refresh_loop(self, interval: float):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception:
+                # Keep serving the last known values, reads retry on expiry
+                pass
+            self._stop.wait(interval)
+
+    def _fetch_fees(self) -> Optional[FeeSuggestion]:
+        try:
+            history = self._eth.fee_history(
+                self.history_blocks, "latest", [self.reward_percentile]
+            )
+            base_fees = history["baseFeePerGas"]
+            # The last entry is the base fee of the next block
+            base_fee = base_fees[-1] if base_fees else 0
+            # A zero reward is a sample too (e.g. an empty block), only missing ones are skipped
+            rewards = [
+                r[0] for r in history.get("reward") or [] if r and r[0] is not None
+            ]
+        except ValueError:
+            # Nodes without eth_feeHistory
+            base_fee = self._eth.get_block("latest").get("baseFeePerGas") or 0
+            rewards = []
+        if base_fee == 0:
+            return None
+        if len(rewards) > 0:
+            priority_fee = int(statistics.median(rewards))
+        else:
+            priority_fee = self._eth.max_priority_fee
+        return FeeSuggestion(
+            base_fee=base_fee,
+            max_priority_fee_per_gas=priority_fee,
+            max_fee_per_gas=int(base_fee * self.base_fee_multiplier) + priority_fee,
+        )
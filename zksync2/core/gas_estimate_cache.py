@@ -0,0 +1,144 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Hashable, Tuple
+
+from zksync2.module.request_types import EIP712Meta, Transaction
+
+WORD_SIZE = 32
+
+
+@dataclass
+class GasEstimateCacheStats:
+    hits: int = 0
+    misses: int = 0
+    failures: int = 0
+
+    @property
+    def estimates_saved(self) -> int:
+        return self.hits
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class GasEstimateCache:
+    """
+    Memoizes gas estimates of transactions with the same shape: the same target, function selector,
+    calldata length (in 32-byte words), paymaster, gas per pubdata and factory deps.
+    Transactions differing only in argument values (amount, recipient) share one estimate.
+
+    Estimates are returned increased by safety_margin, whether live or cached, so the gas limit of
+    a transaction does not depend on the state of the cache. Entries expire after ttl seconds and
+    the least recently used ones are evicted beyond max_size. After report_failure the shape is
+    estimated live again.
+    """
+
+    DEFAULT_MAX_SIZE = 1024
+    DEFAULT_TTL = 60.0
+    DEFAULT_SAFETY_MARGIN = 0.1
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_MAX_SIZE,
+        ttl: float = DEFAULT_TTL,
+        safety_margin: float = DEFAULT_SAFETY_MARGIN,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.safety_margin = safety_margin
+        self.stats = GasEstimateCacheStats()
+        self._entries: "OrderedDict[Hashable, Tuple[int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(tx: Transaction) -> Hashable:
+        """
+        Returns the shape of the transaction used as the cache key.
+        """
+        data = tx.get("data") or "0x"
+        if isinstance(data, str):
+            data = data.lower()
+            selector = data[:10]
+            length = (len(data) - 2) // 2
+        else:
+            data = bytes(data)
+            selector = "0x" + data[:4].hex()
+            length = len(data)
+        meta: EIP712Meta = tx.get("eip712Meta")
+        paymaster = None
+        gas_per_pub_data = None
+        factory_deps = ()
+        if meta is not None:
+            gas_per_pub_data = meta.gas_per_pub_data
+            if meta.paymaster_params is not None:
+                params = meta.paymaster_params
+                paymaster = (
+                    params["paymaster"]
+                    if isinstance(params, dict)
+                    else params.paymaster
+                )
+                paymaster = paymaster.lower()
+            if meta.factory_deps:
+                factory_deps = tuple(bytes(dep) for dep in meta.factory_deps)
+        to = tx.get("to")
+        return (
+            to.lower() if to is not None else None,
+            selector,
+            math.ceil(length / WORD_SIZE),
+            paymaster,
+            gas_per_pub_data,
+            factory_deps,
+        )
+
+    def get_or_estimate(
+        self, tx: Transaction, estimate: Callable[[Transaction], int]
+    ) -> int:
+        """
+        Returns the estimate of the transaction shape increased by the safety margin,
+        from the cache or estimated live and cached.
+
+        :param tx: The transaction to be estimated.
+        :param estimate: Live estimation, e.g. the eth_estimateGas RPC.
+        """
+        key = self.key(tx)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return self._with_margin(entry[0])
+            self.stats.misses += 1
+
+        gas = estimate(tx)
+        with self._lock:
+            self._entries[key] = (gas, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return self._with_margin(gas)
+
+    def _with_margin(self, gas: int) -> int:
+        return math.ceil(gas * (1 + self.safety_margin))
+
+    def report_failure(self, tx: Transaction):
+        """
+        Drops the cached estimate of the transaction shape, e.g. after the transaction ran out of gas,
+        the next transaction of the shape is estimated live.
+        """
+        key = self.key(tx)
+        with self._lock:
+            self._entries.pop(key, None)
+            self.stats.failures += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,233 @@
+import heapq
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Set
+
+from eth_typing import HexStr
+from web3 import Web3
+from web3.eth import Eth
+
+from zksync2.core.utils import client_instance
+
+NONCE_ERROR = re.compile(
+    r"nonce (is )?too (?P<kind>low|high)|replacement transaction underpriced",
+    re.IGNORECASE,
+)
+# The node already has the transaction, so its nonce is used
+KNOWN_TRANSACTION = ("already known", "known transaction", "already imported")
+
+
+class _Lane:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.next: Optional[int] = None
+        self.gaps: List[int] = []
+        # Nonces handed out and not yet seen on chain, with the time they were handed out
+        self.pending: Dict[int, float] = {}
+        # The pending nonces whose transactions reached the node
+        self.sent: Set[int] = set()
+        self.last_used = 0.0
+
+
+class NonceManager:
+    """
+    Hands out sequential nonces of accounts from a local counter,
+    so that concurrent senders do not need a get_transaction_count RPC per transaction
+    and do not race each other for the same nonce.
+
+    One manager serves one client (and therefore one chain) and keeps one lane per account.
+    A lane is synced from the chain on first use, and again when it has been idle for max_idle seconds.
+    Nonces that were handed out but could not be sent are reused before new ones are allocated.
+    A sync also reclaims nonces at or above the chain nonce which were handed out more than
+    max_unsent_age seconds ago and never reported sent, e.g. by a caller which failed without
+    releasing them, and restarts the lane at the chain nonce when nothing is pending.
+    """
+
+    DEFAULT_MAX_IDLE = 1.0
+    DEFAULT_MAX_UNSENT_AGE = 30.0
+
+    _managers_lock = threading.Lock()
+
+    def __init__(
+        self,
+        eth: Eth,
+        block_identifier: str = "pending",
+        max_idle: float = DEFAULT_MAX_IDLE,
+        max_unsent_age: float = DEFAULT_MAX_UNSENT_AGE,
+    ):
+        self._eth = eth
+        self.block_identifier = block_identifier
+        self.max_idle = max_idle
+        self.max_unsent_age = max_unsent_age
+        self._lanes: Dict[HexStr, _Lane] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_client(cls, eth: Eth) -> "NonceManager":
+        """
+        Returns the manager shared by all users of the client.
+
+        :param eth: The eth module of the client, e.g. web3.eth or web3.zksync.
+        """
+        return client_instance(
+            eth, "_zksync2_nonce_manager", lambda: cls(eth), cls._managers_lock
+        )
+
+    def _lane(self, address: HexStr) -> _Lane:
+        address = Web3.to_checksum_address(address)
+        with self._lock:
+            lane = self._lanes.get(address)
+            if lane is None:
+                lane = _Lane()
+                self._lanes[address] = lane
+            return lane
+
+    def _fetch(self, address: HexStr) -> int:
+        return self._eth.get_transaction_count(
+            Web3.to_checksum_address(address), self.block_identifier
+        )
+
+    def _sync(self, lane: _Lane, chain_nonce: int, lost_from: int = None):
+        # Everything below the chain nonce is already used
+        pending = {n: t for n, t in lane.pending.items() if n >= chain_nonce}
+        gaps = {n for n in lane.gaps if n >= chain_nonce}
+        unsent_before = time.monotonic() - self.max_unsent_age
+        for n, handed_out_at in list(pending.items()):
+            lost = lost_from is not None and n <= lost_from
+            leaked = n not in lane.sent and handed_out_at < unsent_before
+            if lost or leaked:
+                del pending[n]
+                gaps.add(n)
+        lane.pending = pending
+        lane.sent = {n for n in lane.sent if n in pending}
+        if lane.next is None or lane.next < chain_nonce or len(pending) == 0:
+            lane.next = chain_nonce
+        lane.gaps = sorted(n for n in gaps if n < lane.next)
+
+    def next_nonce(self, address: HexStr) -> int:
+        """
+        Returns the next nonce to be used by the account and marks it as pending.
+
+        :param address: The account address.
+        """
+        lane = self._lane(address)
+        with lane.lock:
+            now = time.monotonic()
+            if lane.next is None or now - lane.last_used > self.max_idle:
+                self._sync(lane, self._fetch(address))
+            lane.last_used = now
+            if lane.gaps:
+                nonce = heapq.heappop(lane.gaps)
+            else:
+                nonce = lane.next
+                lane.next += 1
+            lane.pending[nonce] = now
+            return nonce
+
+    @contextmanager
+    def reserve(self, address: HexStr, nonce: int = None) -> Iterator[int]:
+        """
+        Yields the nonce of a transaction built and sent within the block, the next nonce
+        of the account unless one is given. A nonce taken here is released when the block raises
+        before the transaction reached the node.
+
+        :param address: The account address.
+        :param nonce: A nonce chosen by the caller, it is never released.
+        """
+        taken = nonce is None
+        if taken:
+            nonce = self.next_nonce(address)
+        try:
+            yield nonce
+        except BaseException:
+            if taken:
+                self.release(address, nonce)
+            raise
+
+    def release(self, address: HexStr, nonce: int):
+        """
+        Returns a nonce which was not used (e.g. the transaction was never sent), so that it is handed out again.
+        Nonces reported sent are not released.
+
+        :param address: The account address.
+        :param nonce: The unused nonce.
+        """
+        lane = self._lane(address)
+        with lane.lock:
+            if nonce in lane.pending and nonce not in lane.sent:
+                del lane.pending[nonce]
+                heapq.heappush(lane.gaps, nonce)
+
+    def mark_sent(self, address: HexStr, nonce: int):
+        """
+        Records that the transaction with the nonce reached the node, so that it is neither
+        released nor reclaimed.
+
+        :param address: The account address.
+        :param nonce: The nonce of the sent transaction.
+        """
+        lane = self._lane(address)
+        with lane.lock:
+            if nonce in lane.pending:
+                lane.sent.add(nonce)
+
+    def pending(self, address: HexStr) -> List[int]:
+        """
+        Returns the nonces handed out to the account and not yet seen on chain.
+
+        :param address: The account address.
+        """
+        lane = self._lane(address)
+        with lane.lock:
+            return sorted(lane.pending)
+
+    def resync(self, address: HexStr, lost_from: int = None):
+        """
+        Syncs the lane of the account with the chain.
+
+        :param address: The account address.
+        :param lost_from: Pending nonces up to and including this one are known not to have reached the node,
+            they are handed out again.
+        """
+        lane = self._lane(address)
+        with lane.lock:
+            self._sync(lane, self._fetch(address), lost_from)
+            lane.last_used = time.monotonic()
+
+    def handle_error(self, address: HexStr, nonce: int, error: Exception) -> bool:
+        """
+        Resyncs the lane of the account if sending a transaction failed because of its nonce.
+        Returns True if the error was a nonce error. Otherwise the nonce is released,
+        unless the node already has the transaction.
+
+        :param address: The account address.
+        :param nonce: The nonce of the transaction that failed.
+        :param error: The error raised by send_raw_transaction.
+        """
+        message = str(error)
+        match = NONCE_ERROR.search(message)
+        if match is None:
+            if any(known in message.lower() for known in KNOWN_TRANSACTION):
+                self.mark_sent(address, nonce)
+            else:
+                # The node rejected the transaction, its nonce is still free
+                self.release(address, nonce)
+            return False
+        if (match.group("kind") or "").lower() == "high":
+            # The node has not seen some of the preceding nonces
+            self.resync(address, lost_from=nonce)
+        else:
+            self.resync(address)
+        return True
+
+    def reset(self, address: HexStr = None):
+        """
+        Forgets the local state of the account, or of all accounts if address is not given.
+        """
+        with self._lock:
+            if address is None:
+                self._lanes.clear()
+            else:
+                self._lanes.pop(Web3.to_checksum_address(address), None)
@@ -0,0 +1,156 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence, TypeVar
+
+from eth_typing import HexStr
+from web3 import Web3
+
+from zksync2.core.rpc_batch import batch_request
+from zksync2.core.utils import L2_ETH_TOKEN_ADDRESS, is_eth
+from zksync2.manage_contracts.function_encoder import function_encoder
+from zksync2.manage_contracts.multicall import Multicall, ZKSYNC_MULTICALL3_ADDRESS
+
+T = TypeVar("T")
+
+
+@dataclass
+class PortfolioSnapshot:
+    """
+    Token balances of many addresses at one block, stored by column:
+    balances[token][i] is the balance of addresses[i].
+    """
+
+    block_number: int
+    addresses: List[HexStr]
+    tokens: List[HexStr]
+    balances: Dict[HexStr, List[int]]
+    # Row of each address by its lowercase form, built on the first lookup
+    _rows: Optional[Dict[str, int]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def balance(self, address: HexStr, token: HexStr) -> int:
+        """
+        Returns the balance of the address, which may be given in any letter case.
+        """
+        if self._rows is None:
+            self._rows = {a.lower(): i for i, a in enumerate(self.addresses)}
+        return self.balances[token][self._rows[address.lower()]]
+
+    def to_numpy(self) -> dict:
+        """
+        Returns the columns as NumPy arrays, "address" and one column per token.
+        Balances are uint256 values, so the token columns have the object dtype.
+
+        Requires numpy.
+        """
+        import numpy as np
+
+        columns = {"address": np.array(self.addresses)}
+        for token in self.tokens:
+            columns[token] = np.array(self.balances[token], dtype=object)
+        return columns
+
+    def to_arrow(self):
+        """
+        Returns a pyarrow Table with an "address" column and one decimal256 column per token.
+
+        Requires pyarrow.
+        """
+        import pyarrow as pa
+
+        columns = {"address": pa.array(self.addresses, pa.string())}
+        for token in self.tokens:
+            columns[token] = pa.array(
+                [Decimal(balance) for balance in self.balances[token]],
+                pa.decimal256(76, 0),
+            )
+        return pa.table(columns, metadata={"block_number": str(self.block_number)})
+
+
+def take_portfolio_snapshot(
+    zksync,
+    addresses: Sequence[HexStr],
+    tokens: Optional[Sequence[HexStr]] = None,
+    block: Optional[int] = None,
+    max_concurrency: int = 8,
+    batch_size: int = 100,
+) -> PortfolioSnapshot:
+    """
+    Reads the balances of the addresses, see ZkSync.portfolio_snapshot.
+    """
+    if block is None:
+        block = zksync.block_number
+    addresses = [Web3.to_checksum_address(address) for address in addresses]
+    multicall = Multicall.for_client(zksync, ZKSYNC_MULTICALL3_ADDRESS)
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        if tokens is None:
+            tokens = _discover_tokens(zksync, addresses, batch_size, pool)
+        tokens = list(tokens)
+        # The call data of an address is the same for every token, encoded once.
+        # ETH is read from the L2 ETH token, whose balanceOf takes the address as uint256
+        balance_of = function_encoder("IERC20", "balanceOf")
+        eth_balance_of = function_encoder("IEthToken", "balanceOf")
+        call_data = [balance_of.encode_bytes(address) for address in addresses]
+        eth_call_data = []
+        if any(is_eth(token) for token in tokens):
+            eth_call_data = [
+                eth_balance_of.encode_bytes(int(address, 16)) for address in addresses
+            ]
+        calls = []
+        for token in tokens:
+            if is_eth(token):
+                target, data = L2_ETH_TOKEN_ADDRESS, eth_call_data
+            else:
+                target, data = token, call_data
+            target = Web3.to_checksum_address(target)
+            calls.extend((target, token_data) for token_data in data)
+        results = _flatten(
+            pool.map(
+                lambda chunk: multicall.call_raw(chunk, block),
+                _chunks(calls, multicall.max_calls),
+            )
+        )
+
+    balances = {}
+    for i, token in enumerate(tokens):
+        column = results[i * len(addresses) : (i + 1) * len(addresses)]
+        balances[token] = [_uint256(success, output) for success, output in column]
+    return PortfolioSnapshot(
+        block_number=block, addresses=addresses, tokens=tokens, balances=balances
+    )
+
+
+def _discover_tokens(
+    zksync, addresses: List[HexStr], batch_size: int, pool: ThreadPoolExecutor
+) -> List[HexStr]:
+    # zks_getAllAccountBalances has no block parameter, it is only used to find the tokens
+    def fetch(chunk: List[HexStr]) -> List:
+        return batch_request(
+            zksync.w3, [("zks_getAllAccountBalances", [a]) for a in chunk]
+        )
+
+    tokens: Dict[str, HexStr] = {}
+    for result in _flatten(pool.map(fetch, _chunks(addresses, batch_size))):
+        if isinstance(result, ValueError):
+            raise result
+        for token in result:
+            tokens.setdefault(token.lower(), HexStr(token))
+    return list(tokens.values())
+
+
+def _uint256(success: bool, output: bytes) -> int:
+    # A uint256 return value is one big-endian word, failed or malformed calls count as 0
+    if not success or len(output) < 32:
+        return 0
+    return int.from_bytes(output[:32], "big")
+
+
+def _chunks(items: List[T], size: int) -> List[List[T]]:
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def _flatten(chunks) -> list:
+    return [item for chunk in chunks for item in chunk]
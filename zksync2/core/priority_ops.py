@@ -0,0 +1,156 @@
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from typing import Dict, List, Optional, Sequence
+
+from eth_typing import HexStr
+from eth_utils import event_abi_to_log_topic
+from hexbytes import HexBytes
+from web3.types import TxReceipt
+
+from zksync2.core.utils import percentiles
+from zksync2.manage_contracts.utils import zksync_abi_default
+
+
+@lru_cache(maxsize=None)
+def new_priority_request_topic() -> HexBytes:
+    """
+    Returns the topic of the NewPriorityRequest event of the main contract.
+    """
+    event = next(
+        item
+        for item in zksync_abi_default()
+        if item["type"] == "event" and item["name"] == "NewPriorityRequest"
+    )
+    return HexBytes(event_abi_to_log_topic(event))
+
+
+def l2_hashes_from_receipt(
+    tx_receipt: TxReceipt, main_contract_address: HexStr = None
+) -> List[HexBytes]:
+    """
+    Returns the hashes of the L2 transactions of the priority requests in an L1 receipt.
+
+    Only the topic of each log is compared, the hash is read from its fixed position
+    in the event data (the second word, after txId) without decoding the rest.
+
+    :param tx_receipt: Receipt of the L1 transaction, e.g. a deposit.
+    :param main_contract_address: When given, logs of other contracts are ignored.
+    """
+    topic = new_priority_request_topic()
+    address = None if main_contract_address is None else main_contract_address.lower()
+    hashes = []
+    for log in tx_receipt["logs"]:
+        if len(log["topics"]) == 0 or HexBytes(log["topics"][0]) != topic:
+            continue
+        if address is not None and log["address"].lower() != address:
+            continue
+        hashes.append(HexBytes(HexBytes(log["data"])[32:64]))
+    return hashes
+
+
+@dataclass
+class PriorityOp:
+    l1_hash: HexBytes
+    l2_hash: HexBytes
+    submitted_at: float
+    l2_receipt: Optional[TxReceipt] = None
+    executed_at: Optional[float] = None
+
+    @property
+    def latency(self) -> Optional[float]:
+        """
+        Seconds from submission on L1 to the L2 receipt, None while pending.
+        """
+        if self.executed_at is None:
+            return None
+        return self.executed_at - self.submitted_at
+
+
+class PriorityOpTracker:
+    """
+    Follows L1->L2 transactions (deposits, request_execute) until they are executed on L2.
+
+    The L2 hashes are extracted from the L1 receipts with l2_hashes_from_receipt and
+    all L2 receipts are awaited together through the receipt_waiter of the client.
+    """
+
+    def __init__(self, zksync, main_contract_address: HexStr = None):
+        """
+        :param zksync: The ZkSync module of the L2 client, e.g. web3.zksync.
+        :param main_contract_address: Only priority requests of this contract are tracked.
+        """
+        self._zksync = zksync
+        self.main_contract_address = main_contract_address
+        self._ops: List[PriorityOp] = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._ops)
+
+    def add(
+        self, l1_receipt: TxReceipt, submitted_at: float = None, timeout: float = 600
+    ) -> List[PriorityOp]:
+        """
+        Tracks the priority requests of an L1 receipt.
+
+        :param l1_receipt: Receipt of the L1 transaction.
+        :param submitted_at: Unix time the L1 transaction was sent, defaults to now.
+        :param timeout: Seconds to watch for the L2 receipts in the background.
+        """
+        if submitted_at is None:
+            submitted_at = time.time()
+        ops = [
+            PriorityOp(HexBytes(l1_receipt["transactionHash"]), l2_hash, submitted_at)
+            for l2_hash in l2_hashes_from_receipt(
+                l1_receipt, self.main_contract_address
+            )
+        ]
+        with self._lock:
+            self._ops.extend(ops)
+        for op in ops:
+            future = self._zksync.receipt_waiter.submit(op.l2_hash, timeout)
+            future.add_done_callback(partial(self._executed, op))
+        return ops
+
+    @staticmethod
+    def _executed(op: PriorityOp, future: Future):
+        # Called by the polling thread as soon as the receipt is found
+        if future.exception() is None and op.executed_at is None:
+            op.l2_receipt = future.result()
+            op.executed_at = time.time()
+
+    def add_all(self, l1_receipts: Sequence[TxReceipt]) -> List[PriorityOp]:
+        return [op for receipt in l1_receipts for op in self.add(receipt)]
+
+    def pending(self) -> List[PriorityOp]:
+        return [op for op in self._ops if op.executed_at is None]
+
+    def wait(self, timeout: float = 120) -> List[PriorityOp]:
+        """
+        Waits until all tracked operations have their L2 receipt and returns them,
+        raises TimeExhausted after timeout seconds.
+
+        :param timeout: Seconds to wait.
+        """
+        pending = self.pending()
+        receipts = self._zksync.receipt_waiter.wait(
+            [op.l2_hash for op in pending], timeout
+        )
+        for op, receipt in zip(pending, receipts):
+            if op.executed_at is None:
+                op.l2_receipt = receipt
+                op.executed_at = time.time()
+        return list(self._ops)
+
+    def latency_percentiles(
+        self, ranks: Sequence[float] = (50, 90, 99)
+    ) -> Dict[float, float]:
+        """
+        Returns percentiles of the L1->L2 latency of the executed operations, in seconds.
+        """
+        return percentiles(
+            (op.latency for op in self._ops if op.executed_at is not None), ranks
+        )
@@ -0,0 +1,275 @@
+import threading
+import time
+from concurrent.futures import (
+    Future,
+    InvalidStateError,
+    TimeoutError,
+    as_completed,
+    wait,
+)
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from hexbytes import HexBytes
+from web3 import Web3
+from web3._utils.method_formatters import PYTHONIC_RESULT_FORMATTERS
+from web3._utils.rpc_abi import RPC
+from web3.datastructures import AttributeDict
+from web3.eth import Eth
+from web3.exceptions import TimeExhausted
+from web3.types import TxReceipt, _Hash32
+
+from zksync2.core.rpc_batch import batch_request
+from zksync2.core.utils import client_instance
+
+_receipt_formatter = PYTHONIC_RESULT_FORMATTERS[RPC.eth_getTransactionReceipt]
+
+
+def format_receipt(receipt: dict) -> TxReceipt:
+    """
+    Formats a raw eth_getTransactionReceipt result the way web3 does.
+    """
+    return AttributeDict.recursive(_receipt_formatter(receipt))
+
+
+class _Waiting:
+    def __init__(self, deadline: float):
+        self.future: Future = Future()
+        self.deadline = deadline
+        # Head at which the receipt was last found missing
+        self.checked_at: Optional[int] = None
+
+
+class ReceiptWaiter:
+    """
+    Waits for the receipts of many transactions from one polling thread.
+
+    Each tick fetches the block number, receipts are only fetched, in JSON-RPC batches
+    of at most max_batch, when the chain advanced since they were last found missing
+    (or for transactions added since then). The tick interval follows the observed
+    block time, half of it clamped to [min_poll_latency, max_poll_latency].
+    The thread stops once nothing is waited for.
+
+    A transaction replaced by a copy at the same nonce, e.g. by FeeBumper, is registered
+    with add_replacement, waits for its hash then resolve with the receipt of whichever
+    copy is included.
+    """
+
+    DEFAULT_MIN_POLL_LATENCY = 0.05
+    DEFAULT_MAX_POLL_LATENCY = 2.0
+    DEFAULT_MAX_BATCH = 500
+    INITIAL_BLOCK_TIME = 1.0
+    BLOCK_TIME_SMOOTHING = 0.2
+    MAX_REPLACED = 10000
+
+    _waiters_lock = threading.Lock()
+
+    def __init__(
+        self,
+        eth: Eth,
+        min_poll_latency: float = DEFAULT_MIN_POLL_LATENCY,
+        max_poll_latency: float = DEFAULT_MAX_POLL_LATENCY,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ):
+        self._eth = eth
+        self.min_poll_latency = min_poll_latency
+        self.max_poll_latency = max_poll_latency
+        self.max_batch = max_batch
+        self.block_time = self.INITIAL_BLOCK_TIME
+        self._head: Optional[int] = None
+        self._head_at: Optional[float] = None
+        self._waiting: Dict[str, _Waiting] = {}
+        # Hashes of the copies of replaced transactions, for the latest MAX_REPLACED ones
+        self._replacements: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._poller: Optional[threading.Thread] = None
+        self._wakeup = threading.Event()
+
+    @classmethod
+    def for_client(cls, eth: Eth) -> "ReceiptWaiter":
+        """
+        Returns the waiter shared by all users of the client.
+
+        :param eth: The eth module of the client, e.g. web3.eth or web3.zksync.
+        """
+        return client_instance(
+            eth, "_zksync2_receipt_waiter", lambda: cls(eth), cls._waiters_lock
+        )
+
+    def add_replacement(self, transaction_hash: _Hash32, replacement_hash: _Hash32):
+        """
+        Makes waits for a transaction resolve with the receipt of a replacement as well.
+
+        :param transaction_hash: Hash of the transaction as first sent.
+        :param replacement_hash: Hash of a copy sent at the same nonce, e.g. with higher fees.
+        """
+        key = Web3.to_hex(HexBytes(transaction_hash))
+        with self._lock:
+            replacements = self._replacements.pop(key, [])
+            replacements.append(Web3.to_hex(HexBytes(replacement_hash)))
+            self._replacements[key] = replacements
+            while len(self._replacements) > self.MAX_REPLACED:
+                self._replacements.popitem(last=False)
+            waiting = self._waiting.get(key)
+            if waiting is not None:
+                waiting.checked_at = None
+        self._wakeup.set()
+
+    def submit(self, transaction_hash: _Hash32, timeout: float = 120) -> Future:
+        """
+        Returns a future resolved with the receipt of the transaction, or failed with
+        TimeExhausted when it is not in the chain after timeout seconds.
+        Waiting twice for the same transaction returns the same future, which fails
+        after the later of the two timeouts, use wait for a bound on a single wait.
+
+        :param transaction_hash: Hash of the transaction.
+        :param timeout: Seconds to wait for the receipt.
+        """
+        return self._submit_all([transaction_hash], timeout)[0]
+
+    def wait(
+        self, transaction_hashes: Iterable[_Hash32], timeout: float = 120
+    ) -> List[TxReceipt]:
+        """
+        Returns the receipts of the transactions in order, raises TimeExhausted
+        if any of them is not in the chain after timeout seconds.
+
+        :param transaction_hashes: Hashes of the transactions.
+        :param timeout: Seconds to wait for all receipts.
+        """
+        futures = self._submit_all(transaction_hashes, timeout)
+        # The futures may be shared with waits for longer
+        _, not_done = wait(futures, timeout)
+        if not_done:
+            raise TimeExhausted(
+                f"Transactions are not in the chain after {timeout} seconds"
+            )
+        return [future.result() for future in futures]
+
+    def as_completed(
+        self, transaction_hashes: Iterable[_Hash32], timeout: float = 120
+    ) -> Iterator[TxReceipt]:
+        """
+        Yields the receipts of the transactions as they are included,
+        raises TimeExhausted for the first one not in the chain after timeout seconds.
+
+        :param transaction_hashes: Hashes of the transactions.
+        :param timeout: Seconds to wait for all receipts.
+        """
+        futures = self._submit_all(transaction_hashes, timeout)
+        try:
+            for future in as_completed(futures, timeout=timeout):
+                yield future.result()
+        except TimeoutError:
+            raise TimeExhausted(
+                f"Transactions are not in the chain after {timeout} seconds"
+            )
+
+    def _submit_all(self, transaction_hashes: Iterable[_Hash32], timeout: float):
+        deadline = time.monotonic() + timeout
+        futures = []
+        with self._lock:
+            for transaction_hash in transaction_hashes:
+                key = Web3.to_hex(HexBytes(transaction_hash))
+                waiting = self._waiting.get(key)
+                # A future cancelled by another caller is not shared
+                if waiting is None or waiting.future.cancelled():
+                    waiting = _Waiting(deadline)
+                    self._waiting[key] = waiting
+                else:
+                    waiting.deadline = max(waiting.deadline, deadline)
+                futures.append(waiting.future)
+            if self._poller is None:
+                self._poller = threading.Thread(
+                    target=self._poll_loop, name="zksync2-receipts", daemon=True
+                )
+                self._poller.start()
+        self._wakeup.set()
+        return futures
+
+    def _poll_loop(self):
+        while True:
+            with self._lock:
+                if len(self._waiting) == 0:
+                    self._poller = None
+                    return
+            self._wakeup.clear()
+            try:
+                self._tick()
+            except Exception:
+                # Node errors are retried on the next tick
+                pass
+            self._expire()
+            self._wakeup.wait(self._poll_latency())
+
+    def _poll_latency(self) -> float:
+        return min(
+            max(self.block_time / 2, self.min_poll_latency), self.max_poll_latency
+        )
+
+    def _update_head(self, head: int):
+        now = time.monotonic()
+        if self._head is not None and head > self._head:
+            observed = (now - self._head_at) / (head - self._head)
+            self.block_time += self.BLOCK_TIME_SMOOTHING * (observed - self.block_time)
+        if self._head is None or head > self._head:
+            self._head, self._head_at = head, now
+
+    def _tick(self):
+        self._update_head(self._eth.block_number)
+        head = self._head
+        with self._lock:
+            # Every copy of a transaction is looked up
+            due = [
+                (variant, key, waiting)
+                for key, waiting in self._waiting.items()
+                if waiting.checked_at is None or waiting.checked_at < head
+                for variant in (key, *self._replacements.get(key, ()))
+            ]
+        for start in range(0, len(due), self.max_batch):
+            chunk = due[start : start + self.max_batch]
+            results = batch_request(
+                self._eth.w3,
+                [("eth_getTransactionReceipt", [variant]) for variant, _, _ in chunk],
+            )
+            for (_, key, waiting), result in zip(chunk, results):
+                if isinstance(result, Exception):
+                    continue
+                if result is None or result.get("blockHash") is None:
+                    waiting.checked_at = head
+                    continue
+                with self._lock:
+                    # Unless a cancelled wait was already submitted again
+                    if self._waiting.get(key) is waiting:
+                        del self._waiting[key]
+                _resolve(waiting.future, format_receipt(result))
+
+    def _expire(self):
+        now = time.monotonic()
+        with self._lock:
+            expired = [
+                (key, waiting)
+                for key, waiting in self._waiting.items()
+                if waiting.deadline <= now
+            ]
+            for key, _ in expired:
+                del self._waiting[key]
+        for key, waiting in expired:
+            _resolve(
+                waiting.future,
+                exception=TimeExhausted(
+                    f"Transaction {key} is not in the chain in time"
+                ),
+            )
+
+
+def _resolve(future: Future, result=None, exception: BaseException = None):
+    # A caller may cancel the future at any time, even between a done() check and
+    # setting it, which must not stop the polling thread shared by every waiter
+    try:
+        if exception is None:
+            future.set_result(result)
+        else:
+            future.set_exception(exception)
+    except InvalidStateError:
+        pass
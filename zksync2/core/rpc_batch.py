@@ -0,0 +1,63 @@
+import json
+from functools import partial
+from typing import Any, List, Sequence, Tuple
+
+from web3 import HTTPProvider, Web3
+from web3._utils.request import make_post_request
+
+from zksync2.core.concurrency import run_concurrently
+
+
+def batch_request(w3: Web3, requests: Sequence[Tuple[str, Sequence[Any]]]) -> List[Any]:
+    """
+    Sends the requests as one JSON-RPC batch and returns the raw results in order.
+    A failed request gets a ValueError with the RPC error in its place,
+    the caller decides whether to raise it.
+
+    The batch bypasses the middlewares, so the params must already be in their
+    JSON-RPC form (hex numbers, hex data). Providers other than HTTPProvider
+    receive the requests one by one, concurrently.
+
+    :param w3: The client.
+    :param requests: Pairs of method name and params.
+    """
+    if len(requests) == 0:
+        return []
+    provider = w3.provider
+    if not isinstance(provider, HTTPProvider):
+        return list(
+            run_concurrently(
+                *(
+                    partial(_response_result, provider.make_request, method, params)
+                    for method, params in requests
+                )
+            )
+        )
+    payload = [
+        {"jsonrpc": "2.0", "id": i, "method": method, "params": list(params)}
+        for i, (method, params) in enumerate(requests)
+    ]
+    responses = json.loads(
+        make_post_request(
+            provider.endpoint_uri,
+            json.dumps(payload).encode(),
+            **provider.get_request_kwargs(),
+        )
+    )
+    if isinstance(responses, dict):
+        # The node rejected the whole batch
+        raise ValueError(responses.get("error", responses))
+    by_id = {response.get("id"): response for response in responses}
+    return [_result(by_id.get(i)) for i in range(len(requests))]
+
+
+def _response_result(make_request, method: str, params: Sequence[Any]) -> Any:
+    return _result(make_request(method, list(params)))
+
+
+def _result(response: dict) -> Any:
+    if response is None:
+        return ValueError("No response in the batch")
+    if "error" in response:
+        return ValueError(response["error"])
+    return response.get("result")
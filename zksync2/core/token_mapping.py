@@ -0,0 +1,135 @@
+import json
+import os
+import threading
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+from eth_typing import HexStr
+
+from zksync2.core.utils import write_json_atomic
+
+
+class TokenBridge(Enum):
+    WETH = "weth"
+    ERC20 = "erc20"
+
+
+@dataclass
+class TokenMapping:
+    l1_address: HexStr
+    l2_address: HexStr
+    bridge: TokenBridge
+
+    def to_dict(self) -> dict:
+        return {
+            "l1_address": self.l1_address,
+            "l2_address": self.l2_address,
+            "bridge": self.bridge.value,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TokenMapping":
+        return cls(
+            l1_address=HexStr(data["l1_address"]),
+            l2_address=HexStr(data["l2_address"]),
+            bridge=TokenBridge(data["bridge"]),
+        )
+
+
+class TokenMappingCache:
+    """
+    Remembers the L1 and L2 addresses of bridged tokens and the bridge, WETH or ERC20,
+    serving each of them. Token addresses on both sides are fixed once a token is bridged,
+    so entries never expire.
+
+    With a path the cache is loaded from and saved to a JSON file,
+    the file is replaced atomically on every change.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike] = None):
+        self.path = None if path is None else Path(path)
+        self._by_l1: Dict[str, TokenMapping] = {}
+        self._by_l2: Dict[str, TokenMapping] = {}
+        self._lock = threading.Lock()
+        if self.path is not None and self.path.exists():
+            with self.path.open() as f:
+                self._add_all(TokenMapping.from_dict(item) for item in json.load(f))
+
+    def __len__(self):
+        return len(self._by_l1)
+
+    def by_l1(self, l1_address: HexStr) -> Optional[TokenMapping]:
+        return self._by_l1.get(l1_address.lower())
+
+    def by_l2(self, l2_address: HexStr) -> Optional[TokenMapping]:
+        return self._by_l2.get(l2_address.lower())
+
+    def get_or_lookup_l1(
+        self,
+        l1_address: HexStr,
+        lookup: Callable[[HexStr], Optional[TokenMapping]],
+    ) -> Optional[TokenMapping]:
+        """
+        Returns the mapping of the L1 token, calling lookup and storing its result on a miss.
+
+        :param l1_address: The address of the token on L1.
+        :param lookup: Resolves the mapping from the bridges, returns None for unknown tokens.
+        """
+        mapping = self.by_l1(l1_address)
+        if mapping is None:
+            mapping = lookup(l1_address)
+            if mapping is not None:
+                self.add(mapping)
+        return mapping
+
+    def get_or_lookup_l2(
+        self,
+        l2_address: HexStr,
+        lookup: Callable[[HexStr], Optional[TokenMapping]],
+    ) -> Optional[TokenMapping]:
+        """
+        Returns the mapping of the L2 token, calling lookup and storing its result on a miss.
+
+        :param l2_address: The address of the token on L2.
+        :param lookup: Resolves the mapping from the bridges, returns None for unknown tokens.
+        """
+        mapping = self.by_l2(l2_address)
+        if mapping is None:
+            mapping = lookup(l2_address)
+            if mapping is not None:
+                self.add(mapping)
+        return mapping
+
+    def add(self, mapping: TokenMapping):
+        self.update([mapping])
+
+    def update(self, mappings: Iterable[TokenMapping]):
+        """
+        Adds mappings in bulk, e.g. of the tokens from zks_get_confirmed_tokens.
+        """
+        with self._lock:
+            self._add_all(mappings)
+            if self.path is not None:
+                self._save()
+
+    def mappings(self) -> List[TokenMapping]:
+        return list(self._by_l1.values())
+
+    def clear(self):
+        with self._lock:
+            self._by_l1.clear()
+            self._by_l2.clear()
+            if self.path is not None:
+                self._save()
+
+    def _add_all(self, mappings: Iterable[TokenMapping]):
+        for mapping in mappings:
+            self._by_l1[mapping.l1_address.lower()] = mapping
+            self._by_l2[mapping.l2_address.lower()] = mapping
+
+    def _save(self):
+        write_json_atomic(
+            self.path, [mapping.to_dict() for mapping in self._by_l1.values()]
+        )
@@ -311,3 +311,15 @@ class StorageProofData:
 class StorageProof:
     address: HexStr
     storageProof: StorageProofData
+
+
+@dataclass
+class FinalizeWithdrawalResult:
+    withdraw_hash: HexStr
+    index: int = 0
+    tx_hash: HexBytes = None
+    error: Exception = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
@@ -1,7 +1,10 @@
+import json
+import os
 import sys
+import tempfile
 from enum import IntEnum
 from hashlib import sha256
-from typing import Union
+from typing import Callable, Dict, Iterable, Sequence, TypeVar, Union
 
 from eth_abi import encode
 from eth_typing import HexStr, Address, ChecksumAddress
@@ -19,11 +22,71 @@ BOOTLOADER_FORMAL_ADDRESS = HexStr("0x0000000000000000000000000000000000008001")
 DEPOSIT_GAS_PER_PUBDATA_LIMIT = 800
 MAX_PRIORITY_FEE_PER_GAS = 100_000_000
 
+T = TypeVar("T")
+
 
 def int_to_bytes(x: int) -> bytes:
     return x.to_bytes((x.bit_length() + 7) // 8, byteorder=sys.byteorder)
 
 
+def write_json_atomic(path: Union[str, os.PathLike], data):
+    """
+    Writes the data as JSON to a temporary file next to path and renames it over path,
+    so that readers never see a partially written file.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(
+        dir=directory, prefix=os.path.basename(path), suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def percentiles(
+    values: Iterable[float], ranks: Sequence[float] = (50, 90, 99)
+) -> Dict[float, float]:
+    """
+    Returns the nearest-rank percentiles of the values, e.g. of latencies,
+    an empty dict without values.
+
+    :param values: The samples.
+    :param ranks: The percentiles to compute, between 0 and 100.
+    """
+    ordered = sorted(values)
+    if len(ordered) == 0:
+        return {}
+    return {
+        rank: ordered[max(0, min(len(ordered) - 1, -(-rank * len(ordered) // 100) - 1))]
+        for rank in ranks
+    }
+
+
+def client_instance(client, name: str, factory: Callable[[], T], lock) -> T:
+    """
+    Returns the object kept on the client under name, created by factory on first use.
+
+    Stored on the client itself, not in a registry keyed by it, so that it is collected
+    together with the client even though it references the client.
+
+    :param client: The client, e.g. web3.eth or web3.zksync.
+    :param name: The attribute holding the object.
+    :param factory: Creates the object.
+    :param lock: Held while looking up and creating the object.
+    """
+    with lock:
+        instance = client.__dict__.get(name)
+        if instance is None:
+            instance = factory()
+            setattr(client, name, instance)
+        return instance
+
+
 def to_bytes(data: Union[bytes, HexStr]) -> bytes:
     if isinstance(data, bytes):
         return data
@@ -61,9 +124,16 @@ def pad_front_bytes(bs: bytes, needed_length: int):
 
 
 def get_custom_bridge_data(token_contract) -> bytes:
-    name = token_contract.functions.name().call()
-    symbol = token_contract.functions.symbol().call()
-    decimals = token_contract.functions.decimals().call()
+    from zksync2.manage_contracts.multicall import Multicall
+
+    functions = token_contract.functions
+    name, symbol, decimals = Multicall.for_client(token_contract.w3.eth).call(
+        [functions.name(), functions.symbol(), functions.decimals()]
+    )
+    return encode_custom_bridge_data(name, symbol, decimals)
+
+
+def encode_custom_bridge_data(name: str, symbol: str, decimals: int) -> bytes:
     name_encoded = encode(["string"], [name])
     symbol_encoded = encode(["string"], [symbol])
     decimals_encoded = encode(["uint256"], [decimals])
@@ -0,0 +1,209 @@
+import importlib.resources as pkg_resources
+import json
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Union
+
+from eth_typing import HexStr
+from eth_utils import event_abi_to_log_topic, function_abi_to_4byte_selector
+from eth_utils.abi import collapse_if_tuple
+from hexbytes import HexBytes
+
+from zksync2.manage_contracts import contract_abi
+
+BUNDLED_ABIS = (
+    "ContractDeployer",
+    "IAllowList",
+    "IERC1271",
+    "IERC20",
+    "IEthToken",
+    "IL1Bridge",
+    "IL1Messenger",
+    "IL2Bridge",
+    "IMulticall3",
+    "INonceHolder",
+    "IPaymasterFlow",
+    "IZkSync",
+)
+
+
+@dataclass
+class AbiFunction:
+    contract: str
+    name: str
+    signature: str
+    selector: bytes
+    input_types: Tuple[str, ...]
+    output_types: Tuple[str, ...]
+    abi: dict
+
+
+@dataclass
+class AbiEvent:
+    contract: str
+    name: str
+    signature: str
+    topic: bytes
+    input_types: Tuple[str, ...]
+    indexed: Tuple[bool, ...]
+    anonymous: bool
+    abi: dict
+
+
+def _types(params: List[dict]) -> Tuple[str, ...]:
+    return tuple(collapse_if_tuple(param) for param in params)
+
+
+def _to_bytes(value: Union[bytes, HexStr]) -> bytes:
+    return bytes(HexBytes(value))
+
+
+class AbiRegistry:
+    """
+    Loads the ABIs bundled with the SDK on first use and keeps them pre-parsed into
+    function and event descriptions, indexed by name, 4-byte selector and event topic.
+
+    The registry can be pickled with everything loaded so far, workers unpickling it
+    skip reading and parsing the JSON files.
+    """
+
+    def __init__(self):
+        self._abis: Dict[str, list] = {}
+        self._functions: Dict[str, Dict[str, AbiFunction]] = {}
+        self._events: Dict[str, Dict[str, AbiEvent]] = {}
+        self._selectors: Dict[bytes, AbiFunction] = {}
+        self._topics: Dict[bytes, AbiEvent] = {}
+        self._lock = threading.RLock()
+
+    def abi(self, name: str) -> list:
+        """
+        Returns the raw ABI of the contract. The same list object is returned on every call.
+
+        :param name: The name of the bundled ABI, e.g. IZkSync.
+        """
+        abi = self._abis.get(name)
+        if abi is None:
+            with self._lock:
+                abi = self._abis.get(name)
+                if abi is None:
+                    abi = self._load(name)
+        return abi
+
+    def functions(self, name: str) -> Dict[str, AbiFunction]:
+        """
+        Returns the functions of the contract by name and by signature.
+        """
+        self.abi(name)
+        return self._functions[name]
+
+    def events(self, name: str) -> Dict[str, AbiEvent]:
+        """
+        Returns the events of the contract by name and by signature.
+        """
+        self.abi(name)
+        return self._events[name]
+
+    def function(self, name: str, function: str) -> AbiFunction:
+        return self.functions(name)[function]
+
+    def event(self, name: str, event: str) -> AbiEvent:
+        return self.events(name)[event]
+
+    def by_selector(self, selector: Union[bytes, HexStr]) -> Optional[AbiFunction]:
+        """
+        Returns the bundled function with the 4-byte selector, None if there is none.
+
+        :param selector: The selector, or calldata starting with it.
+        """
+        self.load_all()
+        return self._selectors.get(_to_bytes(selector)[:4])
+
+    def by_topic(self, topic: Union[bytes, HexStr]) -> Optional[AbiEvent]:
+        """
+        Returns the bundled event with the topic, None if there is none.
+        """
+        self.load_all()
+        return self._topics.get(_to_bytes(topic))
+
+    def load_all(self) -> "AbiRegistry":
+        """
+        Loads all bundled ABIs, e.g. before pickling the registry for workers.
+        """
+        if len(self._abis) < len(BUNDLED_ABIS):
+            for name in BUNDLED_ABIS:
+                self.abi(name)
+        return self
+
+    def _load(self, name: str) -> list:
+        with pkg_resources.path(contract_abi, f"{name}.json") as p:
+            with p.open(mode="r") as json_file:
+                data = json.load(json_file)
+        # Some of the bundled files are bare ABIs, others are build artifacts
+        abi = data["abi"] if isinstance(data, dict) else data
+
+        functions: Dict[str, AbiFunction] = {}
+        events: Dict[str, AbiEvent] = {}
+        for item in abi:
+            if item["type"] == "function":
+                input_types = _types(item.get("inputs", []))
+                signature = f"{item['name']}({','.join(input_types)})"
+                fn = AbiFunction(
+                    contract=name,
+                    name=item["name"],
+                    signature=signature,
+                    selector=function_abi_to_4byte_selector(item),
+                    input_types=input_types,
+                    output_types=_types(item.get("outputs", [])),
+                    abi=item,
+                )
+                functions.setdefault(fn.name, fn)
+                functions[signature] = fn
+                self._selectors.setdefault(fn.selector, fn)
+            elif item["type"] == "event":
+                inputs = item.get("inputs", [])
+                input_types = _types(inputs)
+                signature = f"{item['name']}({','.join(input_types)})"
+                event = AbiEvent(
+                    contract=name,
+                    name=item["name"],
+                    signature=signature,
+                    topic=event_abi_to_log_topic(item),
+                    input_types=input_types,
+                    indexed=tuple(param.get("indexed", False) for param in inputs),
+                    anonymous=item.get("anonymous", False),
+                    abi=item,
+                )
+                events.setdefault(event.name, event)
+                events[signature] = event
+                self._topics.setdefault(event.topic, event)
+        self._functions[name] = functions
+        self._events[name] = events
+        self._abis[name] = abi
+        return abi
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+
+_default_registry = AbiRegistry()
+
+
+def default_registry() -> AbiRegistry:
+    """
+    Returns the registry used by the *_abi_default functions.
+    """
+    return _default_registry
+
+
+def set_default_registry(registry: AbiRegistry):
+    """
+    Replaces the default registry, e.g. with an unpickled one in a worker process.
+    """
+    global _default_registry
+    _default_registry = registry
@@ -6,7 +6,6 @@ from eth_account.signers.base import BaseAccount
 from eth_utils import remove_0x_prefix
 from web3 import Web3
 from web3.contract import Contract
-from zksync2.core.types import EthBlockParams
 from zksync2.manage_contracts.precompute_contract_deployer import (
     PrecomputeContractDeployer,
 )
@@ -61,9 +60,6 @@ class LegacyContractFactory:
     def _deploy_create(
         self, salt: bytes = None, args: Optional[Any] = None, deps: List[bytes] = None
     ) -> Contract:
-        nonce = self.web3.zksync.get_transaction_count(
-            self.account.address, EthBlockParams.PENDING.value
-        )
         call_data = None
         if args is not None:
             encoder = ContractEncoder(self.web3, abi=self.abi, bytecode=self.byte_code)
@@ -73,24 +69,27 @@ class LegacyContractFactory:
         if deps is not None:
             factory_deps = deps
 
-        create_contract = TxCreateContract(
-            web3=self.web3,
-            chain_id=self.web3.zksync.chain_id,
-            nonce=nonce,
-            from_=self.account.address,
-            gas_limit=0,
-            gas_price=self.web3.zksync.gas_price,
-            bytecode=self.byte_code,
-            call_data=call_data,
-            deps=factory_deps,
-        )
+        with self.web3.zksync.nonce_manager.reserve(self.account.address) as nonce:
+            create_contract = TxCreateContract(
+                web3=self.web3,
+                chain_id=self.web3.zksync.chain_id,
+                nonce=nonce,
+                from_=self.account.address,
+                gas_limit=0,
+                gas_price=self.web3.zksync.fee_oracle.gas_price(),
+                bytecode=self.byte_code,
+                call_data=call_data,
+                deps=factory_deps,
+            )
 
-        estimate_gas = self.web3.zksync.eth_estimate_gas(create_contract.tx)
+            estimate_gas = self.web3.zksync.eth_estimate_gas(create_contract.tx)
 
-        tx_712 = create_contract.tx712(estimate_gas)
-        singed_message = self.signer.sign_typed_data(tx_712.to_eip712_struct())
-        msg = tx_712.encode(singed_message)
-        tx_hash = self.web3.zksync.send_raw_transaction(msg)
+            tx_712 = create_contract.tx712(estimate_gas)
+            singed_message = self.signer.sign_typed_data(tx_712.to_eip712_struct())
+            msg = tx_712.encode(singed_message)
+            tx_hash = self.web3.zksync.send_reserved_raw_transaction(
+                msg, self.account.address, nonce, create_contract.tx
+            )
         tx_receipt = self.web3.zksync.wait_for_transaction_receipt(
             tx_hash, timeout=240, poll_latency=0.5
         )
@@ -104,10 +103,7 @@ class LegacyContractFactory:
     def _deploy_create2(
         self, salt: bytes = None, args: Optional[Any] = None, deps: List[bytes] = None
     ) -> Contract:
-        nonce = self.web3.zksync.get_transaction_count(
-            self.account.address, EthBlockParams.PENDING.value
-        )
-        gas_price = self.web3.zksync.gas_price
+        gas_price = self.web3.zksync.fee_oracle.gas_price()
         call_data = None
         if args is not None:
             encoder = ContractEncoder(self.web3, abi=self.abi, bytecode=self.byte_code)
@@ -117,23 +113,26 @@ class LegacyContractFactory:
         if deps is not None:
             factory_deps = deps
 
-        create2_contract = TxCreate2Contract(
-            web3=self.web3,
-            chain_id=self.web3.zksync.chain_id,
-            nonce=nonce,
-            from_=self.account.address,
-            gas_limit=0,
-            gas_price=gas_price,
-            bytecode=self.byte_code,
-            call_data=call_data,
-            deps=factory_deps,
-            salt=salt,
-        )
-        estimate_gas = self.web3.zksync.eth_estimate_gas(create2_contract.tx)
-        tx_712 = create2_contract.tx712(estimate_gas)
-        singed_message = self.signer.sign_typed_data(tx_712.to_eip712_struct())
-        msg = tx_712.encode(singed_message)
-        tx_hash = self.web3.zksync.send_raw_transaction(msg)
+        with self.web3.zksync.nonce_manager.reserve(self.account.address) as nonce:
+            create2_contract = TxCreate2Contract(
+                web3=self.web3,
+                chain_id=self.web3.zksync.chain_id,
+                nonce=nonce,
+                from_=self.account.address,
+                gas_limit=0,
+                gas_price=gas_price,
+                bytecode=self.byte_code,
+                call_data=call_data,
+                deps=factory_deps,
+                salt=salt,
+            )
+            estimate_gas = self.web3.zksync.eth_estimate_gas(create2_contract.tx)
+            tx_712 = create2_contract.tx712(estimate_gas)
+            singed_message = self.signer.sign_typed_data(tx_712.to_eip712_struct())
+            msg = tx_712.encode(singed_message)
+            tx_hash = self.web3.zksync.send_reserved_raw_transaction(
+                msg, self.account.address, nonce, create2_contract.tx
+            )
         tx_receipt = self.web3.zksync.wait_for_transaction_receipt(
             tx_hash, timeout=240, poll_latency=0.5
         )
@@ -0,0 +1,66 @@
+from functools import lru_cache
+from typing import Any, Callable
+
+from eth_abi.grammar import ABIType, TupleType, parse
+from eth_abi.registry import registry
+from eth_typing import HexStr
+from hexbytes import HexBytes
+
+from zksync2.manage_contracts.abi_registry import AbiFunction, default_registry
+
+
+def _identity(value):
+    return value
+
+
+def _normalizer(abi_type: ABIType) -> Callable[[Any], Any]:
+    # Hex strings are accepted for bytes values, like Contract.encodeABI does
+    if abi_type.is_array:
+        item = _normalizer(abi_type.item_type)
+        if item is _identity:
+            return _identity
+        return lambda values: [item(value) for value in values]
+    if isinstance(abi_type, TupleType):
+        components = [_normalizer(c) for c in abi_type.components]
+        if all(c is _identity for c in components):
+            return _identity
+        return lambda values: tuple(c(v) for c, v in zip(components, values))
+    if abi_type.base == "bytes":
+        return lambda value: bytes(HexBytes(value)) if isinstance(value, str) else value
+    return _identity
+
+
+class FunctionEncoder:
+    """
+    Encodes calls of one function: the precomputed selector followed by the arguments
+    encoded with the eth-abi encoder of the argument types.
+    The output is the same as Contract.encodeABI, without the per-call ABI lookup and validation.
+    """
+
+    def __init__(self, fn: AbiFunction):
+        self.function = fn
+        self.selector = fn.selector
+        self._encoder = registry.get_encoder(f"({','.join(fn.input_types)})")
+        self._normalizers = [_normalizer(parse(t)) for t in fn.input_types]
+
+    def encode_bytes(self, *args) -> bytes:
+        if len(args) != len(self._normalizers):
+            raise TypeError(
+                f"{self.function.signature} expects {len(self._normalizers)} arguments, got: {len(args)}"
+            )
+        values = tuple(n(arg) for n, arg in zip(self._normalizers, args))
+        return self.selector + self._encoder(values)
+
+    def encode(self, *args) -> HexStr:
+        return HexStr("0x" + self.encode_bytes(*args).hex())
+
+
+@lru_cache(maxsize=None)
+def function_encoder(contract: str, function: str) -> FunctionEncoder:
+    """
+    Returns the encoder of a function of a bundled ABI.
+
+    :param contract: The name of the bundled ABI, e.g. IL2Bridge.
+    :param function: The function name or signature, e.g. finalizeDeposit.
+    """
+    return FunctionEncoder(default_registry().function(contract, function))
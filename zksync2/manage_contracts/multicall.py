@@ -0,0 +1,192 @@
+import threading
+from functools import partial
+from typing import Any, List, Optional, Sequence, Tuple
+
+from eth_abi import decode
+from eth_typing import HexStr
+from hexbytes import HexBytes
+from web3 import Web3
+from web3._utils.abi import get_abi_output_types, map_abi_data
+from web3._utils.normalizers import BASE_RETURN_NORMALIZERS
+from web3.contract.contract import ContractFunction
+from web3.eth import Eth
+from web3.exceptions import ContractLogicError
+from web3.types import BlockIdentifier
+
+from zksync2.core.concurrency import run_concurrently
+from zksync2.core.rpc_batch import batch_request
+from zksync2.core.utils import client_instance
+from zksync2.manage_contracts.function_encoder import function_encoder
+from zksync2.manage_contracts.utils import multicall3_abi_default
+
+# Deployed at the same address on Ethereum and most EVM chains
+MULTICALL3_ADDRESS = HexStr("0xcA11bde05977b3631167028862bE2a173976CA11")
+# zkSync Era mainnet, other zkSync networks may have it elsewhere or not at all
+ZKSYNC_MULTICALL3_ADDRESS = HexStr("0xF9cda624FBC7e059355ce98a31693d299FACd963")
+
+
+class Multicall:
+    """
+    Executes many contract reads in one round trip: through one eth_call to a Multicall3
+    aggregator (aggregate3) when one is deployed at address, as one JSON-RPC batch of
+    eth_call requests otherwise.
+
+    Calls are ContractFunction objects, e.g. token.functions.balanceOf(owner),
+    results are decoded the same way as ContractFunction.call. Hot paths can skip
+    building and decoding ContractFunctions with call_raw and pre-encoded call data.
+    """
+
+    DEFAULT_MAX_CALLS = 1000
+
+    _instances_lock = threading.Lock()
+
+    def __init__(
+        self,
+        eth: Eth,
+        address: HexStr = MULTICALL3_ADDRESS,
+        max_calls: int = DEFAULT_MAX_CALLS,
+    ):
+        self._eth = eth
+        self.address = Web3.to_checksum_address(address)
+        self.max_calls = max_calls
+        self._available: Optional[bool] = None
+        # Built once per instance, instances are shared per client through for_client
+        self.contract = eth.contract(self.address, abi=multicall3_abi_default())
+
+    @classmethod
+    def for_client(cls, eth: Eth, address: HexStr = MULTICALL3_ADDRESS) -> "Multicall":
+        """
+        Returns the instance shared by all users of the client and aggregator address.
+
+        :param eth: The eth module of the client, e.g. web3.eth or web3.zksync.
+        :param address: The address of the Multicall3 aggregator.
+        """
+        address = Web3.to_checksum_address(address)
+        by_address = client_instance(
+            eth, "_zksync2_multicalls", dict, cls._instances_lock
+        )
+        with cls._instances_lock:
+            multicall = by_address.get(address)
+            if multicall is None:
+                multicall = cls(eth, address)
+                by_address[address] = multicall
+            return multicall
+
+    @property
+    def available(self) -> bool:
+        """
+        Whether the aggregator is deployed, checked on first use.
+        """
+        if self._available is None:
+            self._available = len(self._eth.get_code(self.address)) > 0
+        return self._available
+
+    def get_eth_balance(self, address: HexStr) -> ContractFunction:
+        """
+        Returns the call reading the ETH balance of the address,
+        sent as eth_getBalance when there is no aggregator.
+        """
+        return self.contract.functions.getEthBalance(address)
+
+    def call(
+        self,
+        calls: Sequence[ContractFunction],
+        block_identifier: BlockIdentifier = "latest",
+        allow_failure: bool = False,
+    ) -> List[Any]:
+        """
+        Executes the calls and returns their results in order.
+
+        :param calls: The contract function calls, e.g. [token.functions.decimals(), ...].
+        :param block_identifier: The block the calls are executed at.
+        :param allow_failure: Return None for failed calls instead of raising ContractLogicError.
+        """
+        if len(calls) == 0:
+            return []
+        results = self.call_raw(
+            [(call.address, call._encode_transaction_data()) for call in calls],
+            block_identifier,
+        )
+        return [
+            _decode(call, success, data, allow_failure)
+            for call, (success, data) in zip(calls, results)
+        ]
+
+    def call_raw(
+        self,
+        calls: Sequence[Tuple[HexStr, bytes]],
+        block_identifier: BlockIdentifier = "latest",
+    ) -> List[Tuple[bool, bytes]]:
+        """
+        Executes encoded calls and returns the success flag and the raw output of each.
+
+        :param calls: Pairs of target address and call data, e.g. from function_encoder.
+        :param block_identifier: The block the calls are executed at.
+        """
+        if len(calls) == 0:
+            return []
+        chunks = [
+            calls[i : i + self.max_calls] for i in range(0, len(calls), self.max_calls)
+        ]
+        execute = self._aggregate if self.available else self._batch
+        results = run_concurrently(
+            *(partial(execute, chunk, block_identifier) for chunk in chunks)
+        )
+        return [result for chunk in results for result in chunk]
+
+    def _aggregate(self, calls: Sequence[Tuple[HexStr, bytes]], block_identifier):
+        data = function_encoder("IMulticall3", "aggregate3").encode(
+            [(target, True, call_data) for target, call_data in calls]
+        )
+        output = self._eth.call(
+            {"to": self.address, "data": data}, block_identifier=block_identifier
+        )
+        return decode(["(bool,bytes)[]"], output)[0]
+
+    def _batch(self, calls: Sequence[Tuple[HexStr, bytes]], block_identifier):
+        block = _block_param(block_identifier)
+        get_eth_balance = function_encoder("IMulticall3", "getEthBalance").selector
+        requests = []
+        for target, call_data in calls:
+            call_data = bytes(HexBytes(call_data))
+            if (
+                target.lower() == self.address.lower()
+                and call_data[:4] == get_eth_balance
+            ):
+                owner = Web3.to_checksum_address(call_data[16:36])
+                requests.append(("eth_getBalance", [owner, block]))
+            else:
+                tx = {"to": target, "data": "0x" + call_data.hex()}
+                requests.append(("eth_call", [tx, block]))
+        results = []
+        for (method, _), result in zip(requests, batch_request(self._eth.w3, requests)):
+            if isinstance(result, ValueError):
+                results.append((False, b""))
+            elif method == "eth_getBalance":
+                results.append((True, int(result, 16).to_bytes(32, "big")))
+            else:
+                results.append((True, bytes(HexBytes(result))))
+        return results
+
+
+def _block_param(block_identifier: BlockIdentifier) -> str:
+    if isinstance(block_identifier, int):
+        return hex(block_identifier)
+    if isinstance(block_identifier, bytes):
+        return Web3.to_hex(block_identifier)
+    return block_identifier
+
+
+def _decode(call: ContractFunction, success: bool, data: bytes, allow_failure: bool):
+    output_types = get_abi_output_types(call.abi)
+    if success:
+        try:
+            values = call.w3.codec.decode(output_types, data)
+        except Exception:
+            success = False
+    if not success:
+        if allow_failure:
+            return None
+        raise ContractLogicError(f"Call to {call.address} {call.fn_name} failed")
+    values = map_abi_data(BASE_RETURN_NORMALIZERS, output_types, values)
+    return values[0] if len(values) == 1 else values
@@ -4,6 +4,7 @@ from eth_typing import HexStr
 import json
 from zksync2.manage_contracts import contract_abi
 from zksync2.manage_contracts.contract_encoder_base import BaseContractEncoder
+from zksync2.manage_contracts.function_encoder import function_encoder
 from zksync2.manage_contracts.utils import paymaster_flow_abi_default
 
 paymaster_flow_abi_cache = None
@@ -18,9 +19,9 @@ class PaymasterFlowEncoder(BaseContractEncoder):
     def encode_approval_based(
         self, address: HexStr, min_allowance: int, inner_input: bytes
     ) -> HexStr:
-        return self.encode_method(
-            fn_name="approvalBased", args=(address, min_allowance, inner_input)
+        return function_encoder("IPaymasterFlow", "approvalBased").encode(
+            address, min_allowance, inner_input
         )
 
     def encode_general(self, inputs: bytes) -> HexStr:
-        return self.encode_method(fn_name="general", args=tuple([inputs]))
+        return function_encoder("IPaymasterFlow", "general").encode(inputs)
@@ -12,6 +12,7 @@ from zksync2.core.types import AccountAbstractionVersion
 from zksync2.core.utils import pad_front_bytes, to_bytes, int_to_bytes, hash_byte_code
 from zksync2.manage_contracts import contract_abi
 from zksync2.manage_contracts.contract_encoder_base import BaseContractEncoder
+from zksync2.manage_contracts.function_encoder import function_encoder
 from zksync2.manage_contracts.utils import icontract_deployer_abi_default
 
 icontract_deployer_abi_cache = None
@@ -31,10 +32,17 @@ class PrecomputeContractDeployer:
 
     def __init__(self, web3: Web3, abi: Optional[dict] = None):
         self.web3 = web3
+        # Calls of the bundled ABI are encoded directly, custom ABIs go through web3
+        self._default_abi = abi is None
         if abi is None:
             abi = icontract_deployer_abi_default()
         self.contract_encoder = BaseContractEncoder(self.web3, abi)
 
+    def _encode(self, fn_name: str, args: tuple) -> HexStr:
+        if self._default_abi:
+            return function_encoder("ContractDeployer", fn_name).encode(*args)
+        return self.contract_encoder.encode_method(fn_name=fn_name, args=args)
+
     def encode_create2(
         self,
         bytecode: bytes,
@@ -52,7 +60,7 @@ class PrecomputeContractDeployer:
         bytecode_hash = hash_byte_code(bytecode)
         args = salt, bytecode_hash, call_data
 
-        return self.contract_encoder.encode_method(fn_name=self.CREATE2_FUNC, args=args)
+        return self._encode(self.CREATE2_FUNC, args)
 
     def encode_create(
         self, bytecode: bytes, call_data: Optional[bytes] = None
@@ -63,7 +71,7 @@ class PrecomputeContractDeployer:
         bytecode_hash = hash_byte_code(bytecode)
         args = self.DEFAULT_SALT, bytecode_hash, call_data
 
-        return self.contract_encoder.encode_method(fn_name=self.CREATE_FUNC, args=args)
+        return self._encode(self.CREATE_FUNC, args)
 
     def encode_create2_account(
         self,
@@ -83,9 +91,7 @@ class PrecomputeContractDeployer:
         bytecode_hash = hash_byte_code(bytecode)
         args = salt, bytecode_hash, call_data, version.value
 
-        return self.contract_encoder.encode_method(
-            fn_name=self.CREATE2_ACCOUNT_FUNC, args=args
-        )
+        return self._encode(self.CREATE2_ACCOUNT_FUNC, args)
 
     def encode_create_account(
         self,
@@ -99,9 +105,7 @@ class PrecomputeContractDeployer:
         bytecode_hash = hash_byte_code(bytecode)
         args = self.DEFAULT_SALT, bytecode_hash, call_data, version.value
 
-        return self.contract_encoder.encode_method(
-            fn_name=self.CREATE_ACCOUNT_FUNC, args=args
-        )
+        return self._encode(self.CREATE_ACCOUNT_FUNC, args)
 
     def compute_l2_create_address(self, sender: HexStr, nonce: Nonce) -> HexStr:
         sender_bytes = to_bytes(sender)
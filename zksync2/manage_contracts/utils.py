@@ -1,107 +1,81 @@
-import importlib.resources as pkg_resources
-import json
+import threading
+from collections import OrderedDict
 from typing import Optional
 
+from eth_typing import HexStr
 from web3 import Web3
+from web3.contract import Contract
 
-from zksync2.manage_contracts import contract_abi
+from zksync2.manage_contracts.abi_registry import default_registry
 from zksync2.manage_contracts.contract_encoder_base import BaseContractEncoder
 
-zksync_abi_cache = None
-icontract_deployer_abi_cache = None
-paymaster_flow_abi_cache = None
-nonce_holder_abi_cache = None
-l2_bridge_abi_cache = None
-l1_bridge_abi_cache = None
-eth_token_abi_cache = None
-erc_20_abi_cache = None
+CONTRACT_CACHE_SIZE = 1024
+_contract_cache = OrderedDict()
+_contract_cache_lock = threading.Lock()
 
 
 def zksync_abi_default():
-    global zksync_abi_cache
-
-    if zksync_abi_cache is None:
-        with pkg_resources.path(contract_abi, "IZkSync.json") as p:
-            with p.open(mode="r") as json_file:
-                data = json.load(json_file)
-                zksync_abi_cache = data["abi"]
-    return zksync_abi_cache
+    return default_registry().abi("IZkSync")
 
 
 def icontract_deployer_abi_default():
-    global icontract_deployer_abi_cache
-
-    if icontract_deployer_abi_cache is None:
-        with pkg_resources.path(contract_abi, "ContractDeployer.json") as p:
-            with p.open(mode="r") as json_file:
-                data = json.load(json_file)
-                icontract_deployer_abi_cache = data["abi"]
-    return icontract_deployer_abi_cache
+    return default_registry().abi("ContractDeployer")
 
 
 def paymaster_flow_abi_default():
-    global paymaster_flow_abi_cache
-
-    if paymaster_flow_abi_cache is None:
-        with pkg_resources.path(contract_abi, "IPaymasterFlow.json") as p:
-            with p.open(mode="r") as json_file:
-                data = json.load(json_file)
-                paymaster_flow_abi_cache = data["abi"]
-    return paymaster_flow_abi_cache
+    return default_registry().abi("IPaymasterFlow")
 
 
 def nonce_holder_abi_default():
-    global nonce_holder_abi_cache
-
-    if nonce_holder_abi_cache is None:
-        with pkg_resources.path(contract_abi, "INonceHolder.json") as p:
-            with p.open(mode="r") as json_file:
-                nonce_holder_abi_cache = json.load(json_file)
-    return nonce_holder_abi_cache
+    return default_registry().abi("INonceHolder")
 
 
 def l2_bridge_abi_default():
-    global l2_bridge_abi_cache
-
-    if l2_bridge_abi_cache is None:
-        with pkg_resources.path(contract_abi, "IL2Bridge.json") as p:
-            with p.open(mode="r") as json_file:
-                data = json.load(json_file)
-                l2_bridge_abi_cache = data["abi"]
-    return l2_bridge_abi_cache
+    return default_registry().abi("IL2Bridge")
 
 
 def l1_bridge_abi_default():
-    global l1_bridge_abi_cache
-
-    if l1_bridge_abi_cache is None:
-        with pkg_resources.path(contract_abi, "IL1Bridge.json") as p:
-            with p.open(mode="r") as json_file:
-                data = json.load(json_file)
-                l1_bridge_abi_cache = data["abi"]
-    return l1_bridge_abi_cache
+    return default_registry().abi("IL1Bridge")
 
 
 def eth_token_abi_default():
-    global eth_token_abi_cache
-
-    if eth_token_abi_cache is None:
-        with pkg_resources.path(contract_abi, "IEthToken.json") as p:
-            with p.open(mode="r") as json_file:
-                data = json.load(json_file)
-                erc_20_abi_cache = data["abi"]
-    return erc_20_abi_cache
+    return default_registry().abi("IEthToken")
 
 
 def get_erc20_abi():
-    global erc_20_abi_cache
-
-    if erc_20_abi_cache is None:
-        with pkg_resources.path(contract_abi, "IERC20.json") as p:
-            with p.open(mode="r") as json_file:
-                data = json.load(json_file)
-                erc_20_abi_cache = data["abi"]
-    return erc_20_abi_cache
+    return default_registry().abi("IERC20")
+
+
+def multicall3_abi_default():
+    return default_registry().abi("IMulticall3")
+
+
+def cached_contract(eth, address: HexStr = None, abi=None) -> Contract:
+    """
+    Returns eth.contract(address, abi=abi), built once per (client, address, ABI object)
+    and kept in a process-wide LRU of CONTRACT_CACHE_SIZE contracts.
+    ABIs are matched by identity, pass the cached lists returned by the *_abi_default functions.
+
+    :param eth: The module the contract is bound to, e.g. web3.eth or web3.zksync.
+    :param address: The contract address, None for contracts only used for encoding.
+    :param abi: The contract ABI.
+    """
+    if address is not None:
+        address = Web3.to_checksum_address(address)
+    key = (id(eth), address, id(abi))
+    with _contract_cache_lock:
+        entry = _contract_cache.get(key)
+        # ids can be reused after collection, the entry keeps eth and abi alive through the contract
+        if entry is not None and entry[0] is eth and entry[1] is abi:
+            _contract_cache.move_to_end(key)
+            return entry[2]
+    contract = eth.contract(address, abi=abi)
+    with _contract_cache_lock:
+        _contract_cache[key] = (eth, abi, contract)
+        _contract_cache.move_to_end(key)
+        while len(_contract_cache) > CONTRACT_CACHE_SIZE:
+            _contract_cache.popitem(last=False)
+    return contract
 
 
 class ERC20Encoder(BaseContractEncoder):
@@ -1,16 +1,23 @@
-from zksync2.module.zksync_module import ZkSync
-from zksync2.module.zksync_provider import ZkSyncProvider
-from zksync2.module.middleware import build_zksync_middleware
+from typing import TYPE_CHECKING, Union
 
-from typing import Union
-from web3._utils.module import attach_modules
 from eth_typing import URI
-from web3 import Web3
+
+if TYPE_CHECKING:
+    from web3 import Web3
 
 
 class ZkSyncBuilder:
     @classmethod
-    def build(cls, url: Union[URI, str]) -> Web3:
+    def build(cls, url: Union[URI, str]) -> "Web3":
+        # web3 takes most of the import time of the package, it is only imported
+        # once a client is built (see tests/unit/test_import.py)
+        from web3 import Web3
+        from web3._utils.module import attach_modules
+
+        from zksync2.module.middleware import build_zksync_middleware
+        from zksync2.module.zksync_module import ZkSync
+        from zksync2.module.zksync_provider import ZkSyncProvider
+
         web3_module = Web3()
         zksync_provider = ZkSyncProvider(url)
         zksync_middleware = build_zksync_middleware(zksync_provider)
@@ -1,5 +1,7 @@
 from abc import ABC
 
+import threading
+import time
 import web3
 from eth_utils import to_checksum_address, is_address
 from eth_utils.curried import apply_formatter_to_array
@@ -7,9 +9,8 @@ from eth_utils.curried import apply_formatter_to_array
 from eth_utils.curried import apply_formatter_at_index
 from hexbytes import HexBytes
 from web3 import Web3
-from web3._utils.threads import Timeout
 from web3.contract import Contract
-from web3.exceptions import TransactionNotFound, TimeExhausted
+from web3.exceptions import TimeExhausted
 from web3.module import Module
 from web3._utils.formatters import integer_to_hex
 from web3._utils.method_formatters import (
@@ -51,14 +52,15 @@ from zksync2.core.types import (
     ContractAccountInfo,
     StorageProof,
 )
-from zksync2.core.utils import is_eth, MAX_PRIORITY_FEE_PER_GAS
+from zksync2.core.block_watcher import BlockWatcher
+from zksync2.core.fee_oracle import FeeOracle
+from zksync2.core.gas_estimate_cache import GasEstimateCache
+from zksync2.core.nonce_manager import NonceManager
+from zksync2.core.priority_ops import PriorityOpTracker, l2_hashes_from_receipt
+from zksync2.core.receipt_waiter import ReceiptWaiter
+from zksync2.core.token_mapping import TokenBridge, TokenMapping, TokenMappingCache
+from zksync2.core.utils import is_eth, MAX_PRIORITY_FEE_PER_GAS, L2_ETH_TOKEN_ADDRESS
 from zksync2.manage_contracts.deploy_addresses import ZkSyncAddresses
-from zksync2.manage_contracts.utils import (
-    ERC20Encoder,
-    get_erc20_abi,
-    icontract_deployer_abi_default,
-    l2_bridge_abi_default,
-)
 from zksync2.module.request_types import *
 from zksync2.module.response_types import *
 from zksync2.core.types import TransactionReceipt
@@ -66,14 +68,22 @@ from eth_typing import Address
 from eth_utils import remove_0x_prefix
 from eth_utils.toolz import compose
 from web3.method import Method, default_root_munger
-from typing import Any, Callable, List, Union
+from functools import partial
+from typing import Any, Callable, List, Optional, Tuple, Union
 
-from zksync2.transaction.transaction712 import Transaction712
-from zksync2.transaction.transaction_builders import (
-    TxWithdraw,
-    TxFunctionCall,
-    TxTransfer,
+from zksync2.core.concurrency import run_concurrently
+from zksync2.core.portfolio import PortfolioSnapshot, take_portfolio_snapshot
+from zksync2.manage_contracts.function_encoder import function_encoder
+from zksync2.manage_contracts.multicall import Multicall, ZKSYNC_MULTICALL3_ADDRESS
+from zksync2.manage_contracts.utils import (
+    cached_contract,
+    eth_token_abi_default,
+    get_erc20_abi,
+    icontract_deployer_abi_default,
+    l2_bridge_abi_default,
 )
+from zksync2.transaction.transaction712 import Transaction712
+from zksync2.transaction.transaction_builders import TxWithdraw, TxTransfer
 
 zks_l1_batch_number_rpc = RPCEndpoint("zks_L1BatchNumber")
 zks_get_l1_batch_block_range_rpc = RPCEndpoint("zks_getL1BatchBlockRange")
@@ -173,8 +183,16 @@ def to_bridge_address(t: dict) -> BridgeAddresses:
     )
 
 
+def to_datetime(value: Optional[str]) -> Optional[datetime]:
+    # Dates of batches and blocks are null until the batch is committed, proven and executed
+    if value is None:
+        return None
+    if "." in value:
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%fZ")
+    return datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ")
+
+
 def to_batch_details(t: dict) -> BatchDetails:
-    datetime_format = "%Y-%m-%dT%H:%M:%S.%fZ"
     base_sys_contract_hashes = BaseSystemContractsHashes(
         bootloader=t["baseSystemContractsHashes"]["bootloader"],
         default_aa=t["baseSystemContractsHashes"]["default_aa"],
@@ -182,16 +200,16 @@ def to_batch_details(t: dict) -> BatchDetails:
     return BatchDetails(
         base_system_contracts_hashes=base_sys_contract_hashes,
         commit_tx_hash=t["commitTxHash"],
-        committed_at=datetime.strptime(t["committedAt"], datetime_format),
+        committed_at=to_datetime(t["committedAt"]),
         execute_tx_hash=t["executeTxHash"],
-        executed_at=datetime.strptime(t["executedAt"], datetime_format),
+        executed_at=to_datetime(t["executedAt"]),
         l1_gas_price=t["l1GasPrice"],
         l1_tx_count=t["l1TxCount"],
         l2_fair_gas_price=t["l2FairGasPrice"],
         l2_tx_count=t["l2TxCount"],
         number=t["number"],
         prove_tx_hash=t["proveTxHash"],
-        proven_at=datetime.strptime(t["provenAt"], datetime_format),
+        proven_at=to_datetime(t["provenAt"]),
         root_hash=t["rootHash"],
         status=t["status"],
         timestamp=t["timestamp"],
@@ -199,17 +217,16 @@ def to_batch_details(t: dict) -> BatchDetails:
 
 
 def to_block_details(t: dict) -> BlockDetails:
-    datetime_format = "%Y-%m-%dT%H:%M:%S.%fZ"
     return BlockDetails(
         commit_tx_hash=t["commitTxHash"],
-        committed_at=datetime.strptime(t["committedAt"], datetime_format),
+        committed_at=to_datetime(t["committedAt"]),
         execute_tx_hash=t["executeTxHash"],
-        executed_at=datetime.strptime(t["executedAt"], datetime_format),
+        executed_at=to_datetime(t["executedAt"]),
         l1_tx_count=t["l1TxCount"],
         l2_tx_count=t["l2TxCount"],
         number=t["number"],
         prove_tx_hash=t["proveTxHash"],
-        proven_at=datetime.strptime(t["provenAt"], datetime_format),
+        proven_at=to_datetime(t["provenAt"]),
         root_hash=t["rootHash"],
         status=t["status"],
         timestamp=t["timestamp"],
@@ -469,6 +486,41 @@ class ZkSync(Eth, ABC):
         super(ZkSync, self).__init__(web3)
         self.main_contract_address = None
         self.bridge_addresses = None
+        self.gas_estimate_cache: Optional[GasEstimateCache] = None
+        # The shared subsystems below are created on first use
+        self._token_mapping_cache: Optional[TokenMappingCache] = None
+        self._token_mapping_cache_lock = threading.Lock()
+
+    @property
+    def nonce_manager(self) -> NonceManager:
+        return NonceManager.for_client(self)
+
+    @property
+    def fee_oracle(self) -> FeeOracle:
+        return FeeOracle.for_client(self)
+
+    @property
+    def receipt_waiter(self) -> ReceiptWaiter:
+        return ReceiptWaiter.for_client(self)
+
+    @property
+    def block_watcher(self) -> BlockWatcher:
+        return BlockWatcher.for_client(self)
+
+    @property
+    def token_mapping_cache(self) -> TokenMappingCache:
+        """
+        Token mappings looked up so far, in memory unless replaced,
+        e.g. by TokenMappingCache(path) to keep them across runs.
+        """
+        with self._token_mapping_cache_lock:
+            if self._token_mapping_cache is None:
+                self._token_mapping_cache = TokenMappingCache()
+            return self._token_mapping_cache
+
+    @token_mapping_cache.setter
+    def token_mapping_cache(self, cache: TokenMappingCache):
+        self._token_mapping_cache = cache
 
     def zks_l1_batch_number(self) -> int:
         return int(self._zks_l1_batch_number(), 16)
@@ -497,10 +549,9 @@ class ZkSync(Eth, ABC):
         if token_address is not None and not is_eth(token_address):
             transfer_params = (transaction["to"], transaction["value"])
             transaction["value"] = 0
-            contract = self.contract(
-                Web3.to_checksum_address(token_address), abi=get_erc20_abi()
+            transaction["data"] = function_encoder("IERC20", "transfer").encode(
+                *transfer_params
             )
-            transaction["data"] = contract.encodeABI("transfer", args=transfer_params)
             transaction["nonce"] = self.get_transaction_count(
                 transaction["from_"], ZkBlockParams.COMMITTED.value
             )
@@ -537,60 +588,171 @@ class ZkSync(Eth, ABC):
             return self.get_balance(to_checksum_address(address), block_tag)
 
         try:
-            token = self.contract(
-                Web3.to_checksum_address(token_address), abi=get_erc20_abi()
+            token = cached_contract(
+                self, Web3.to_checksum_address(token_address), abi=get_erc20_abi()
             )
             return token.functions.balanceOf(address).call()
         except:
             return 0
 
+    def zks_get_balances(
+        self,
+        address: HexStr,
+        tokens: List[HexStr],
+        block_tag=ZkBlockParams.COMMITTED.value,
+    ) -> List[int]:
+        """
+        Returns the balances of the address for many tokens in one round trip,
+        0 for tokens whose balance can not be read.
+
+        :param address: The account address.
+        :param tokens: The token addresses, ETH is the zero address or the L2 ETH token.
+        :param block_tag: The block tag to get the balances at. Defaults to 'committed'.
+        """
+
+        # L2EthToken has balanceOf(uint256) instead of the ERC20 balanceOf(address)
+        eth_balance = cached_contract(
+            self,
+            Web3.to_checksum_address(L2_ETH_TOKEN_ADDRESS),
+            abi=eth_token_abi_default(),
+        ).functions.balanceOf(int(address, 16))
+        calls = [
+            eth_balance
+            if is_eth(t)
+            else cached_contract(
+                self, Web3.to_checksum_address(t), abi=get_erc20_abi()
+            ).functions.balanceOf(address)
+            for t in tokens
+        ]
+        balances = Multicall.for_client(self, ZKSYNC_MULTICALL3_ADDRESS).call(
+            calls, block_tag, allow_failure=True
+        )
+        return [0 if balance is None else balance for balance in balances]
+
     def l1_token_address(self, token: HexStr) -> HexStr:
         if is_eth(token):
             return ADDRESS_DEFAULT
-        bridge_address = self.zks_get_bridge_contracts()
-        l2_weth_bridge = self.contract(
-            Web3.to_checksum_address(bridge_address.weth_bridge_l2),
-            abi=l2_bridge_abi_default(),
-        )
-        try:
-            l1_weth_token = l2_weth_bridge.functions.l1TokenAddress(token).call()
-            if not is_eth(l1_weth_token):
-                return l1_weth_token
-        except:
-            pass
+        mapping = self.token_mapping_by_l2(token)
+        return ADDRESS_DEFAULT if mapping is None else mapping.l1_address
 
-        erc20_bridge = self.contract(
-            Web3.to_checksum_address(bridge_address.erc20_l2_default_bridge),
-            abi=l2_bridge_abi_default(),
+    def l2_token_address(self, token: HexStr) -> HexStr:
+        if is_eth(token):
+            return ADDRESS_DEFAULT
+        mapping = self.token_mapping_by_l1(token)
+        return ADDRESS_DEFAULT if mapping is None else mapping.l2_address
+
+    def token_mapping_by_l1(self, token: HexStr) -> Optional[TokenMapping]:
+        """
+        Returns the L2 address of the L1 token and the bridge serving it, None for ETH.
+        Served from token_mapping_cache after the first lookup.
+
+        :param token: The address of the token on L1.
+        """
+        if is_eth(token):
+            return None
+        return self.token_mapping_cache.get_or_lookup_l1(
+            token, self._lookup_token_mapping_by_l1
         )
 
-        return erc20_bridge.functions.l1TokenAddress(token).call()
+    def token_mapping_by_l2(self, token: HexStr) -> Optional[TokenMapping]:
+        """
+        Returns the L1 address of the L2 token and the bridge serving it,
+        None for ETH and tokens not bridged from L1.
 
-    def l2_token_address(self, token: HexStr) -> HexStr:
+        :param token: The address of the token on L2.
+        """
         if is_eth(token):
-            return ADDRESS_DEFAULT
+            return None
+        return self.token_mapping_cache.get_or_lookup_l2(
+            token, self._lookup_token_mapping_by_l2
+        )
+
+    def prefetch_token_mappings(self, l1_tokens: List[HexStr]) -> List[TokenMapping]:
+        """
+        Resolves the mappings of many L1 tokens at once, the lookups of the tokens
+        missing from token_mapping_cache run concurrently.
+
+        :param l1_tokens: The addresses of the tokens on L1.
+        """
+
+        missing = [
+            t
+            for t in l1_tokens
+            if not is_eth(t) and self.token_mapping_cache.by_l1(t) is None
+        ]
+        mappings = run_concurrently(
+            *(partial(self._lookup_token_mapping_by_l1, t) for t in missing)
+        )
+        self.token_mapping_cache.update(m for m in mappings if m is not None)
+        return [m for m in map(self.token_mapping_cache.by_l1, l1_tokens) if m]
+
+    def _l2_bridges(self) -> Tuple[Contract, Contract]:
         bridge_address = self.zks_get_bridge_contracts()
-        l2_weth_bridge = self.contract(
+        weth = cached_contract(
+            self,
             Web3.to_checksum_address(bridge_address.weth_bridge_l2),
             abi=l2_bridge_abi_default(),
         )
-        try:
-            l1_weth_token = l2_weth_bridge.functions.l2TokenAddress(token).call()
-            if not is_eth(l1_weth_token):
-                return l1_weth_token
-        except:
-            pass
-
-        erc20_bridge = self.contract(
+        erc20 = cached_contract(
+            self,
             Web3.to_checksum_address(bridge_address.erc20_l2_default_bridge),
             abi=l2_bridge_abi_default(),
         )
+        return weth, erc20
 
-        return erc20_bridge.functions.l2TokenAddress(token).call()
+    def _lookup_token_mapping_by_l1(self, token: HexStr) -> Optional[TokenMapping]:
+        weth, erc20 = self._l2_bridges()
+        try:
+            l2_weth_token = weth.functions.l2TokenAddress(token).call()
+            if not is_eth(l2_weth_token):
+                return TokenMapping(token, l2_weth_token, TokenBridge.WETH)
+        except:
+            pass
+        l2_token = erc20.functions.l2TokenAddress(token).call()
+        if is_eth(l2_token):
+            return None
+        return TokenMapping(token, l2_token, TokenBridge.ERC20)
+
+    def _lookup_token_mapping_by_l2(self, token: HexStr) -> Optional[TokenMapping]:
+        weth, erc20 = self._l2_bridges()
+        try:
+            l1_weth_token = weth.functions.l1TokenAddress(token).call()
+            if not is_eth(l1_weth_token):
+                return TokenMapping(l1_weth_token, token, TokenBridge.WETH)
+        except:
+            pass
+        l1_token = erc20.functions.l1TokenAddress(token).call()
+        if is_eth(l1_token):
+            return None
+        return TokenMapping(l1_token, token, TokenBridge.ERC20)
 
     def zks_get_all_account_balances(self, addr: Address) -> ZksAccountBalances:
         return self._zks_get_all_account_balances(addr)
 
+    def portfolio_snapshot(
+        self,
+        addresses: List[HexStr],
+        tokens: List[HexStr] = None,
+        block: int = None,
+        max_concurrency: int = 8,
+        batch_size: int = 100,
+    ) -> PortfolioSnapshot:
+        """
+        Returns the token balances of many addresses, all read at the same block
+        with multicall balanceOf reads, max_concurrency requests at a time.
+
+        :param addresses: The account addresses.
+        :param tokens: The L2 token addresses. Defaults to all tokens held by any of the addresses,
+            found with batched zks_getAllAccountBalances requests of batch_size addresses.
+        :param block: The block number the balances are read at. Defaults to the latest block.
+        :param max_concurrency: The maximum number of requests in flight.
+        :param batch_size: The number of addresses per zks_getAllAccountBalances batch.
+        """
+
+        return take_portfolio_snapshot(
+            self, addresses, tokens, block, max_concurrency, batch_size
+        )
+
     def zks_get_bridge_contracts(self) -> BridgeAddresses:
         if self.bridge_addresses is None:
             self.bridge_addresses = self._zks_get_bridge_contracts()
@@ -608,7 +770,9 @@ class ZkSync(Eth, ABC):
         return Web3.to_checksum_address(self._zks_get_testnet_paymaster_address())
 
     def eth_estimate_gas(self, tx: Transaction) -> int:
-        return self._eth_estimate_gas(tx)
+        if self.gas_estimate_cache is None:
+            return self._eth_estimate_gas(tx)
+        return self.gas_estimate_cache.get_or_estimate(tx, self._eth_estimate_gas)
 
     def eth_get_transaction_receipt(self, tx: HexStr) -> TransactionReceipt:
         return self._eth_get_transaction_receipt(tx)
@@ -618,9 +782,9 @@ class ZkSync(Eth, ABC):
 
     @staticmethod
     def get_l2_hash_from_priority_op(tx_receipt: TxReceipt, contract: Contract):
-        logs = contract.events["NewPriorityRequest"]().process_receipt(tx_receipt)
-        if len(logs):
-            return logs[0].args.txHash
+        hashes = l2_hashes_from_receipt(tx_receipt, contract.address)
+        if len(hashes):
+            return hashes[0]
         else:
             raise RuntimeError("Wrong transaction received")
 
@@ -629,47 +793,65 @@ class ZkSync(Eth, ABC):
         self.wait_for_transaction_receipt(l2_hash)
         return self.get_transaction(l2_hash)
 
+    def priority_op_tracker(self, main_contract_address: HexStr = None):
+        """
+        Returns a tracker following many L1->L2 transactions at once, see PriorityOpTracker.
+
+        :param main_contract_address: Only priority requests of this contract are tracked.
+        """
+        return PriorityOpTracker(self, main_contract_address)
+
     def wait_for_transaction_receipt(
         self, transaction_hash: _Hash32, timeout: float = 120, poll_latency: float = 0.1
     ) -> TxReceipt:
+        """
+        Waits for the receipt of the transaction through receipt_waiter, whose
+        polling thread is shared by every wait on the client.
+
+        :param transaction_hash: Hash of the transaction.
+        :param timeout: Seconds to wait.
+        :param poll_latency: Unused, the poll interval follows the block time.
+        """
         try:
-            with Timeout(timeout) as _timeout:
-                while True:
-                    try:
-                        tx_receipt = self.get_transaction_receipt(transaction_hash)
-                    except TransactionNotFound:
-                        tx_receipt = None
-                    if tx_receipt is not None and tx_receipt["blockHash"] is not None:
-                        break
-                    _timeout.sleep(poll_latency)
-            return tx_receipt
-
-        except Timeout:
+            return self.receipt_waiter.wait([transaction_hash], timeout)[0]
+        except TimeExhausted:
             raise TimeExhausted(
                 f"Transaction {HexBytes(transaction_hash) !r} is not in the chain after {timeout} seconds"
             )
 
+    def wait_for_transaction_receipts(
+        self, transaction_hashes: List[_Hash32], timeout: float = 120
+    ) -> List[TxReceipt]:
+        """
+        Waits for the receipts of many transactions at once, see ReceiptWaiter.
+
+        :param transaction_hashes: Hashes of the transactions.
+        :param timeout: Seconds to wait for all receipts.
+        """
+        return self.receipt_waiter.wait(transaction_hashes, timeout)
+
     def wait_finalized(
         self, transaction_hash: _Hash32, timeout: float = 120, poll_latency: float = 0.1
     ) -> TxReceipt:
+        """
+        Waits until the block of the transaction is finalized.
+        The receipt is fetched once, through receipt_waiter, and then compared against
+        the finalized height tracked by block_watcher.
+
+        :param transaction_hash: Hash of the transaction.
+        :param timeout: Seconds to wait.
+        :param poll_latency: Unused, polling is shared by receipt_waiter and block_watcher.
+        """
+        deadline = time.monotonic() + timeout
         try:
-            with Timeout(timeout) as _timeout:
-                while True:
-                    try:
-                        block = self.get_block("finalized")
-                        tx_receipt = self.get_transaction_receipt(transaction_hash)
-                    except TransactionNotFound:
-                        tx_receipt = None
-                    if (
-                        tx_receipt is not None
-                        and tx_receipt["blockHash"] is not None
-                        and block["number"] >= tx_receipt["blockNumber"]
-                    ):
-                        break
-                    _timeout.sleep(poll_latency)
+            tx_receipt = self.receipt_waiter.wait([transaction_hash], timeout)[0]
+            self.block_watcher.wait_for(
+                "finalized",
+                tx_receipt["blockNumber"],
+                max(deadline - time.monotonic(), 0),
+            )
             return tx_receipt
-
-        except Timeout:
+        except TimeExhausted:
             raise TimeExhausted(
                 f"Transaction {HexBytes(transaction_hash) !r} is not in the chain after {timeout} seconds"
             )
@@ -684,11 +866,9 @@ class ZkSync(Eth, ABC):
         if tx.options.chain_id is None:
             tx.options.chain_id = self.chain_id
         if tx.options.nonce is None:
-            tx.options.nonce = self.get_transaction_count(
-                Web3.to_checksum_address(from_), ZkBlockParams.LATEST.value
-            )
+            tx.options.nonce = self._unreserved_nonce(from_)
         if tx.options.gas_price is None:
-            tx.options.gas_price = self.gas_price
+            tx.options.gas_price = self.fee_oracle.gas_price()
         if tx.options.gas_limit is None:
             tx.options.gas_limit = 0
 
@@ -713,11 +893,9 @@ class ZkSync(Eth, ABC):
         if tx.options.chain_id is None:
             tx.options.chain_id = self.chain_id
         if tx.options.nonce is None:
-            tx.options.nonce = self.get_transaction_count(
-                Web3.to_checksum_address(from_), ZkBlockParams.LATEST.value
-            )
+            tx.options.nonce = self._unreserved_nonce(from_)
         if tx.options.gas_price is None:
-            tx.options.gas_price = self.gas_price
+            tx.options.gas_price = self.fee_oracle.gas_price()
         if tx.options.max_priority_fee_per_gas is None:
             tx.options.max_priority_fee_per_gas = MAX_PRIORITY_FEE_PER_GAS
         if tx.options.gas_limit is None:
@@ -726,10 +904,7 @@ class ZkSync(Eth, ABC):
         call_data = "0x"
         if tx.token_address is not None and not is_eth(tx.token_address):
             transfer_params = (tx.to, tx.amount)
-            contract = self.contract(
-                Web3.to_checksum_address(tx.token_address), abi=get_erc20_abi()
-            )
-            call_data = contract.encodeABI("transfer", transfer_params)
+            call_data = function_encoder("IERC20", "transfer").encode(*transfer_params)
 
         transaction = TxTransfer(
             web3=self,
@@ -749,8 +924,48 @@ class ZkSync(Eth, ABC):
 
         return transaction
 
+    def _unreserved_nonce(self, address: HexStr) -> int:
+        # Not reserved, the caller sends the transaction itself and nonce_manager would
+        # never learn that it was sent. Starts after the nonces reserved so far.
+        pending = self.nonce_manager.pending(address)
+        nonce = self.get_transaction_count(
+            Web3.to_checksum_address(address), ZkBlockParams.LATEST.value
+        )
+        return max([nonce] + [n + 1 for n in pending])
+
+    def send_reserved_raw_transaction(
+        self,
+        raw_transaction: bytes,
+        sender: HexStr,
+        nonce: int,
+        estimated_tx: Transaction = None,
+    ) -> HexBytes:
+        """
+        Sends a transaction signed with a nonce reserved from nonce_manager,
+        e.g. with nonce_manager.reserve, and reports the outcome: the nonce is marked sent,
+        or, when the node rejects the transaction, released or resynced as the error requires.
+        A reserved nonce that is never marked sent is reclaimed after
+        nonce_manager.max_unsent_age seconds and handed out again.
+
+        :param raw_transaction: The signed transaction.
+        :param sender: The address the nonce was reserved for.
+        :param nonce: The reserved nonce.
+        :param estimated_tx: The transaction the gas limit was estimated for, reported
+            to gas_estimate_cache when rejected.
+        """
+        try:
+            tx_hash = self.send_raw_transaction(raw_transaction)
+        except ValueError as error:
+            self.nonce_manager.handle_error(sender, nonce, error)
+            if self.gas_estimate_cache is not None and estimated_tx is not None:
+                self.gas_estimate_cache.report_failure(estimated_tx)
+            raise
+        self.nonce_manager.mark_sent(sender, nonce)
+        return tx_hash
+
     def get_contract_account_info(self, address: HexStr) -> ContractAccountInfo:
-        deployer = self.contract(
+        deployer = cached_contract(
+            self,
             address=Web3.to_checksum_address(
                 ZkSyncAddresses.CONTRACT_DEPLOYER_ADDRESS.value
             ),
@@ -0,0 +1,101 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence
+
+from eth_account import Account
+from eth_account.datastructures import SignedMessage
+from eth_account.signers.local import LocalAccount
+from eth_typing import ChecksumAddress
+
+from zksync2.signer.eth_signer import PrivateKeyEthSigner
+from zksync2.transaction.transaction712 import Transaction712
+
+# Signer of the current worker process, created once by the pool initializer
+# so that the private key is never shipped together with the work items.
+_worker_signer: Optional[PrivateKeyEthSigner] = None
+
+
+def _init_worker(private_key: bytes, chain_id: int):
+    global _worker_signer
+    _worker_signer = PrivateKeyEthSigner(Account.from_key(private_key), chain_id)
+
+
+def _sign_chunk(txs: List[Transaction712]) -> List[SignedMessage]:
+    return [_worker_signer.sign_typed_data(tx.to_eip712_struct()) for tx in txs]
+
+
+def _encode_chunk(txs: List[Transaction712]) -> List[bytes]:
+    return [
+        tx.encode(_worker_signer.sign_typed_data(tx.to_eip712_struct())) for tx in txs
+    ]
+
+
+class BatchSigner:
+    """
+    Signs many EIP-712 transactions of one account in parallel.
+
+    The work is split into chunks which are signed in a pool of worker processes,
+    so that hashing and ECDSA signing are not serialized by the GIL.
+    Each worker receives the private key once, when it is started.
+    """
+
+    DEFAULT_CHUNK_SIZE = 64
+
+    def __init__(
+        self,
+        account: LocalAccount,
+        chain_id: int,
+        max_workers: int = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        self._address = account.address
+        self.chain_id = chain_id
+        self.chunk_size = chunk_size
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(bytes(account.key), chain_id),
+        )
+
+    @property
+    def address(self) -> ChecksumAddress:
+        return self._address
+
+    def _chunks(self, txs: Sequence[Transaction712]) -> List[List[Transaction712]]:
+        return [
+            list(txs[i : i + self.chunk_size])
+            for i in range(0, len(txs), self.chunk_size)
+        ]
+
+    def sign_many(self, txs: Sequence[Transaction712]) -> List[SignedMessage]:
+        """
+        Returns signatures of the transactions, in the same order as the input.
+
+        :param txs: Transactions to be signed.
+        """
+        result = []
+        for signed in self._executor.map(_sign_chunk, self._chunks(txs)):
+            result.extend(signed)
+        return result
+
+    def encode_many(self, txs: Sequence[Transaction712]) -> List[bytes]:
+        """
+        Signs the transactions and returns their raw encodings, ready for send_raw_transaction,
+        in the same order as the input.
+
+        :param txs: Transactions to be signed and encoded.
+        """
+        result = []
+        for encoded in self._executor.map(_encode_chunk, self._chunks(txs)):
+            result.extend(encoded)
+        return result
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "BatchSigner":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
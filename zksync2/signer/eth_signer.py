@@ -1,6 +1,16 @@
-import web3
 from abc import abstractmethod, ABC
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Tuple
+
+from eth_keys.exceptions import BadSignature
+from hexbytes import HexBytes
+
 from zksync2.eip712 import make_domain, EIP712Struct
+from zksync2.signer.secp256k1 import (
+    Secp256k1Backend,
+    sign_hash,
+    recover_hash_cached,
+)
 from eth_account.datastructures import SignedMessage
 from eth_account.signers.base import BaseAccount
 from eth_typing import ChecksumAddress, HexStr
@@ -22,12 +32,17 @@ class PrivateKeyEthSigner(EthSignerBase, ABC):
     _NAME = "zkSync"
     _VERSION = "2"
 
-    def __init__(self, creds: BaseAccount, chain_id: int):
+    def __init__(
+        self, creds: BaseAccount, chain_id: int, backend: Secp256k1Backend = None
+    ):
         self.credentials = creds
         self.chain_id = chain_id
+        self.backend = backend
         self.default_domain = make_domain(
             name=self._NAME, version=self._VERSION, chainId=self.chain_id
         )
+        # (domain, 0x1901 || domainHash) of the last domain used
+        self._digest_prefix_cache = None
 
     @property
     def address(self) -> ChecksumAddress:
@@ -46,15 +61,79 @@ class PrivateKeyEthSigner(EthSignerBase, ABC):
         msg = typed_data.signable_bytes(d)
         return encode_defunct(msg)
 
+    def typed_data_to_digest(self, typed_data: EIP712Struct, domain=None) -> bytes:
+        """
+        Returns the 32-byte EIP-712 digest keccak(0x1901 || domainHash || structHash).
+
+        :param typed_data: The typed data to be hashed.
+        :param domain: The domain of the typed data. Defaults to the signer domain.
+        """
+        return keccak(self._digest_prefix(domain) + typed_data.hash_struct())
+
     def sign_typed_data(self, typed_data: EIP712Struct, domain=None) -> SignedMessage:
-        singable_message = self.typed_data_to_signed_bytes(typed_data, domain)
-        msg_hash = keccak(singable_message.body)
-        return self.credentials.signHash(msg_hash)
+        return self.sign_hash(self.typed_data_to_digest(typed_data, domain))
+
+    def sign_hash(self, msg_hash: bytes) -> SignedMessage:
+        key = getattr(self.credentials, "key", None)
+        if key is None:
+            # Accounts without local key material (e.g. remote signers) sign by themselves
+            return self.credentials.signHash(msg_hash)
+        return sign_hash(key, msg_hash, self.backend)
 
     def verify_typed_data(
         self, sig: HexStr, typed_data: EIP712Struct, domain=None
     ) -> bool:
-        singable_message = self.typed_data_to_signed_bytes(typed_data, domain)
-        msg_hash = keccak(singable_message.body)
-        address = web3.Account._recover_hash(message_hash=msg_hash, signature=sig)
+        msg_hash = self.typed_data_to_digest(typed_data, domain)
+        address = recover_hash_cached(
+            bytes(msg_hash), bytes(HexBytes(sig)), self.backend
+        )
+        return address.lower() == self.address.lower()
+
+    def verify_many(
+        self,
+        pairs: Iterable[Tuple[HexStr, EIP712Struct]],
+        domain=None,
+        max_workers: int = None,
+    ) -> List[bool]:
+        """
+        Verifies many typed data signatures, returns the results in the input order.
+
+        The domain hash is computed once for the whole batch, recoveries run in a thread pool
+        (libsecp256k1 releases the GIL) and recovered addresses are memoized,
+        so repeated verifications of the same signature are served from cache.
+
+        :param pairs: (signature, typed data) pairs.
+        :param domain: The domain of the typed data. Defaults to the signer domain.
+        :param max_workers: The number of threads used for recovery.
+        """
+        prefix = self._digest_prefix(domain)
+        digests = [
+            (keccak(prefix + typed_data.hash_struct()), sig)
+            for sig, typed_data in pairs
+        ]
+        if len(digests) < 2 or max_workers == 1:
+            return [self._is_signed_by_self(d, sig) for d, sig in digests]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(
+                executor.map(lambda item: self._is_signed_by_self(*item), digests)
+            )
+
+    def _digest_prefix(self, domain=None) -> bytes:
+        # Keyed by the domain object, so that reassigning default_domain is picked up
+        if domain is None:
+            domain = self.domain
+        cached = self._digest_prefix_cache
+        if cached is not None and cached[0] is domain:
+            return cached[1]
+        prefix = b"\x19\x01" + domain.hash_struct()
+        self._digest_prefix_cache = (domain, prefix)
+        return prefix
+
+    def _is_signed_by_self(self, msg_hash: bytes, sig: HexStr) -> bool:
+        try:
+            address = recover_hash_cached(
+                bytes(msg_hash), bytes(HexBytes(sig)), self.backend
+            )
+        except (ValueError, BadSignature):
+            return False
         return address.lower() == self.address.lower()
@@ -0,0 +1,109 @@
+from enum import Enum
+from functools import lru_cache
+
+from eth_account.datastructures import SignedMessage
+from eth_keys import keys
+from eth_keys.backends import NativeECCBackend
+from eth_typing import ChecksumAddress
+from eth_utils import keccak, to_checksum_address
+from hexbytes import HexBytes
+
+try:
+    import coincurve
+except ImportError:
+    coincurve = None
+
+V_OFFSET = 27
+RECOVERY_CACHE_SIZE = 65536
+
+
+class Secp256k1Backend(Enum):
+    COINCURVE = "coincurve"
+    NATIVE = "native"
+
+
+def available_backends():
+    if coincurve is None:
+        return [Secp256k1Backend.NATIVE]
+    return [Secp256k1Backend.COINCURVE, Secp256k1Backend.NATIVE]
+
+
+DEFAULT_BACKEND = available_backends()[0]
+
+_native_backend = NativeECCBackend()
+
+
+def sign_hash(
+    private_key: bytes, msg_hash: bytes, backend: Secp256k1Backend = None
+) -> SignedMessage:
+    """
+    Signs a 32-byte hash and returns the result in the same form as Account.signHash.
+
+    :param private_key: Raw 32-byte private key.
+    :param msg_hash: The hash to be signed.
+    :param backend: The backend to be used. libsecp256k1 through coincurve when installed, pure Python otherwise.
+    """
+    if backend is None:
+        backend = DEFAULT_BACKEND
+    if backend == Secp256k1Backend.COINCURVE:
+        signature = coincurve.PrivateKey(bytes(private_key)).sign_recoverable(
+            msg_hash, hasher=None
+        )
+        r = int.from_bytes(signature[0:32], "big")
+        s = int.from_bytes(signature[32:64], "big")
+        v = signature[64] + V_OFFSET
+    else:
+        key = keys.PrivateKey(bytes(private_key), backend=_native_backend)
+        v_raw, r, s = key.sign_msg_hash(msg_hash).vrs
+        v = v_raw + V_OFFSET
+    eth_signature = r.to_bytes(32, "big") + s.to_bytes(32, "big") + bytes([v])
+    return SignedMessage(
+        messageHash=HexBytes(msg_hash),
+        r=r,
+        s=s,
+        v=v,
+        signature=HexBytes(eth_signature),
+    )
+
+
+def recover_hash(
+    msg_hash: bytes, signature: bytes, backend: Secp256k1Backend = None
+) -> ChecksumAddress:
+    """
+    Returns the address which produced the signature of the hash.
+
+    :param msg_hash: The signed 32-byte hash.
+    :param signature: 65-byte signature in r || s || v form, v is either 0/1 or 27/28.
+    :param backend: The backend to be used. libsecp256k1 through coincurve when installed, pure Python otherwise.
+    """
+    if backend is None:
+        backend = DEFAULT_BACKEND
+    signature = HexBytes(signature)
+    if len(signature) != 65:
+        raise ValueError(f"Signature must be 65 bytes long, got: {len(signature)}")
+    v = signature[64]
+    if v >= V_OFFSET:
+        v -= V_OFFSET
+    if v not in (0, 1):
+        raise ValueError(f"Invalid signature v value: {signature[64]}")
+    vrs_bytes = bytes(signature[:64]) + bytes([v])
+
+    if backend == Secp256k1Backend.COINCURVE:
+        public_key = coincurve.PublicKey.from_signature_and_message(
+            vrs_bytes, msg_hash, hasher=None
+        ).format(compressed=False)[1:]
+        return to_checksum_address(keccak(public_key)[-20:])
+
+    sig = keys.Signature(signature_bytes=vrs_bytes, backend=_native_backend)
+    return sig.recover_public_key_from_msg_hash(msg_hash).to_checksum_address()
+
+
+@lru_cache(maxsize=RECOVERY_CACHE_SIZE)
+def recover_hash_cached(
+    msg_hash: bytes, signature: bytes, backend: Secp256k1Backend = None
+) -> ChecksumAddress:
+    """
+    Same as recover_hash, memoized in a bounded LRU keyed by (hash, signature, backend).
+    Arguments must be hashable, pass bytes rather than HexStr/bytearray.
+    """
+    return recover_hash(msg_hash, signature, backend)
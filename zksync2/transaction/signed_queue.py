@@ -0,0 +1,364 @@
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+
+from eth_account.datastructures import SignedMessage
+from eth_typing import HexStr
+from web3 import Web3
+
+from zksync2.core.nonce_manager import KNOWN_TRANSACTION
+from zksync2.core.rpc_batch import batch_request
+from zksync2.core.utils import write_json_atomic
+from zksync2.transaction.transaction712 import Transaction712
+
+MAGIC = b"ZKSTXQ01"
+# Record: payload length, crc32 of the payload
+_RECORD_HEADER = struct.Struct("<II")
+# Payload before the raw transaction: hash, sender, nonce, max fee, priority fee, expiry
+_PAYLOAD_HEADER = struct.Struct("<32s20sQ16s16sQ")
+_MAX_FEE = 2**128 - 1
+# Rejections no retry can fix, any other one may pass later, e.g. once the sender is funded
+_PERMANENT_REJECTION = (
+    "nonce too low",
+    "nonce is too low",
+    "invalid signature",
+    "invalid sender",
+    "intrinsic gas too low",
+    "exceeds block gas limit",
+    "invalid chain id",
+    "oversized data",
+)
+
+
+@dataclass(frozen=True)
+class QueuedTransaction:
+    tx_hash: bytes
+    sender: HexStr
+    nonce: int
+    max_fee_per_gas: int
+    max_priority_fee_per_gas: int
+    # Unix time after which the transaction is not broadcast, None for never
+    expires_at: Optional[int]
+    # When read back, a view into the mapped log which keeps the mapping alive
+    raw: Union[bytes, memoryview] = field(repr=False)
+
+    def expired(self, now: float = None) -> bool:
+        if self.expires_at is None:
+            return False
+        return (time.time() if now is None else now) >= self.expires_at
+
+
+class SignedTransactionLog:
+    """
+    Append-only file of signed transactions and their metadata,
+    for signing on one host and broadcasting from another.
+
+    Records are appended with a length and CRC32 prefix and read back through mmap,
+    the raw transactions are returned as memoryviews into the mapping, which stays
+    mapped while any of them is referenced. Reading stops at an incomplete record,
+    e.g. one being appended by another process. A log has a single writer, when opened
+    for writing a torn record at the end of the file (a crash while appending) is cut off.
+    """
+
+    def __init__(
+        self, path: Union[str, os.PathLike], readonly: bool = False, fsync: bool = False
+    ):
+        """
+        :param path: The log file, created if missing unless readonly.
+        :param readonly: Open for reading only, e.g. on the broadcasting host.
+        :param fsync: Sync the file to disk after every append, otherwise call sync().
+        """
+        self.path = Path(path)
+        self.readonly = readonly
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        if not readonly and (not self.path.exists() or self.path.stat().st_size == 0):
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("wb") as f:
+                f.write(MAGIC)
+        self._file = self.path.open("rb" if readonly else "r+b")
+        if self._file.read(len(MAGIC)) != MAGIC:
+            self._file.close()
+            raise ValueError(f"{self.path} is not a signed transaction log")
+        self._end = len(MAGIC)
+        if not readonly:
+            # Appends start after the last complete record
+            for self._end, _ in self.read():
+                pass
+            self._file.truncate(self._end)
+
+    def append(self, tx: QueuedTransaction) -> int:
+        """
+        Appends a transaction and returns the offset of the record.
+        """
+        if self.readonly:
+            raise ValueError("The log is open for reading only")
+        if tx.max_fee_per_gas > _MAX_FEE or tx.max_priority_fee_per_gas > _MAX_FEE:
+            raise ValueError("Fees must fit in 128 bits")
+        payload = _PAYLOAD_HEADER.pack(
+            bytes(tx.tx_hash),
+            bytes.fromhex(Web3.to_checksum_address(tx.sender)[2:]),
+            tx.nonce,
+            tx.max_fee_per_gas.to_bytes(16, "little"),
+            tx.max_priority_fee_per_gas.to_bytes(16, "little"),
+            0 if tx.expires_at is None else tx.expires_at,
+        ) + bytes(tx.raw)
+        record = _RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+        with self._lock:
+            offset = self._end
+            self._file.seek(offset)
+            self._file.write(record)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._end += len(record)
+        return offset
+
+    def append_transaction712(
+        self,
+        tx: Transaction712,
+        signature: SignedMessage,
+        expires_at: Optional[int] = None,
+    ) -> QueuedTransaction:
+        """
+        Encodes a signed EIP-712 transaction and appends it.
+
+        :param tx: The transaction.
+        :param signature: Its signature, e.g. from PrivateKeyEthSigner.sign_typed_data.
+        :param expires_at: Unix time after which the transaction is not broadcast.
+        """
+        queued = QueuedTransaction(
+            tx_hash=tx.hash(signature),
+            sender=tx.from_,
+            nonce=tx.nonce,
+            max_fee_per_gas=tx.maxFeePerGas,
+            max_priority_fee_per_gas=tx.maxPriorityFeePerGas,
+            expires_at=expires_at,
+            raw=tx.encode(signature),
+        )
+        self.append(queued)
+        return queued
+
+    def sync(self):
+        with self._lock:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def size(self) -> int:
+        return os.fstat(self._file.fileno()).st_size
+
+    def read(self, offset: int = len(MAGIC)) -> Iterator[Tuple[int, QueuedTransaction]]:
+        """
+        Yields the transactions from offset on, each with the offset of the next record.
+
+        :param offset: Offset of a record, defaults to the first one.
+        """
+        size = self.size()
+        if size <= offset:
+            return
+        view = memoryview(mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_READ))
+        while True:
+            record = self._decode(view, offset, size)
+            if record is None:
+                return
+            tx, offset = record
+            yield offset, tx
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self) -> "SignedTransactionLog":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @staticmethod
+    def _decode(
+        view: memoryview, offset: int, size: int
+    ) -> Optional[Tuple[QueuedTransaction, int]]:
+        start = offset + _RECORD_HEADER.size
+        if start > size:
+            return None
+        length, crc = _RECORD_HEADER.unpack_from(view, offset)
+        if length < _PAYLOAD_HEADER.size or start + length > size:
+            return None
+        payload = view[start : start + length]
+        if zlib.crc32(payload) != crc:
+            return None
+        (
+            tx_hash,
+            sender,
+            nonce,
+            max_fee,
+            priority_fee,
+            expires_at,
+        ) = _PAYLOAD_HEADER.unpack_from(payload)
+        tx = QueuedTransaction(
+            tx_hash=tx_hash,
+            sender=Web3.to_checksum_address(sender),
+            nonce=nonce,
+            max_fee_per_gas=int.from_bytes(max_fee, "little"),
+            max_priority_fee_per_gas=int.from_bytes(priority_fee, "little"),
+            expires_at=expires_at or None,
+            raw=payload[_PAYLOAD_HEADER.size :],
+        )
+        return tx, start + length
+
+
+@dataclass
+class BroadcastResult:
+    sent: List[bytes] = field(default_factory=list)
+    # Already known to the node, e.g. sent before a crash
+    known: List[bytes] = field(default_factory=list)
+    expired: List[bytes] = field(default_factory=list)
+    # Permanently rejected, skipped
+    failed: List[Tuple[bytes, Exception]] = field(default_factory=list)
+    # Rejected for a reason that may pass later, the broadcast stopped at the first one
+    retry: List[Tuple[bytes, Exception]] = field(default_factory=list)
+
+
+class Broadcaster:
+    """
+    Sends the transactions of a SignedTransactionLog in JSON-RPC batches.
+
+    The offset of the next record to send is kept in a cursor file, written atomically
+    after each batch, so a restarted broadcaster resumes after the last finished batch.
+    Delivery is at-least-once: transactions of an interrupted batch are sent again.
+    The first batch after starting or after an error is checked by hash for
+    transactions the node already has, "already known" rejections count as sent too.
+
+    Permanent rejections, e.g. nonce too low or an invalid signature, are reported
+    in failed and skipped. Any other rejection, e.g. insufficient funds, may pass later:
+    it is reported in retry and the broadcast stops, with the cursor on that transaction,
+    so the next broadcast starts from it.
+    """
+
+    DEFAULT_BATCH_SIZE = 100
+
+    def __init__(
+        self,
+        log: SignedTransactionLog,
+        web3: Web3,
+        cursor_path: Union[str, os.PathLike] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        """
+        :param log: The log to broadcast.
+        :param web3: The client the transactions are sent to.
+        :param cursor_path: The cursor file, defaults to the log path with a .cursor suffix.
+        :param batch_size: Transactions per JSON-RPC batch.
+        """
+        self.log = log
+        self._w3 = web3
+        self.cursor_path = (
+            Path(str(log.path) + ".cursor")
+            if cursor_path is None
+            else Path(cursor_path)
+        )
+        self.batch_size = batch_size
+        self.offset = len(MAGIC)
+        if self.cursor_path.exists():
+            with self.cursor_path.open() as f:
+                self.offset = json.load(f)["offset"]
+        # Whether the next batch may have been sent before, by an interrupted run
+        self._check_known = True
+
+    def pending(self) -> int:
+        """
+        Returns the number of bytes of the log not broadcast yet.
+        """
+        return self.log.size() - self.offset
+
+    def broadcast(self) -> BroadcastResult:
+        """
+        Sends all transactions appended since the last call.
+        """
+        result = BroadcastResult()
+        # Offset of each transaction with the transaction
+        batch: List[Tuple[int, QueuedTransaction]] = []
+        offset = self.offset
+        for next_offset, tx in self.log.read(self.offset):
+            batch.append((offset, tx))
+            offset = next_offset
+            if len(batch) == self.batch_size:
+                if not self._flush(batch, offset, result):
+                    return result
+                batch = []
+        if batch:
+            self._flush(batch, offset, result)
+        return result
+
+    def _flush(
+        self,
+        batch: List[Tuple[int, QueuedTransaction]],
+        end: int,
+        result: BroadcastResult,
+    ) -> bool:
+        # Sends the batch and commits the cursor up to the first retryable rejection
+        retry_at = self._send_batch([tx for _, tx in batch], result)
+        if retry_at is None:
+            self._commit(end)
+            return True
+        self._commit(batch[retry_at][0])
+        # The transactions after it may have been accepted, they are checked when resent
+        self._check_known = True
+        return False
+
+    def _send_batch(
+        self, batch: List[QueuedTransaction], result: BroadcastResult
+    ) -> Optional[int]:
+        # Returns the index of the first transaction rejected for a retryable reason
+        check_known, self._check_known = self._check_known, True
+        now = time.time()
+        live = []
+        for index, tx in enumerate(batch):
+            if tx.expired(now):
+                result.expired.append(bytes(tx.tx_hash))
+            else:
+                live.append((index, tx))
+        unsent = live
+        if check_known:
+            known = batch_request(
+                self._w3,
+                [
+                    ("eth_getTransactionByHash", [Web3.to_hex(tx.tx_hash)])
+                    for _, tx in live
+                ],
+            )
+            unsent = []
+            for (index, tx), found in zip(live, known):
+                if isinstance(found, dict):
+                    result.known.append(bytes(tx.tx_hash))
+                else:
+                    unsent.append((index, tx))
+        responses = batch_request(
+            self._w3,
+            [("eth_sendRawTransaction", ["0x" + tx.raw.hex()]) for _, tx in unsent],
+        )
+        retry_at = None
+        for (index, tx), response in zip(unsent, responses):
+            message = str(response).lower()
+            if not isinstance(response, Exception):
+                result.sent.append(bytes(tx.tx_hash))
+            elif any(known in message for known in KNOWN_TRANSACTION):
+                result.known.append(bytes(tx.tx_hash))
+            elif any(reason in message for reason in _PERMANENT_REJECTION):
+                result.failed.append((bytes(tx.tx_hash), response))
+            else:
+                result.retry.append((bytes(tx.tx_hash), response))
+                if retry_at is None:
+                    retry_at = index
+        self._check_known = False
+        return retry_at
+
+    def _commit(self, offset: int):
+        self.offset = offset
+        write_json_atomic(self.cursor_path, {"offset": offset})
@@ -3,7 +3,7 @@ from typing import Union, Optional
 import rlp
 from eth_account.datastructures import SignedMessage
 from eth_typing import ChecksumAddress, HexStr
-from eth_utils import remove_0x_prefix
+from eth_utils import keccak, remove_0x_prefix
 from rlp.sedes import big_endian_int, binary
 from rlp.sedes import List as rlpList
 from web3.types import Nonce
@@ -105,6 +105,19 @@ class Transaction712:
         encoded_rlp = rlp.encode(representation, infer_serializer=True, cache=False)
         return int_to_bytes(self.EIP_712_TX_TYPE) + encoded_rlp
 
+    def hash(self, signature: SignedMessage) -> bytes:
+        """
+        Returns the hash the node assigns to the signed transaction,
+        keccak(eip712 digest || keccak(signature)).
+
+        :param signature: The signature of the transaction, its messageHash is the digest.
+        """
+        custom_signature = self.meta.custom_signature
+        rlp_signature = (
+            custom_signature if custom_signature is not None else signature.signature
+        )
+        return keccak(bytes(signature.messageHash) + keccak(bytes(rlp_signature)))
+
     def to_eip712_struct(self) -> EIP712Struct:
         class Transaction(EIP712Struct):
             pass
@@ -13,6 +13,7 @@ from zksync2.manage_contracts.precompute_contract_deployer import (
     PrecomputeContractDeployer,
 )
 from zksync2.manage_contracts.utils import (
+    cached_contract,
     l2_bridge_abi_default,
     eth_token_abi_default,
     get_erc20_abi,
@@ -311,7 +312,7 @@ class TxWithdraw(TxBase, ABC):
         if to is None:
             to = account.address
         if gas_price is None:
-            gas_price = web3.zksync.gas_price
+            gas_price = web3.zksync.fee_oracle.gas_price()
         if nonce is None:
             web3.zksync.get_transaction_count(account.address)
 
@@ -325,7 +326,8 @@ class TxWithdraw(TxBase, ABC):
         if is_eth(token):
             if chain_id is None:
                 chain_id = web3.zksync.chain_id
-            contract = web3.zksync.contract(
+            contract = cached_contract(
+                web3.zksync,
                 Web3.to_checksum_address(L2_ETH_TOKEN_ADDRESS),
                 abi=eth_token_abi_default(),
             )
@@ -340,7 +342,8 @@ class TxWithdraw(TxBase, ABC):
                 }
             )
         else:
-            l2_bridge = web3.eth.contract(
+            l2_bridge = cached_contract(
+                web3.eth,
                 address=Web3.to_checksum_address(bridge_address),
                 abi=l2_bridge_abi_default(),
             )
@@ -421,7 +424,8 @@ class TxTransfer(TxBase, ABC):
                 }
             )
         else:
-            token_contract = web3.contract(
+            token_contract = cached_contract(
+                web3,
                 address=Web3.to_checksum_address(token),
                 abi=get_erc20_abi(),
             )